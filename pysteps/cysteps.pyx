@@ -55,6 +55,101 @@ def _py_finish():
 def _py_permeability(G, V, z, T, iconc, oconc):
     return permeability(G, V, z, T, iconc, oconc)
 
+def _py_profilingEnable(bool enabled, bool trace=False):
+    """
+    Enable or disable the native region tracker.
+
+    Syntax::
+
+        _py_profilingEnable(enabled, trace)
+
+    Arguments:
+        bool enabled
+        bool trace (default: False)
+
+    Return:
+        None
+    """
+    RegionTracker.enable(enabled, trace)
+
+def _py_profilingEnabled():
+    """
+    Return whether the native region tracker is enabled.
+
+    Syntax::
+
+        _py_profilingEnabled()
+
+    Arguments:
+        None
+
+    Return:
+        bool
+    """
+    return RegionTracker.enabled()
+
+def _py_profilingReset():
+    """
+    Clear all statistics and events recorded by the native region tracker.
+
+    Syntax::
+
+        _py_profilingReset()
+
+    Arguments:
+        None
+
+    Return:
+        None
+    """
+    RegionTracker.reset()
+
+def _py_profilingStats():
+    """
+    Return the statistics of all tracked regions. Time is in seconds, memory in MB, and
+    min/max/avg values are computed across MPI ranks. Regions that were not tracked on some
+    ranks count as zeros on these ranks. Collective call when MPI is used.
+
+    Syntax::
+
+        _py_profilingStats()
+
+    Arguments:
+        None
+
+    Return:
+        list<dict>
+    """
+    cdef std.vector[RegionStats] stats = RegionTracker.stats()
+    return [
+        dict(
+            name=s.name.decode(),
+            count=s.count,
+            time=dict(min=s.time_min, max=s.time_max, avg=s.time_avg),
+            memory=dict(min=s.memory_min, max=s.memory_max, avg=s.memory_avg),
+            memoryDelta=dict(min=s.memoryDelta_min, max=s.memoryDelta_max, avg=s.memoryDelta_avg),
+        )
+        for s in stats
+    ]
+
+def _py_profilingEvents():
+    """
+    Return the region executions recorded on the current rank when tracing is enabled, as
+    (name, start, duration) tuples in microseconds.
+
+    Syntax::
+
+        _py_profilingEvents()
+
+    Arguments:
+        None
+
+    Return:
+        list<tuple<str, float, float>>
+    """
+    cdef std.vector[RegionEvent] events = RegionTracker.events()
+    return [(e.name.decode(), e.start, e.duration) for e in events]
+
 _USE_PETSC = USE_PETSC
 _STEPS_USE_DIST_MESH = STEPS_USE_DIST_MESH
 _STEPS_SUNDIALS_VERSION_MAJOR = int(STEPS_SUNDIALS_VERSION_MAJOR)
@@ -50,6 +50,45 @@ UNKNOWN_TRI = _UNKNOWN_TRI
 UNKNOWN_VERT = _UNKNOWN_VERT
 INDEX_NUM_BYTES = _INDEX_NUM_BYTES
 
+# Contiguous buffers (e.g. numpy arrays) of the right type are copied directly to std containers,
+# other sequences go through the usual element by element conversion.
+cdef std.vector[double] _toDoubleVector(object values) except *:
+    cdef const double[::1] buf
+    cdef std.vector[double] vec
+    try:
+        buf = values
+    except (TypeError, ValueError, BufferError):
+        vec = values
+        return vec
+    if buf.shape[0] > 0:
+        vec.assign(&buf[0], &buf[0] + buf.shape[0])
+    return vec
+
+cdef std.vector[index_t] _toIndexVector(object values) except *:
+    cdef const index_t[::1] buf
+    cdef std.vector[index_t] vec
+    try:
+        buf = values
+    except (TypeError, ValueError, BufferError):
+        vec = values
+        return vec
+    if buf.shape[0] > 0:
+        vec.assign(&buf[0], &buf[0] + buf.shape[0])
+    return vec
+
+cdef std.set[index_t] _toIndexSet(object values) except *:
+    cdef const index_t[::1] buf
+    cdef std.set[index_t] res
+    cdef Py_ssize_t i
+    try:
+        buf = values
+    except (TypeError, ValueError, BufferError):
+        res = values
+        return res
+    for i in range(buf.shape[0]):
+        res.insert(buf[i])
+    return res
+
 #Functions previously defined in the .i Swig files(!!)
 def castToTmComp(_py_Comp base):
     """
@@ -816,7 +855,7 @@ cdef class _py_Tetmesh(_py_Geom):
     cdef Tetmesh *ptrx(self):
         return <Tetmesh*> self._ptr
 
-    def __init__(self, std.vector[double] verts, std.vector[index_t] tets, std.vector[index_t] tris=[]):
+    def __init__(self, verts, tets, tris=[]):
         """
         Syntax::
 
@@ -837,12 +876,15 @@ cdef class _py_Tetmesh(_py_Geom):
         one-dimensional list tets=[0,1,2,3,0,1,3,4,1,3,4,5].
 
         Arguments:
-        list<double> verts
-        list<index_t> tets
-        list<index_t> tris
+        list<double> or numpy.array<float> verts
+        list<index_t> or numpy.array<index_t> tets
+        list<index_t> or numpy.array<index_t> tris
+
+        Contiguous numpy arrays of the matching types are copied without conversion
+        to python objects.
 
         """
-        self._ptr = new Tetmesh( verts, tets, tris )
+        self._ptr = new Tetmesh( _toDoubleVector(verts), _toIndexVector(tets), _toIndexVector(tris) )
 
     def getAllComps(self, ):
         """
@@ -1392,6 +1434,30 @@ cdef class _py_Tetmesh(_py_Geom):
         """
         return self.ptrx().findTetByPointWalk(p).get()
 
+    def findTetsByPointsNP(self, double[:] points, index_t[:] tets):
+        """
+        Find the tetrahedrons which encompass a list of points (given in Cartesian coordinates
+        x,y,z). Points outside the mesh get UNKNOWN_TET. The search uses a uniform grid over the
+        mesh bounding box that is built during the first call and reused afterwards.
+
+        Syntax::
+
+            findTetsByPointsNP(points, tets)
+
+        Arguments:
+        numpy.array<float, length = len(tets) * 3> points
+        numpy.array<index_t> tets
+
+        Return:
+        None
+
+        """
+        if points.shape[0] != 3 * tets.shape[0]:
+            raise ValueError('Length of points array should be 3 * length of tets array.')
+        if tets.shape[0] == 0:
+            return
+        self.ptrx().findTetsByPointsNP(&points[0], points.shape[0], &tets[0], tets.shape[0])
+
     def isPointInTet(self, std.vector[double] p, index_t tidx):
         """
         Check if point belongs to the tetrahedron or not
@@ -1517,6 +1583,42 @@ cdef class _py_Tetmesh(_py_Geom):
         """
         self.ptrx().getBatchVerticesNP(&indices[0], indices.shape[0], &coordinates[0], coordinates.shape[0])
 
+    def getBatchTetBarycentersNP(self, index_t[:] indices, double[:] centers):
+        """
+        Get barycenters of a list of tetrahedrons.
+
+        Syntax::
+
+            getBatchTetBarycentersNP(indices, centers)
+
+        Arguments:
+        numpy.array<index_t> indices
+        numpy.array<float, length = len(indices) * 3> centers
+
+        Return:
+        None
+
+        """
+        self.ptrx().getBatchTetBarycentersNP(<tetrahedron_global_id*> &indices[0], indices.shape[0], &centers[0], centers.shape[0])
+
+    def getBatchTriBarycentersNP(self, index_t[:] indices, double[:] centers):
+        """
+        Get barycenters of a list of triangles.
+
+        Syntax::
+
+            getBatchTriBarycentersNP(indices, centers)
+
+        Arguments:
+        numpy.array<index_t> indices
+        numpy.array<float, length = len(indices) * 3> centers
+
+        Return:
+        None
+
+        """
+        self.ptrx().getBatchTriBarycentersNP(<triangle_global_id*> &indices[0], indices.shape[0], &centers[0], centers.shape[0])
+
     def getBatchTris(self, std.vector[index_t] tris):
         """
         Get vertex indices of a list of triangles.
@@ -1587,6 +1689,62 @@ cdef class _py_Tetmesh(_py_Geom):
         """
         self.ptrx().getBatchTetsNP( & t_indices[0], t_indices.shape[0], & v_indices[0], v_indices.shape[0])
 
+    def getBatchTetTriNeighbsNP(self, index_t[:] t_indices, index_t[:] tri_indices):
+        """
+        Get the indices of the four neighbouring triangles of a list of tetrahedrons.
+
+        Syntax::
+
+            getBatchTetTriNeighbsNP(t_indices, tri_indices)
+
+        Arguments:
+        numpy.array<index_t> t_indices
+        numpy.array<index_t, length = len(t_indices) * 4> tri_indices
+
+        Return:
+        None
+
+        """
+        self.ptrx().getBatchTetTriNeighbsNP( & t_indices[0], t_indices.shape[0], & tri_indices[0], tri_indices.shape[0])
+
+    def getBatchTetTetNeighbsNP(self, index_t[:] t_indices, index_t[:] tet_indices):
+        """
+        Get the indices of the four neighbouring tetrahedrons of a list of tetrahedrons.
+        An index of UNKNOWN_TET indicates no neighbour (tetrahedron is on the mesh border).
+
+        Syntax::
+
+            getBatchTetTetNeighbsNP(t_indices, tet_indices)
+
+        Arguments:
+        numpy.array<index_t> t_indices
+        numpy.array<index_t, length = len(t_indices) * 4> tet_indices
+
+        Return:
+        None
+
+        """
+        self.ptrx().getBatchTetTetNeighbsNP( & t_indices[0], t_indices.shape[0], & tet_indices[0], tet_indices.shape[0])
+
+    def getBatchTriTetNeighbsNP(self, index_t[:] t_indices, index_t[:] tet_indices):
+        """
+        Get the indices of the two neighbouring tetrahedrons of a list of triangles.
+        An index of UNKNOWN_TET indicates no neighbour (triangle is on the mesh border).
+
+        Syntax::
+
+            getBatchTriTetNeighbsNP(t_indices, tet_indices)
+
+        Arguments:
+        numpy.array<index_t> t_indices
+        numpy.array<index_t, length = len(t_indices) * 2> tet_indices
+
+        Return:
+        None
+
+        """
+        self.ptrx().getBatchTriTetNeighbsNP( & t_indices[0], t_indices.shape[0], & tet_indices[0], tet_indices.shape[0])
+
     def getTriVerticesSetSizeNP(self, index_t[:] t_indices):
         """
         Return the size of a set with unique vertex indices of a list of triangles,
@@ -1824,7 +1982,7 @@ cdef class _py_Tetmesh(_py_Geom):
         return self.ptrx().reduceBatchTriPointCountsNP(&indices[0], indices.shape[0], &point_counts[0], point_counts.shape[0], max_density)
 
     ## ROI related ##
-    def addROI(self, str id, ElementType type, std.set[index_t] indices):
+    def addROI(self, str id, ElementType type, indices):
         """
         Add a Region of Interest data record with name id to the ROI dataset.
         The type of elements stored in the ROI data can be one of the follows:
@@ -1837,13 +1995,13 @@ cdef class _py_Tetmesh(_py_Geom):
         Arguments:
         string id
         ElementType type
-        set<index_t> indices
+        set<index_t> or numpy.array<index_t> indices
 
         Return:
         None
 
         """
-        self.ptrx().addROI(to_std_string(id), type, indices)
+        self.ptrx().addROI(to_std_string(id), type, _toIndexSet(indices))
 
     def removeROI(self, str id):
         """
@@ -2570,7 +2728,7 @@ cdef class _py_TmComp(_py_Comp):
     cdef TmComp *ptrx(self):
         return <TmComp*> self._ptr
 
-    def __init__(self, str id, _py_Tetmesh container, std.vector[index_t] tets):
+    def __init__(self, str id, _py_Tetmesh container, tets):
         """
         Construction::
 
@@ -2583,9 +2741,9 @@ cdef class _py_TmComp(_py_Comp):
         Arguments:
         string id
         steps.geom.Tetmesh container
-        list<index_t> tets
+        list<index_t> or numpy.array<index_t> tets
         """
-        self._ptr = new TmComp(to_std_string(id), deref(container.ptrx()), tets)
+        self._ptr = new TmComp(to_std_string(id), deref(container.ptrx()), _toIndexVector(tets))
 
     def setVol(self, double vol):
         """Obsolete"""
@@ -2707,7 +2865,7 @@ cdef class _py_TmPatch(_py_Patch):
     cdef TmPatch *ptrx(self):
         return <TmPatch*> self._ptr
 
-    def __init__(self, str id, _py_Tetmesh container, std.vector[index_t] tris, _py_Comp icomp, _py_Comp ocomp=None):
+    def __init__(self, str id, _py_Tetmesh container, tris, _py_Comp icomp, _py_Comp ocomp=None):
         """
         Construction::
 
@@ -2721,11 +2879,11 @@ cdef class _py_TmPatch(_py_Patch):
         Arguments:
         string id
         steps.geom.Tetmesh container
-        list<index_t> tris
+        list<index_t> or numpy.array<index_t> tris
         steps.geom.TmComp icomp
         steps.geom.TmComp ocomp (default = None)
         """
-        self._ptr = new TmPatch(to_std_string(id), deref(container.ptrx()), tris, deref(icomp.ptr()), ocomp.ptr() if ocomp else NULL)
+        self._ptr = new TmPatch(to_std_string(id), deref(container.ptrx()), _toIndexVector(tris), deref(icomp.ptr()), ocomp.ptr() if ocomp else NULL)
 
     def isTriInside(self, std.vector[index_t] tris):
         """
@@ -422,6 +422,72 @@ cdef class _py_TetOpSplitP(_py_TetAPI):
         """
         return self.ptrx().getNSteps()
 
+    def enableEventStats(self, bool enabled):
+        """
+        Start or stop the accounting of SSA events, propensity updates and
+        kproc selection time, grouped by kproc kind, name and location.
+
+        Syntax::
+
+            enableEventStats(enabled)
+
+        Arguments:
+        bool enabled
+
+        Return:
+        None
+
+        """
+        self.ptrx().enableEventStats(enabled)
+
+    def resetEventStats(self, ):
+        """
+        Reset the event counters and timings.
+
+        Syntax::
+
+            resetEventStats()
+
+        Arguments:
+        None
+
+        Return:
+        None
+
+        """
+        self.ptrx().resetEventStats()
+
+    def getEventStats(self, ):
+        """
+        Return the event statistics of the kprocs hosted by this rank, one dict per (kind, name, location)
+        group of kprocs with keys 'kind', 'name', 'location', 'events',
+        'updates', 'updateTime' and 'selectTime' (times in seconds).
+
+        Syntax::
+
+            getEventStats()
+
+        Arguments:
+        None
+
+        Return:
+        list<dict>
+
+        """
+        cdef std.vector[steps_solver.KProcStats] stats = self.ptrx().getEventStats()
+        return [
+            dict(
+                kind=s.kind.decode(),
+                name=s.name.decode(),
+                location=s.location.decode(),
+                events=s.events,
+                updates=s.updates,
+                updateTime=s.updateTime,
+                selectTime=s.selectTime,
+            )
+            for s in stats
+        ]
+
     def setTime(self, double time):
         """
         Set the current simulation time.
@@ -80,22 +80,98 @@ cdef class _py_RNG(_py__base):
     # RNG is abstract
     # def __init__(self, *arg):
 
-    def initialize(self, ulong seed):
+    def initialize(self, ulong seed, ulong stream=0):
         """
         Initialize the random number generator with given seed value.
+
+        Generators initialized with the same seed and different stream indices
+        produce independent sequences of random numbers. Stream 0 is the default
+        sequence for the given seed.
         
         Syntax::
         
-            initialize(seed)
+            initialize(seed, stream=0)
         
         Arguments:
         int seed
+        int stream
+        
+        Return:
+        None
+        
+        """
+        self.ptr().get().initialize(seed, stream)
+
+    def getSeed(self, ):
+        """
+        Return the seed that was used to initialize the random number generator.
+        
+        Syntax::
+        
+        	getSeed()
+        
+        Arguments:
+        None
+        
+        Return:
+        int
+        
+        """
+        return self.ptr().get().seed()
+
+    def getStreamIndex(self, ):
+        """
+        Return the index of the stream that was used to initialize the random number generator.
+        
+        Syntax::
+        
+        	getStreamIndex()
+        
+        Arguments:
+        None
+        
+        Return:
+        int
+        
+        """
+        return self.ptr().get().stream()
+
+    def getState(self, ):
+        """
+        Return the full state of the random number generator, including its
+        position in the stream.
+        
+        Syntax::
+        
+        	getState()
+        
+        Arguments:
+        None
+        
+        Return:
+        bytes
+        
+        """
+        return self.ptr().get().getState()
+
+    def setState(self, bytes state):
+        """
+        Restore a state obtained with getState(). The random number generator
+        needs to use the same algorithm and buffer size as the one the state
+        was obtained from.
+        
+        Syntax::
+        
+        	setState(state)
+        
+        Arguments:
+        bytes state
         
         Return:
         None
         
         """
-        self.ptr().get().initialize(seed)
+        self.ptr().get().setState(state)
 
     def min(self, ):
         """
@@ -305,6 +381,104 @@ cdef class _py_RNG(_py__base):
         """
         return self.ptr().get().getBinom(t, p)
 
+    def fillUnfIE(self, double[:] out):
+        """
+        Fill an array with uniform random numbers on [0,1) real interval.
+        
+        Syntax::
+        
+        	fillUnfIE(out)
+        
+        Arguments:
+        numpy.array<float> out
+        
+        Return:
+        None
+        
+        """
+        if out.shape[0] > 0:
+            self.ptr().get().fillUnfIE(&out[0], out.shape[0])
+
+    def fillExp(self, double lambda_, double[:] out):
+        """
+        Fill an array with exponentially distributed numbers, see getExp.
+        
+        Syntax::
+        
+        	fillExp(lambda_, out)
+        
+        Arguments:
+        float lambda_
+        numpy.array<float> out
+        
+        Return:
+        None
+        
+        """
+        if out.shape[0] > 0:
+            self.ptr().get().fillExp(lambda_, &out[0], out.shape[0])
+
+    def fillPsn(self, double[:] lambdas, uint[:] out):
+        """
+        Fill an array with Poisson-distributed numbers, the mean of the ith number is lambdas[i].
+        
+        Syntax::
+        
+        	fillPsn(lambdas, out)
+        
+        Arguments:
+        numpy.array<float> lambdas
+        numpy.array<uint, length = len(lambdas)> out
+        
+        Return:
+        None
+        
+        """
+        if lambdas.shape[0] != out.shape[0]:
+            raise ValueError('Length of out array should be length of lambdas array.')
+        if out.shape[0] > 0:
+            self.ptr().get().fillPsn(&lambdas[0], &out[0], out.shape[0])
+
+    def fillBinom(self, uint[:] t, double[:] p, uint[:] out):
+        """
+        Fill an array with binomially distributed numbers, the ith number has parameters t[i] and p[i].
+        
+        Syntax::
+        
+        	fillBinom(t, p, out)
+        
+        Arguments:
+        numpy.array<uint> t
+        numpy.array<float, length = len(t)> p
+        numpy.array<uint, length = len(t)> out
+        
+        Return:
+        None
+        
+        """
+        if t.shape[0] != out.shape[0] or p.shape[0] != out.shape[0]:
+            raise ValueError('Length of t, p, and out arrays should be identical.')
+        if out.shape[0] > 0:
+            self.ptr().get().fillBinom(&t[0], &p[0], &out[0], out.shape[0])
+
+    def fillStdNrm(self, double[:] out):
+        """
+        Fill an array with standard normally distributed random numbers.
+        
+        Syntax::
+        
+        	fillStdNrm(out)
+        
+        Arguments:
+        numpy.array<float> out
+        
+        Return:
+        None
+        
+        """
+        if out.shape[0] > 0:
+            self.ptr().get().fillStdNrm(&out[0], out.shape[0])
+
     @staticmethod
     cdef _py_RNG from_shared_ptr(shared_ptr[RNG] ptr):
         cdef _py_RNG obj = _py_RNG.__new__(_py_RNG)
@@ -25,6 +25,38 @@ cdef extern from "util/finish.hpp" namespace "steps":
     void finish()
 
 
+# ======================================================================================================================
+cdef extern from "util/tracker/region_tracker.hpp" namespace "steps::util":
+# ----------------------------------------------------------------------------------------------------------------------
+
+    ###### Cybinding for RegionStats ######
+    cdef cppclass RegionStats:
+        std.string name
+        uint count
+        double time_min, time_max, time_avg
+        double memory_min, memory_max, memory_avg
+        double memoryDelta_min, memoryDelta_max, memoryDelta_avg
+
+    ###### Cybinding for RegionEvent ######
+    cdef cppclass RegionEvent:
+        std.string name
+        double start
+        double duration
+
+    ###### Cybinding for RegionTracker ######
+    cdef cppclass RegionTracker:
+        @staticmethod
+        bool enabled()
+        @staticmethod
+        void enable(bool, bool)
+        @staticmethod
+        void reset()
+        @staticmethod
+        std.vector[RegionStats] stats()
+        @staticmethod
+        std.vector[RegionEvent] events()
+
+
 # ======================================================================================================================
 cdef extern from "util/error.hpp" namespace "steps":
 # ----------------------------------------------------------------------------------------------------------------------
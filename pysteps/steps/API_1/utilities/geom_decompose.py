@@ -24,6 +24,8 @@
 from __future__ import print_function
 
 from numpy import *
+from numpy.linalg import eigh
+import heapq
 import math
 import warnings
 
@@ -90,39 +92,242 @@ def linearPartition(mesh, partition_info):
     """
     assert(len(partition_info)==3)
     
-    bmax = mesh.getBoundMax()
-    bmin = mesh.getBoundMin()
+    bmax = array(mesh.getBoundMax())
+    bmin = array(mesh.getBoundMin())
+    nbins = array(partition_info, dtype=int64)
     
-    dx = (bmax[0]-bmin[0])/partition_info[0]
-    dy = (bmax[1]-bmin[1])/partition_info[1]
-    dz = (bmax[2]-bmin[2])/partition_info[2]
+    d = (bmax - bmin) / nbins
+    d[d <= 0] = 1
     
-    part=zeros(mesh.ntets, dtype=INDEX_DTYPE)    
+    inds = arange(mesh.ntets, dtype=INDEX_DTYPE)
+    baryc = zeros(mesh.ntets * 3)
+    if mesh.ntets > 0:
+        mesh.getBatchTetBarycentersNP(inds, baryc)
+    baryc = baryc.reshape((mesh.ntets, 3))
     
-    for tet in range(mesh.ntets):
-        idx=0
-        baryc = mesh.getTetBarycenter(tet)
-        
-        z= bmin[2]
-        zidx=0
-        while(zidx<partition_info[2]):
-            y = bmin[1]
-            yidx=0
-            while(yidx<partition_info[1]):
-                x=bmin[0]
-                xidx=0
-                while(xidx<partition_info[0]):
-                    if baryc[2] >= z and baryc[2] < z+dz and baryc[1] >= y and baryc[1] < y+dy and baryc[0] >= x and baryc[0] < x+dx:
-                        part[tet] = idx
-                    x+=dx
-                    xidx+=1
-                    idx+=1
-                y+=dy
-                yidx+=1
-            z+=dz
-            zidx+=1
+    # Bin index along each axis, tets that lie on the upper boundary go to the last bin
+    binInds = clip(floor((baryc - bmin) / d).astype(int64), 0, nbins - 1)
+    part = (binInds[:, 2] * nbins[1] + binInds[:, 1]) * nbins[0] + binInds[:, 0]
+    
+    return part.astype(INDEX_DTYPE).tolist()
+
+################################################################################
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+################################################################################
+
+def _getTetAdjacency(mesh):
+    """
+    Return the (ntets, 4) array of tetrahedron neighbors, UNKNOWN_TET marks missing neighbors.
+    """
+    inds = arange(mesh.ntets, dtype=INDEX_DTYPE)
+    neighbs = zeros(mesh.ntets * 4, dtype=INDEX_DTYPE)
+    if mesh.ntets > 0:
+        mesh.getBatchTetTetNeighbsNP(inds, neighbs)
+    return neighbs.reshape((mesh.ntets, 4))
+
+def _bisect(coords, weights, inds, nparts, offset, method, part):
+    """
+    Recursively split inds into nparts parts of proportional weight, write the result in part.
+    """
+    if nparts == 1 or len(inds) == 0:
+        part[inds] = offset
+        return
+    n1 = nparts // 2
+    pts = coords[inds]
+    w = weights[inds]
+    if method == 'inertial' and len(inds) > 1:
+        # Principal axis of the weighted inertia tensor
+        center = average(pts, axis=0, weights=w) if w.sum() > 0 else pts.mean(axis=0)
+        diff = pts - center
+        cov = (diff * w[:, newaxis]).T @ diff
+        eigvals, eigvecs = eigh(cov)
+        proj = diff @ eigvecs[:, -1]
+    else:
+        axis = (pts.max(axis=0) - pts.min(axis=0)).argmax()
+        proj = pts[:, axis]
+    order = argsort(proj, kind='stable')
+    cumw = cumsum(w[order])
+    k = int(searchsorted(cumw, cumw[-1] * n1 / nparts))
+    k = int(clip(k, 1, len(inds) - 1)) if len(inds) > 1 else k
+    _bisect(coords, weights, inds[order[:k]], n1, offset, method, part)
+    _bisect(coords, weights, inds[order[k:]], nparts - n1, offset + n1, method, part)
+
+def _bestMove(neighbs, valid, part, tet):
+    """
+    Return (gain, dest) for the best move of tet to the part of one of its neighbors, gain being
+    the reduction of the number of cut faces. Return None if all neighbors are in the same part.
+    """
+    counts = {}
+    for n in neighbs[tet][valid[tet]]:
+        p = part[n]
+        counts[p] = counts.get(p, 0) + 1
+    own = counts.pop(part[tet], 0)
+    if len(counts) == 0:
+        return None
+    dest, cnt = sorted(counts.items(), key=lambda x: (-x[1], x[0]))[0]
+    return cnt - own, dest
+
+def _bestMoves(neighbs, valid, part, tets):
+    """
+    Vectorized version of _bestMove for an array of boundary tetrahedrons, return (gains, dests)
+    arrays.
+    """
+    own = part[tets]
+    nparts = part.max() + 1
+    nvalid = valid[tets]
+    nparts_arr = where(nvalid, part[where(nvalid, neighbs[tets], 0)], -1)
+    own_cnt = (nparts_arr == own[:, newaxis]).sum(axis=1)
+    # Number of neighbors in the same part as each neighbor, ties are broken with the lowest part
+    cnts = (nparts_arr[:, :, newaxis] == nparts_arr[:, newaxis, :]).sum(axis=2)
+    other = (nparts_arr >= 0) & (nparts_arr != own[:, newaxis])
+    scores = where(other, cnts * (nparts + 1) + (nparts - nparts_arr), -1)
+    best = scores.argmax(axis=1)
+    rows = arange(len(tets))
+    return cnts[rows, best] - own_cnt, nparts_arr[rows, best]
+
+def _refinePartition(neighbs, weights, part, nparts, max_imbalance, passes):
+    """
+    Refine the partition with Fiduccia-Mattheyses passes on the tetrahedron adjacency graph.
+    
+    During a pass, the boundary tetrahedron with the highest gain (reduction of the number of cut
+    faces) is repeatedly moved to a neighboring part and locked, even if its gain is negative, as
+    long as the load of the destination part stays below max_imbalance times the average load.
+    The gains of its neighbors are then updated. The pass ends when no move is possible or when
+    the number of moves reaches the number of boundary tetrahedrons at the start of the pass, and
+    the moves made after the best cut was reached are rolled back. Refinement stops when a pass
+    does not reduce the cut.
+    
+    The initial gains are computed with numpy, the moves themselves are done in python. A pass
+    thus costs O(B log B) python operations with B the number of boundary tetrahedrons, which
+    grows like the surface of the partitions, not like the number of tetrahedrons.
+    """
+    valid = neighbs != UNKNOWN_TET
+    loads = bincount(part, weights=weights, minlength=nparts)
+    max_load = max_imbalance * weights.sum() / nparts
+    for p in range(passes):
+        # Boundary tetrahedrons have at least one neighbor in another part
+        boundary = flatnonzero((valid & (part[where(valid, neighbs, 0)] != part[:, newaxis])).any(axis=1))
+        if len(boundary) == 0:
+            break
+
+        version = zeros(len(part), dtype=int64)
+        locked = zeros(len(part), dtype=bool)
+        gains, dests = _bestMoves(neighbs, valid, part, boundary)
+        heap = list(zip((-gains).tolist(), boundary.tolist(), dests.tolist(), [0] * len(boundary)))
+        heapq.heapify(heap)
+
+        moves = []
+        cum_gain = best_gain = 0
+        best_nb_moves = 0
+        while len(heap) > 0 and len(moves) < len(boundary):
+            neg_gain, tet, dest, vers = heapq.heappop(heap)
+            if locked[tet] or vers != version[tet]:
+                continue
+            if loads[dest] + weights[tet] > max_load:
+                continue
+            src = part[tet]
+            loads[src] -= weights[tet]
+            loads[dest] += weights[tet]
+            part[tet] = dest
+            locked[tet] = True
+            moves.append((tet, src, dest))
+            cum_gain -= neg_gain
+            if cum_gain > best_gain:
+                best_gain, best_nb_moves = cum_gain, len(moves)
+            for n in neighbs[tet][valid[tet]].tolist():
+                if not locked[n]:
+                    version[n] += 1
+                    move = _bestMove(neighbs, valid, part, n)
+                    if move is not None:
+                        heapq.heappush(heap, (-move[0], n, move[1], version[n]))
+
+        # Roll back to the best cut
+        for tet, src, dest in reversed(moves[best_nb_moves:]):
+            loads[dest] -= weights[tet]
+            loads[src] += weights[tet]
+            part[tet] = src
+        if best_gain <= 0:
+            break
+
+def graphPartition(mesh, nparts, weights=None, method='inertial', max_imbalance=1.05, refine_passes=8):
+    """
+    Partition the mesh with recursive bisection followed by a refinement of the cut.
+    
+    The tetrahedrons are recursively split in two sets of proportional weight, along the
+    principal axis of inertia of their barycenters ('inertial') or along the longest axis of
+    their bounding box ('coordinate'). The resulting partition is then refined on the tetrahedron
+    adjacency graph with Fiduccia-Mattheyses passes, moving boundary tetrahedrons to reduce the
+    number of cut faces while keeping the load of each partition below max_imbalance times the
+    average load.
+    
+    Parameters:
+        * mesh                STEPS Tetmesh object
+        * nparts              Number of partitions
+        * weights             Computational cost of each tetrahedron (Optional, defaults to 1 for all tetrahedrons)
+        * method              Bisection method, 'inertial' or 'coordinate'
+        * max_imbalance       Maximum ratio between the load of a partition and the average load during refinement
+        * refine_passes       Maximum number of refinement passes, 0 disables refinement
     
-    return list(part)
+    Return:
+        Tetrahedron partition list for parallel TetOpsplit solver
+    """
+    if nparts < 1:
+        raise ValueError("The number of partitions should be a strictly positive integer.")
+    if method not in ('inertial', 'coordinate'):
+        raise ValueError("Unknown bisection method %s, expected 'inertial' or 'coordinate'." % (method))
+    
+    ntets = mesh.ntets
+    weights = ones(ntets) if weights is None else array(weights, dtype=float64).reshape(-1)
+    if len(weights) != ntets:
+        raise ValueError("Expected %i tetrahedron weights, got %i." % (ntets, len(weights)))
+    if (weights < 0).any():
+        raise ValueError("Tetrahedron weights should be positive.")
+    
+    inds = arange(ntets, dtype=INDEX_DTYPE)
+    coords = zeros(ntets * 3)
+    if ntets > 0:
+        mesh.getBatchTetBarycentersNP(inds, coords)
+    coords = coords.reshape((ntets, 3))
+    
+    part = zeros(ntets, dtype=int64)
+    _bisect(coords, weights, arange(ntets), nparts, 0, method, part)
+    if refine_passes > 0 and nparts > 1:
+        _refinePartition(_getTetAdjacency(mesh), weights, part, nparts, max_imbalance, refine_passes)
+    
+    return part.tolist()
+
+################################################################################
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+################################################################################
+
+def getPartitionCommStat(mesh, tet_partitions):
+    """
+    Compute the number of faces shared between tetrahedrons of each pair of partitions.
+    
+    Parameters:
+        * mesh                STEPS Tetmesh object
+        * tet_partitions      Partition list for tetrahedrons
+    
+    Return:
+        A dictionary in the format of {(host0, host1): nb_cut_faces, ...} with host0 < host1
+    """
+    part = array(tet_partitions, dtype=int64)
+    neighbs = _getTetAdjacency(mesh)
+    tets = repeat(arange(mesh.ntets), 4)
+    neighbs = neighbs.reshape(-1)
+    # Count each face once
+    valid = (neighbs != UNKNOWN_TET) & (neighbs > tets)
+    p0, p1 = part[tets[valid]], part[neighbs[valid]]
+    cut = p0 != p1
+    pairs = stack((minimum(p0[cut], p1[cut]), maximum(p0[cut], p1[cut])), axis=1)
+    if len(pairs) == 0:
+        return {}
+    pairs, counts = unique(pairs, axis=0, return_counts=True)
+    return {(int(h0), int(h1)): int(c) for (h0, h1), c in zip(pairs, counts)}
 
 ################################################################################
 
@@ -143,33 +348,37 @@ def partitionTris(mesh, tet_partitions, tri_list):
         Triangle partition list for parallel TetOpsplit solver
     """
     
-    tri_partitions = {}
-    for tri in tri_list:
-        neigh_tets = mesh.getTriTetNeighb(tri)
-        if neigh_tets[0] == UNKNOWN_TET and neigh_tets[0] == UNKNOWN_TET:
-            print("Triangle ", tri, " has no attatched tetrahedron, which is unlikely. Please check your mesh.\n")
-            continue
-        if neigh_tets[0] == UNKNOWN_TET:
-            tri_partitions[tri] = tet_partitions[neigh_tets[1]]
-            continue
-        if neigh_tets[1] == UNKNOWN_TET:
-            tri_partitions[tri] = tet_partitions[neigh_tets[0]]
-            continue
-        if tet_partitions[neigh_tets[0]] == tet_partitions[neigh_tets[1]]:
-            tri_partitions[tri] = tet_partitions[neigh_tets[0]]
-            continue
-        print("Neighbor tetrahedrons of triangle ", tri, " are assigned to different hosts, try to rearrange hosts for them.\n")
-        tri_partitions[tri] = tet_partitions[neigh_tets[0]]
-        tet_partitions[neigh_tets[1]] = tet_partitions[neigh_tets[0]]
-
-    for tri in tri_list:
-        neigh_tets = mesh.getTriTetNeighb(tri)
-        for neigh_tet in neigh_tets:
-            if neigh_tet == UNKNOWN_TET: continue
-            if tet_partitions[neigh_tet] != tri_partitions[tri]:
-                raise Exception("Patch triangle %i and its compartment tet are assigned to different processes." % (tri))
-
-    return tri_partitions
+    tris = array(tri_list, dtype=INDEX_DTYPE).reshape(-1)
+    neigh_tets = zeros(len(tris) * 2, dtype=INDEX_DTYPE)
+    if len(tris) > 0:
+        mesh.getBatchTriTetNeighbsNP(tris, neigh_tets)
+    neigh_tets = neigh_tets.reshape((len(tris), 2))
+    known = neigh_tets != UNKNOWN_TET
+
+    for tri in tris[~known.any(axis=1)]:
+        print("Triangle ", tri, " has no attatched tetrahedron, which is unlikely. Please check your mesh.\n")
+
+    tet_parts = array(tet_partitions)
+    # Triangles whose neighbor tetrahedrons are assigned to different hosts
+    both = known.all(axis=1)
+    conflicts = flatnonzero(both)[tet_parts[neigh_tets[both, 0]] != tet_parts[neigh_tets[both, 1]]]
+    # Resolve conflicts sequentially since a reassignment can affect the following ones
+    for i in conflicts:
+        tet0, tet1 = neigh_tets[i]
+        if tet_parts[tet0] != tet_parts[tet1]:
+            print("Neighbor tetrahedrons of triangle ", tris[i], " are assigned to different hosts, try to rearrange hosts for them.\n")
+            tet_parts[tet1] = tet_parts[tet0]
+            tet_partitions[tet1] = tet_partitions[tet0]
+
+    assigned = known.any(axis=1)
+    tris, neigh_tets, known = tris[assigned], neigh_tets[assigned], known[assigned]
+    parts = tet_parts[where(known[:, 0], neigh_tets[:, 0], neigh_tets[:, 1])]
+
+    mismatch = known & (tet_parts[where(known, neigh_tets, 0)] != parts[:, newaxis])
+    if mismatch.any():
+        raise Exception("Patch triangle %i and its compartment tet are assigned to different processes." % (tris[mismatch.any(axis=1)][0]))
+
+    return dict(zip(tris.tolist(), parts.tolist()))
 
 ################################################################################
 
@@ -274,7 +483,7 @@ def printHostDistStat(tet_partitions = [], tri_partitions = {}, wmvol_partitions
 
 ################################################################################
 
-def printPartitionStat(tet_partitions = [], tri_partitions = {}, wmvol_partitions = [], mesh = None):
+def printPartitionStat(tet_partitions = [], tri_partitions = {}, wmvol_partitions = [], mesh = None, tet_weights = None):
     """
     Print out partitioning stastics.
         
@@ -283,6 +492,7 @@ def printPartitionStat(tet_partitions = [], tri_partitions = {}, wmvol_partition
         * tri_partitions    Partition list for triangles (Optional)
         * wmvol_partitions  Partition list for well-mixed volumes (Optional)
         * mesh              STEPS Tetmesh object (Optional)
+        * tet_weights       Computational cost of each tetrahedron, used for the imbalance ratio (Optional)
         
     Return:
         (If mesh is provided) tet_stats, tri_stats, wm_stats, num_hosts, min_degree, max_degree, mean_degree
@@ -297,12 +507,15 @@ def printPartitionStat(tet_partitions = [], tri_partitions = {}, wmvol_partition
     print("Total number of assigned tets: ", len(tet_partitions))
     if tet_stats != []:
         print("Distribution: ",)
-        sum = 0
+        total = 0
         for h in tet_stats:
             print(h,)
-            sum += h
+            total += h
         print("")
-        print("Sum: ", sum)
+        print("Sum: ", total)
+        loads = bincount(array(tet_partitions, dtype=int64), weights=tet_weights)
+        loads = loads[array(tet_stats) > 0]
+        print("Imbalance ratio (max load / mean load): ", loads.max() / loads.mean() if loads.mean() > 0 else 1.0)
 
     tri_stats = []
     for tri_id in tri_partitions.keys():
@@ -314,12 +527,12 @@ def printPartitionStat(tet_partitions = [], tri_partitions = {}, wmvol_partition
     print("Total number of assigned tris: ", len(tri_partitions))
     if tri_stats != []:
         print("Distribution: ",)
-        sum = 0
+        total = 0
         for h in tri_stats:
-            sum += h
+            total += h
             print(h,)
         print("")
-        print("Sum: ", sum)
+        print("Sum: ", total)
 
     wm_stats = []
     for host in wmvol_partitions:
@@ -330,29 +543,27 @@ def printPartitionStat(tet_partitions = [], tri_partitions = {}, wmvol_partition
     print("Total number of assigned well-mixed volumes: ", len(wmvol_partitions))
     if wm_stats != []:
         print("WMVol Distribution: ",)
-        sum = 0
+        total = 0
         for h in wm_stats:
-            sum += h
+            total += h
             print(h,)
         print("")
-        print("Sum: ", sum)
+        print("Sum: ", total)
 
     if mesh is not None:
-        partition_neighbors = {}
-        for tet in range(mesh.ntets):
-            tet_part = tet_partitions[tet]
-            if tet_part not in partition_neighbors.keys():
-                partition_neighbors[tet_part] = set()
-            neighbor_tets = mesh.getTetTetNeighb(tet)
-            for neighb in neighbor_tets:
-                if neighb == UNKNOWN_TET: continue
-                neighb_tet_part = tet_partitions[neighb]
-                if neighb_tet_part != tet_part:
-                    partition_neighbors[tet_part].add(neighb_tet_part)
+        comm_stats = getPartitionCommStat(mesh, tet_partitions)
+        partition_neighbors = {host: set() for host in set(tet_partitions)}
+        for h0, h1 in comm_stats:
+            partition_neighbors[h0].add(h1)
+            partition_neighbors[h1].add(h0)
 
         host_degrees = []
         for neighbs in partition_neighbors.values():
             host_degrees.append(len(neighbs))
+        print("Communication volume (cut faces per partition pair): ")
+        for (h0, h1), nb_faces in sorted(comm_stats.items()):
+            print(h0, "-", h1, ": ", nb_faces)
+        print("Total number of cut faces: ", sum(list(comm_stats.values())))
         print("Number of partitions: ", len(tet_stats))
         print("Min Tet Partition Degree: ", min(host_degrees))
         print("Max Tet Partition Degree: ", max(host_degrees))
@@ -36,10 +36,96 @@ e.g. finding overlap surface triangles in meshes.
 
 """
 
+import numpy
+
 import steps.API_1.geom
-from steps.API_1.geom import UNKNOWN_TET
+from steps.API_1.geom import UNKNOWN_TET, INDEX_DTYPE
 from math import *
 
+################################################################################
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # 
+################################################################################
+def _getTetTris(mesh, tets):
+    """
+    Return the (len(tets), 4) array of triangle neighbors of tets.
+    """
+    tets = numpy.array(tets, dtype=INDEX_DTYPE).reshape(-1)
+    tris = numpy.zeros(len(tets) * 4, dtype=INDEX_DTYPE)
+    if len(tets) > 0:
+        mesh.getBatchTetTriNeighbsNP(tets, tris)
+    return tris.reshape((len(tets), 4))
+
+def _getSurfTriData(mesh):
+    """
+    Return the surface triangles of mesh, their barycenters, the index of their tetrahedron
+    neighbor and its barycenter.
+    """
+    tris = numpy.array(mesh.getSurfTris(), dtype=INDEX_DTYPE)
+    n = len(tris)
+    centers = numpy.zeros(n * 3)
+    neighbs = numpy.zeros(n * 2, dtype=INDEX_DTYPE)
+    if n > 0:
+        mesh.getBatchTriBarycentersNP(tris, centers)
+        mesh.getBatchTriTetNeighbsNP(tris, neighbs)
+    neighbs = neighbs.reshape((n, 2))
+    tets = numpy.where(neighbs[:, 0] != UNKNOWN_TET, neighbs[:, 0], neighbs[:, 1])
+    tet_centers = numpy.zeros(n * 3)
+    if n > 0:
+        mesh.getBatchTetBarycentersNP(tets, tet_centers)
+    return tris, centers.reshape((n, 3)), tets, tet_centers.reshape((n, 3))
+
+def _findClosePoints(pts1, pts2, tolerance):
+    """
+    Return the indices (i, j) of all pairs of points such that |pts1[i] - pts2[j]| <= tolerance,
+    sorted by i and then by j.
+    
+    Points are hashed into a regular grid whose cells are at least tolerance wide, only points
+    in neighboring cells are compared.
+    """
+    empty = numpy.array([], dtype=numpy.int64)
+    if len(pts1) == 0 or len(pts2) == 0:
+        return empty, empty
+    allPts = numpy.concatenate((pts1, pts2))
+    pmin = allPts.min(axis=0)
+    extent = (allPts.max(axis=0) - pmin).max()
+    # Limit the number of cells per axis so that cell keys fit in 64 bits
+    cell = max(tolerance, extent / 2**20)
+    if cell <= 0:
+        cell = 1.0
+    cells1 = numpy.floor((pts1 - pmin) / cell).astype(numpy.int64) + 1
+    cells2 = numpy.floor((pts2 - pmin) / cell).astype(numpy.int64) + 1
+    dims = numpy.maximum(cells1.max(axis=0), cells2.max(axis=0)) + 2
+    def _key(c):
+        return (c[:, 0] * dims[1] + c[:, 1]) * dims[2] + c[:, 2]
+
+    keys2 = _key(cells2)
+    order2 = numpy.argsort(keys2, kind='stable')
+    keys2 = keys2[order2]
+
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)] if tolerance > 0 else [(0, 0, 0)]
+    res1, res2 = [], []
+    for off in offsets:
+        k1 = _key(cells1 + numpy.array(off))
+        lo = numpy.searchsorted(keys2, k1, side='left')
+        cnt = numpy.searchsorted(keys2, k1, side='right') - lo
+        total = cnt.sum()
+        if total == 0:
+            continue
+        i1 = numpy.repeat(numpy.arange(len(pts1)), cnt)
+        j2 = numpy.repeat(lo - numpy.cumsum(cnt) + cnt, cnt) + numpy.arange(total)
+        j2 = order2[j2]
+        if tolerance > 0:
+            close = ((pts1[i1] - pts2[j2])**2).sum(axis=1) <= tolerance**2
+        else:
+            close = (pts1[i1] == pts2[j2]).all(axis=1)
+        res1.append(i1[close])
+        res2.append(j2[close])
+    if len(res1) == 0:
+        return empty, empty
+    res1, res2 = numpy.concatenate(res1), numpy.concatenate(res2)
+    order = numpy.lexsort((res2, res1))
+    return res1[order], res2[order]
+
 ################################################################################
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # 
 ################################################################################
@@ -56,19 +142,24 @@ def findOverlapTris(mesh, tets1, tets2):
         list<uint>
     """
     
-    tris1 = set()
-    for i in tets1:
-        tritemp = mesh.getTetTriNeighb(i)
-        for j in range(4): 
-            tris1.add(tritemp[j])
-    tris2 = set()
-    for i in tets2:
-        tritemp = mesh.getTetTriNeighb(i)
-        for j in range(4): 
-            tris2.add(tritemp[j])
+    return findOverlapTrisNP(mesh, tets1, tets2).tolist()
 
-    common_tris = tris1.intersection(tris2)
-    return list(common_tris)
+def findOverlapTrisNP(mesh, tets1, tets2):
+    """
+    Find overlap triangles between two sets of tetrahedrons within a mesh.
+    
+    Batch version of findOverlapTris that returns a sorted numpy array.
+    
+    Arguements:
+        * steps.geom.Tetmesh mesh
+        * numpy.array<index_t> tets1
+        * numpy.array<index_t> tets2
+        
+    Return:
+        numpy.array<index_t>
+    """
+    
+    return numpy.intersect1d(_getTetTris(mesh, tets1), _getTetTris(mesh, tets2))
     
 ################################################################################
 
@@ -76,7 +167,7 @@ def findOverlapTris(mesh, tets1, tets2):
 
 ################################################################################
 
-def findOverlapSurfTris(mesh1, mesh2):
+def findOverlapSurfTris(mesh1, mesh2, tolerance=0.0):
     """
     Find overlap surface triangles between two meshes.
     Return a list of coupling data list formatted as
@@ -87,47 +178,47 @@ def findOverlapSurfTris(mesh1, mesh2):
     * surftri_1 and surftri_2: Indices of the overlap surface triangles.
     * tet_distance: Distance between the barycenters of tet_1 and tet_2.
     
+    Two surface triangles overlap if the distance between their barycenters
+    is lower or equal to tolerance (exact equality by default).
+    
     Arguements:
         * steps.geom.Tetmesh mesh1
         * steps.geom.Tetmesh mesh2
+        * float tolerance
         
     Return:
         list<list<uint, uint, uint, uint, float>>
     """
     
-    surfs1 = mesh1.getSurfTris()
-    surfs2 = mesh2.getSurfTris()
-    data = []
+    tets1, tris1, tets2, tris2, dists = findOverlapSurfTrisNP(mesh1, mesh2, tolerance)
+    return [list(coupling) for coupling in zip(tets1.tolist(), tris1.tolist(), tets2.tolist(), tris2.tolist(), dists.tolist())]
+
+def findOverlapSurfTrisNP(mesh1, mesh2, tolerance=0.0):
+    """
+    Find overlap surface triangles between two meshes.
     
-    for s1 in surfs1:
-        c1 = mesh1.getTriBarycenter(s1)
-        
-        neighb_tets1 = mesh1.getTriTetNeighb(s1)
-        tetid1 = neighb_tets1[0]
-        if tetid1 == UNKNOWN_TET:
-            tetid1 = neighb_tets1[1]
-        assert(tetid1 >= 0)
-        tc1 = mesh1.getTetBarycenter(tetid1)
+    Batch version of findOverlapSurfTris, the surface triangles are matched
+    using a spatial hash of their barycenters.
+    
+    Arguements:
+        * steps.geom.Tetmesh mesh1
+        * steps.geom.Tetmesh mesh2
+        * float tolerance
         
-        for s2 in surfs2:
-            c2 = mesh2.getTriBarycenter(s2)
-            if (c1[0] == c2[0]) and (c1[1] == c2[1]) and (c1[2] == c2[2]): 
-                neighb_tets2 = mesh2.getTriTetNeighb(s2)
-                tetid2 = neighb_tets2[0]
-                if tetid2 == UNKNOWN_TET:
-                    tetid2 = neighb_tets2[1]
-                assert(tetid2 >= 0)
-                tc2 = mesh2.getTetBarycenter(tetid2)
-                
-                xdist = tc1[0] - tc2[0]
-                ydist = tc1[1] - tc2[1]
-                zdist = tc1[2] - tc2[2]
-                dist = sqrt((xdist*xdist) + (ydist*ydist) + (zdist*zdist))
-                
-                coupling = [tetid1, s1, tetid2, s2, dist]
-                data.append(coupling)
-    return data
-                
+    Return:
+        (tets_1, surftris_1, tets_2, surftris_2, tet_distances) numpy arrays,
+        ordered as in findOverlapSurfTris
+    """
+    
+    if tolerance < 0:
+        raise ValueError("The tolerance should be positive or zero.")
+    
+    tris1, centers1, tets1, tet_centers1 = _getSurfTriData(mesh1)
+    tris2, centers2, tets2, tet_centers2 = _getSurfTriData(mesh2)
+    i1, i2 = _findClosePoints(centers1, centers2, tolerance)
+    dists = numpy.sqrt(((tet_centers1[i1] - tet_centers2[i2])**2).sum(axis=1))
+    return tets1[i1], tris1[i1], tets2[i2], tris2[i2], dists
+
 ################################################################################
 
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # 
@@ -170,16 +261,24 @@ def findSurfTrisInTets(mesh, tet_list):
         list<uint>
     """
 
-    tet_tris = set()
-
-    for tet in  tet_list:
-        nb_tris = mesh.getTetTriNeighb(tet)
-        for tri in nb_tris:
-            tet_tris.add(tri)
+    return findSurfTrisInTetsNP(mesh, tet_list).tolist()
 
-    surf_tris = set(mesh.getSurfTris())
-
-    return list(surf_tris.intersection(tet_tris))
+def findSurfTrisInTetsNP(mesh, tet_list):
+    """
+    Find surface triangles within a list of tetrahedrons.
+    
+    Batch version of findSurfTrisInTets that returns a sorted numpy array.
+    
+    Arguements:
+        * steps.geom.Tetmesh mesh
+        * numpy.array<index_t> tet_list
+        
+    Return:
+        numpy.array<index_t>
+    """
+    
+    surf_tris = numpy.array(mesh.getSurfTris(), dtype=INDEX_DTYPE)
+    return numpy.intersect1d(surf_tris, _getTetTris(mesh, tet_list))
             
 ################################################################################
 
@@ -75,8 +75,13 @@ amount of time to create the Tetmesh object, comparing to the loadTetmesh() meth
 
 """
 
+import ast
+import os
+import glob
+import hashlib
 import time
 import re
+import numpy
 import steps.API_1.geom as stetmesh
 import os.path as opath
 from steps.API_1.utilities.steps_shadow import *
@@ -116,12 +121,20 @@ class ElementProxy:
         self.idcounter = 0
         self.data = []
         self.importid = []
-        self.stepsid = {}
+        self._stepsid = {}
         self.blocks = {}
         self.groups = {}
         self.tempblockname = ''
         self.tempblockstart = -1
 
+    @property
+    def stepsid(self):
+        # Proxies restored from a mesh cache only store the import ids, the reverse
+        # mapping is rebuilt the first time it is needed.
+        if self._stepsid is None:
+            self._stepsid = {import_id: i for i, import_id in enumerate(self.importid)}
+        return self._stepsid
+
     def insert(self, import_id, import_data):
         """
         Insert an element to the Element Map object, a STEPS id will be assigned automatically.
@@ -1696,3 +1709,248 @@ def loadMesh(pathname, scale=1, strict=False):
 
     assert(info == '</tetmesh>')
     return (mesh,comps_out,patches_out)
+
+#############################################################################################
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+#############################################################################################
+
+MESH_CACHE_SUFFIX = '.stepsmesh.npz'
+# Bumped whenever the content of the cache files changes, so that older caches are ignored
+MESH_CACHE_VERSION = 1
+
+def _hashMeshSources(sources, params):
+    """Return the hex digest of the content of the source files and of the import parameters."""
+    h = hashlib.sha1(repr((MESH_CACHE_VERSION, params)).encode())
+    for path in sources:
+        if not opath.isfile(path):
+            # Optional files (e.g. tetgen .face) that are missing
+            h.update(b'\0')
+            continue
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+def _proxyToArrays(prefix, proxy, arrays):
+    """Add the data of an ElementProxy to arrays and return its metadata."""
+    meta = {
+        'type': proxy.getType(),
+        'unitlength': proxy.unitlength,
+        'blocks': proxy.getBlocks(),
+        'groups': list(proxy.getGroups().keys()),
+    }
+    arrays[prefix + '_data'] = numpy.asarray(proxy.getAllData())
+    importid = numpy.asarray(proxy.importid)
+    if importid.dtype.kind in 'iu':
+        arrays[prefix + '_importid'] = importid
+    else:
+        meta['importid'] = list(proxy.importid)
+    for i, grp in enumerate(proxy.getGroups().values()):
+        arrays[prefix + '_group' + str(i)] = numpy.asarray(grp, dtype=numpy.int64)
+    return meta
+
+def _proxyFromArrays(prefix, meta, data):
+    """Rebuild an ElementProxy from its metadata and the arrays stored in a cache file."""
+    proxy = ElementProxy(meta['type'], meta['unitlength'])
+    proxy.data = data[prefix + '_data'].tolist()
+    if 'importid' in meta:
+        proxy.importid = meta['importid']
+    else:
+        proxy.importid = data[prefix + '_importid'].tolist()
+    proxy.idcounter = len(proxy.importid)
+    proxy._stepsid = None
+    proxy.blocks = meta['blocks']
+    for i, key in enumerate(meta['groups']):
+        proxy.groups[key] = data[prefix + '_group' + str(i)].tolist()
+    return proxy
+
+#############################################################################################
+
+def getMeshCachePath(sources, params=()):
+    """
+    Return the path of the binary mesh cache associated with some mesh source file(s).
+
+    PARAMETERS:
+
+    * sources: list of paths to the files the mesh is imported from, the cache file
+      is placed next to the first one.
+
+    * params: any import parameters that change the resulting mesh (e.g. scale).
+
+    RETURNS: A tuple (cachepath, key)
+
+    * cachepath
+      The path of the cache file, e.g. with sources ['meshes/spine1.msh'] the cache
+      is 'meshes/spine1.<hash>.stepsmesh.npz'
+    * key
+      The content hash of the source files and of the parameters
+    """
+    key = _hashMeshSources(sources, params)
+    root = opath.splitext(sources[0])[0]
+    return (root + '.' + key[:16] + MESH_CACHE_SUFFIX, key)
+
+#############################################################################################
+
+def saveMeshCache(filename, tetmesh, proxies=None, key=''):
+    """
+    Save a STEPS Tetmesh in a compact binary (numpy .npz) file.
+
+    In addition to the vertices, triangles and tetrahedrons, the file stores the
+    compartments, patches and ROIs of the mesh and, optionally, the ElementProxy
+    objects returned by the import functions. Loading this file with loadMeshCache()
+    is much faster than parsing the original mesh file.
+
+    PARAMETERS:
+
+    * filename: the path of the cache file, it is written as is (no suffix is added).
+
+    * tetmesh: A valid STEPS Tetmesh object (of class steps.geom.Tetmesh).
+
+    * proxies: optional tuple (nodeproxy, tetproxy, triproxy) of ElementProxy objects.
+
+    * key: content hash of the mesh sources, checked by loadMeshCache().
+    """
+
+    if not isinstance(tetmesh, stetmesh.Tetmesh):
+        raise TypeError(f"Expected a steps.API_1.geom.Tetmesh object, got {tetmesh} instead.")
+
+    nverts, ntets, ntris = tetmesh.countVertices(), tetmesh.countTets(), tetmesh.countTris()
+    verts = numpy.zeros(nverts * 3)
+    tetmesh.getBatchVerticesNP(numpy.arange(nverts, dtype=stetmesh.INDEX_DTYPE), verts)
+    tets = numpy.zeros(ntets * 4, dtype=stetmesh.INDEX_DTYPE)
+    tetmesh.getBatchTetsNP(numpy.arange(ntets, dtype=stetmesh.INDEX_DTYPE), tets)
+    # All triangles are saved so that their indices are preserved when the mesh is rebuilt
+    tris = numpy.zeros(ntris * 3, dtype=stetmesh.INDEX_DTYPE)
+    tetmesh.getBatchTrisNP(numpy.arange(ntris, dtype=stetmesh.INDEX_DTYPE), tris)
+
+    arrays = {'verts': verts, 'tets': tets, 'tris': tris}
+    meta = {'key': key, 'comps': [], 'patches': [], 'rois': [], 'proxies': None}
+
+    for i, comp in enumerate(tetmesh.getAllComps()):
+        meta['comps'].append((comp.getID(), list(comp.getVolsys())))
+        arrays['comp' + str(i)] = numpy.array(comp.getAllTetIndices(), dtype=stetmesh.INDEX_DTYPE)
+
+    for i, patch in enumerate(tetmesh.getAllPatches()):
+        ocomp = patch.getOComp()
+        meta['patches'].append((
+            patch.getID(),
+            list(patch.getSurfsys()),
+            patch.getIComp().getID(),
+            ocomp.getID() if ocomp else None,
+        ))
+        arrays['patch' + str(i)] = numpy.array(patch.getAllTriIndices(), dtype=stetmesh.INDEX_DTYPE)
+
+    for i, name in enumerate(tetmesh.getAllROINames()):
+        meta['rois'].append((name, int(tetmesh.getROIType(name))))
+        arrays['roi' + str(i)] = numpy.array(tetmesh.getROIData(name), dtype=stetmesh.INDEX_DTYPE)
+
+    if proxies is not None:
+        meta['proxies'] = [_proxyToArrays('proxy' + str(i), prx, arrays) for i, prx in enumerate(proxies)]
+
+    # Metadata is stored as a python literal to avoid pickling
+    arrays['meta'] = numpy.array(repr(meta))
+
+    # Write to a temporary file first so that other processes never read a partial cache
+    tmpname = filename + '.' + str(os.getpid()) + '.tmp'
+    with open(tmpname, 'wb') as f:
+        numpy.savez(f, **arrays)
+    os.replace(tmpname, filename)
+
+#############################################################################################
+
+def loadMeshCache(filename, key=None):
+    """
+    Load a mesh from a binary cache file written by saveMeshCache().
+
+    PARAMETERS:
+
+    * filename: the path of the cache file.
+
+    * key: optional content hash, a ValueError is raised if it does not match the one
+      stored in the file.
+
+    RETURNS: A tuple (mesh, comps, patches, proxies)
+
+    * mesh
+      The STEPS Tetmesh object (steps.geom.Tetmesh)
+    * comps
+      A list of the compartment objects (steps.geom.TmComp)
+    * patches
+      A list of the patch objects (steps.geom.TmPatch)
+    * proxies
+      A tuple (nodeproxy, tetproxy, triproxy) of ElementProxy objects, or None if they
+      were not saved
+    """
+
+    with numpy.load(filename, allow_pickle=False) as data:
+        meta = ast.literal_eval(str(data['meta']))
+        if key is not None and meta['key'] != key:
+            raise ValueError(f'The mesh cache {filename} does not match its source files.')
+
+        mesh = stetmesh.Tetmesh(data['verts'], data['tets'], data['tris'])
+
+        comps_out = []
+        for i, (id, volsys) in enumerate(meta['comps']):
+            c_out = stetmesh.TmComp(id, mesh, data['comp' + str(i)])
+            for v in volsys: c_out.addVolsys(v)
+            comps_out.append(c_out)
+
+        patches_out = []
+        for i, (id, surfsys, icomp, ocomp) in enumerate(meta['patches']):
+            ptris = data['patch' + str(i)]
+            if ocomp is not None: p_out = stetmesh.TmPatch(id, mesh, ptris, mesh.getComp(icomp), mesh.getComp(ocomp))
+            else: p_out = stetmesh.TmPatch(id, mesh, ptris, mesh.getComp(icomp))
+            for s in surfsys: p_out.addSurfsys(s)
+            patches_out.append(p_out)
+
+        for i, (id, type) in enumerate(meta['rois']):
+            mesh.addROI(id, type, data['roi' + str(i)])
+
+        proxies = None
+        if meta['proxies'] is not None:
+            proxies = tuple(
+                _proxyFromArrays('proxy' + str(i), prxmeta, data) for i, prxmeta in enumerate(meta['proxies'])
+            )
+
+    return (mesh, comps_out, patches_out, proxies)
+
+#############################################################################################
+
+def loadCachedMesh(sources, params, import_func, cache=None):
+    """
+    Import a mesh, going through a binary cache stored next to its source file(s).
+
+    The cache file name contains a hash of the content of the source files and of the
+    import parameters, a modified source file thus never uses an outdated cache.
+
+    PARAMETERS:
+
+    * sources: list of paths to the files the mesh is imported from.
+
+    * params: any import parameters that change the resulting mesh (e.g. scale).
+
+    * import_func: function without arguments that imports the mesh from its sources and
+      returns a tuple (mesh, comps, patches, proxies), like loadMeshCache().
+
+    * cache: None to use an up-to-date cache if there is one, True to also write the
+      cache if it does not exist yet, False to always call import_func.
+
+    RETURNS: The tuple (mesh, comps, patches, proxies), see loadMeshCache().
+    """
+    if cache is False:
+        return import_func()
+    # Avoid hashing the sources if no cache could possibly exist
+    root = opath.splitext(sources[0])[0]
+    if cache is None and len(glob.glob(glob.escape(root) + '.*' + MESH_CACHE_SUFFIX)) == 0:
+        return import_func()
+
+    cachepath, key = getMeshCachePath(sources, params)
+    if opath.isfile(cachepath):
+        return loadMeshCache(cachepath, key)
+
+    res = import_func()
+    if cache:
+        saveMeshCache(cachepath, res[0], res[3], key)
+    return res
@@ -25,9 +25,11 @@ from __future__ import print_function
 
 # Supporting Module for generating STEPS morph sectioning file using NEURON
 
+import numpy
+
 from steps.API_1.utilities.geom_decompose import getCenter
 from steps.API_1.utilities.geom_decompose import isPointInTruncatedCone
-from steps.API_1.geom import UNKNOWN_TET, UNKNOWN_TRI
+from steps.API_1.geom import INDEX_DTYPE, UNKNOWN_TET, UNKNOWN_TRI
 
 
 try:
@@ -105,6 +107,16 @@ def swc2morph(swc_file):
 ################################################################################
 
 
+def _findTetsByPoints(mesh, points):
+    """
+    Return the list of tetrahedrons that contain each point, using a single batch search.
+    """
+    coords = numpy.array(points, dtype=float).reshape(-1)
+    tets = numpy.empty(len(coords) // 3, dtype=INDEX_DTYPE)
+    mesh.findTetsByPointsNP(coords, tets)
+    return tets.tolist()
+
+
 def mapMorphTetmesh(morph_sections, mesh, morph2mesh_scale=1e-6):
     """
     Map each tetrahedron in a mesh to morph sectioning.
@@ -124,18 +136,27 @@ def mapMorphTetmesh(morph_sections, mesh, morph2mesh_scale=1e-6):
 
         points = sec["points"]
         npoints = len(points)
+        if npoints < 2:
+            continue
+
+        # Locate all tracking points and end points of the section at once
+        centers = [getCenter(points[i], points[i+1], morph2mesh_scale) for i in range(npoints - 1)]
+        center_tets = _findTetsByPoints(mesh, centers)
+        end_tets = _findTetsByPoints(
+            mesh, [[p[0] * morph2mesh_scale, p[1] * morph2mesh_scale, p[2] * morph2mesh_scale] for p in points])
+
         for i in range(npoints - 1):
             p0 = points[i]
             p1 = points[i+1]
-            center = getCenter(p0, p1, morph2mesh_scale)
-            intet = mesh.findTetByPoint(center)
+            center = centers[i]
+            intet = center_tets[i]
             if intet == UNKNOWN_TET:
                 print("Tracking point ", center, " of ", sec["name"], " is not in the mesh.")
                 print("Try to track end points instead.")
-                intet = mesh.findTetByPoint([p0[0] * morph2mesh_scale, p0[1] * morph2mesh_scale, p0[2] * morph2mesh_scale])
+                intet = end_tets[i]
                 if intet == UNKNOWN_TET:
                     print("First end point is not in the mesh, try second end point.")
-                    intet = mesh.findTetByPoint([p1[0] * morph2mesh_scale, p1[1] * morph2mesh_scale, p1[2] * morph2mesh_scale])
+                    intet = end_tets[i+1]
                     if intet == UNKNOWN_TET:
                         print("Second end point not in the mesh, will skip this cylinder.")
                         continue
@@ -109,8 +109,9 @@ def MLfunc(level, refs):
     elif(chrct == '-'):
         return MLfunc(level[1][0], refs) - MLfunc(level[1][1], refs)
     elif(chrct == '/'):
-        if  MLfunc(level[1][1], refs) == 0.0: return 0.0
-        else: return MLfunc(level[1][0], refs) / MLfunc(level[1][1], refs)    
+        den = MLfunc(level[1][1], refs)
+        if  den == 0.0: return 0.0
+        else: return MLfunc(level[1][0], refs) / den
     elif (chrct == 'power'):
         return math.pow(MLfunc(level[1][0], refs), MLfunc(level[1][1], refs))
     elif (chrct == 'root'):
@@ -141,7 +142,7 @@ def MLfunc(level, refs):
         return math.ceil(MLfunc(level[1][0], refs))
     elif (chrct == 'piecewise'):
         # The length of the list /2 will give an integer - the number of piecwise tests
-        for i in range(len(level[1])/2):
+        for i in range(len(level[1])//2):
             if (MLfunc(level[1][(i*2)+1], refs)): 
                 return MLfunc(level[1][i*2], refs)
         return MLfunc(level[1][-1], refs)
@@ -174,6 +175,98 @@ def MLfunc(level, refs):
 
 ####################################################################################################
 
+# MathML operators that directly map to python operators or functions
+_ML_BINARY_OPS = {'+': '+', '*': '*', '-': '-', 'lt': '<', 'leq': '<=', 'gt': '>', 'geq': '>=',
+    'eq': '==', 'neq': '!=', 'and': 'and', 'or': 'or'}
+_ML_UNARY_FUNCS = {'exp': 'math.exp', 'abs': 'abs', 'ln': 'math.log', 'log': 'math.log10',
+    'floor': 'math.floor', 'ceiling': 'math.ceil', 'sin': 'math.sin', 'cos': 'math.cos',
+    'tan': 'math.tan', 'sinh': 'math.sinh', 'cosh': 'math.cosh', 'tanh': 'math.tanh',
+    'arcsin': 'math.asin', 'arccos': 'math.acos', 'arctan': 'math.atan'}
+
+def _ml_ref(ref):
+    """
+    Returns the value of a [value, factor] reference in given units
+    """
+    if ref[1]: return ref[0]/ref[1]
+    else: return ref[0]
+
+def _ml_div(num, den):
+    """
+    Division with the same convention as MLfunc for null denominators.
+    The numerator is a function that is only called if the denominator is not null.
+    """
+    if den == 0.0: return 0.0
+    else: return num() / den
+
+def _MLtoPython(level, consts):
+    """
+    Returns a python expression equivalent to the MathML list 'level'.
+    Numbers and names are not written in the expression, they are appended to consts
+    and referred to as _c<index>.
+    """
+    if (is_num(level) or isinstance(level, (str))):
+        consts.append(level)
+        cname = '_c%d'%(len(consts) - 1)
+        if (is_num(level)): return cname
+        else: return '_ref(refs[%s])'%cname
+
+    if (not level or (len(level) != 2)):
+        raise NotImplementedError("Symbol in maths not a number, a known variable, or an expression.")
+
+    chrct, args = level
+
+    if (chrct in _ML_BINARY_OPS):
+        return '(%s %s %s)'%(_MLtoPython(args[0], consts), _ML_BINARY_OPS[chrct], _MLtoPython(args[1], consts))
+    elif (chrct in _ML_UNARY_FUNCS):
+        return '%s(%s)'%(_ML_UNARY_FUNCS[chrct], _MLtoPython(args[0], consts))
+    elif (chrct == '/'):
+        # Like in MLfunc, the numerator is not evaluated if the denominator is null
+        return '_div(lambda: %s, %s)'%(_MLtoPython(args[0], consts), _MLtoPython(args[1], consts))
+    elif (chrct == 'power'):
+        return 'math.pow(%s, %s)'%(_MLtoPython(args[0], consts), _MLtoPython(args[1], consts))
+    elif (chrct == 'root'):
+        return 'math.pow(%s, (1.0/%s))'%(_MLtoPython(args[0], consts), _MLtoPython(args[1], consts))
+    elif (chrct == 'not'):
+        return '(not %s)'%_MLtoPython(args[0], consts)
+    elif (chrct == 'piecewise'):
+        # Pairs of (value, condition) followed by the 'otherwise' value, tested in order
+        expr = _MLtoPython(args[-1], consts)
+        for i in reversed(range(len(args)//2)):
+            expr = '(%s if %s else %s)'%(_MLtoPython(args[i*2], consts), _MLtoPython(args[(i*2)+1], consts), expr)
+        return expr
+    else:
+        raise NotImplementedError("Unknown character in maths.")
+
+def compileML(level):
+    """
+    Returns a function that takes the same refs argument as MLfunc and returns the same result
+    as MLfunc(level, refs), without having to walk the MathML list at each call.
+
+    Arguments:
+        level: the function in list form
+    """
+    consts = []
+    try:
+        expr = _MLtoPython(level, consts)
+        namespace = {'math': math, '_ref': _ml_ref, '_div': _ml_div}
+        for i, c in enumerate(consts):
+            namespace['_c%d'%i] = c
+        func = eval('lambda refs: ' + expr, namespace)
+    except (NotImplementedError, SyntaxError, RecursionError, MemoryError):
+        # Unsupported maths only raise an error when evaluated, very deeply nested maths
+        # cannot be compiled; both are left to MLfunc.
+        return lambda refs: MLfunc(level, refs)
+
+    def evaluate(refs):
+        try:
+            return func(refs)
+        except KeyError as e:
+            raise NotImplementedError("Unknown parameter '%s' in maths."%e.args[0])
+
+    return evaluate
+
+####################################################################################################
+
 def rate_func(level, refs, params_refs, return_list, bad_params):
     """
     Returns the result of a function imported from mathML -> python list
@@ -586,6 +679,9 @@ class Interface(object):
         self.__evnts_fire = {}
         # And an object to store values if they are to be evaluated at trigger time
         self.__evnts_vals = {}
+
+        # Compile the maths of rules, math reactions and events that are evaluated in updateSim
+        self._compileMaths()
         
         # Store hard-value of parameter conversions to save recalculating on the fly everytime:
         self.__param_converter_vol={}
@@ -624,6 +720,21 @@ class Interface(object):
         self.__evnts_trig, self.__evnts_ass, self.__evnts_dl, self.__evnts_flip, self.__evnts_trigvals = self._parseevnts()
         self.__evnts_fire = {}
         self.__evnts_vals = {}
+        self._compileMaths()
+
+    ################################################################################################
+
+    def _compileMaths(self):
+        """
+        Compile all the maths that are evaluated in updateSim, see compileML.
+        """
+        self.__rules_rate_f = {r: compileML(self.__rules_rate[r][1]) for r in self.__rules_rate}
+        self.__rules_ass_f = {r: compileML(self.__rules_ass[r][1]) for r in self.__rules_ass}
+        self.__math_reactions_f = [(compileML(mr[2]), compileML(mr[1])) for mr in self.__math_reactions]
+        self.__surface_math_reactions_f = [(compileML(smr[2]), compileML(smr[1])) for smr in self.__surface_math_reactions]
+        self.__evnts_trig_f = {ev: compileML(self.__evnts_trig[ev]) for ev in self.__evnts_trig}
+        self.__evnts_dl_f = {ev: compileML(self.__evnts_dl[ev][0]) for ev in self.__evnts_dl}
+        self.__evnts_ass_f = {ev: [compileML(ass[1]) for ass in self.__evnts_ass[ev]] for ev in self.__evnts_ass}
 
     ################################################################################################
         
@@ -3591,7 +3702,7 @@ class Interface(object):
             var = self.__rules_rate[r_rate][0]
             # MLfunc returned value should be / (timeunits) so convert to /s
             # This is a rate so we multiply by sim dt
-            value = MLfunc(self.__rules_rate[r_rate][1], variables)*(simdt/self.__time_units)
+            value = self.__rules_rate_f[r_rate](variables)*(simdt/self.__time_units)
             if (var in self.__species):
                 # Convert to SBML units
                 value*=self.__species[var][1]
@@ -3719,7 +3830,7 @@ class Interface(object):
         for r_ass in self.__rules_ass:
             var = self.__rules_ass[r_ass][0]
             # Returned value is in given units
-            value = MLfunc(self.__rules_ass[r_ass][1], variables)
+            value = self.__rules_ass_f[r_ass](variables)
             if (var in self.__species):
                 # First convert to SBML units
                 value*=self.__species[var][1]
@@ -3845,7 +3956,7 @@ class Interface(object):
         ## VOLUME REACTIONS
         
         # These are reactions with unexpected mathmeatics. 
-        for mr in self.__math_reactions:
+        for mr, (exp_rate_f, actual_rate_f) in zip(self.__math_reactions, self.__math_reactions_f):
         
             # Might have a local paramter, so have to get the global ones then
             # possibly override with any local ones
@@ -3854,8 +3965,8 @@ class Interface(object):
 
             # Parameter can depend on anything and is actual rate/expected rate
             # of course expected rate is without parameter
-            exp_rate = MLfunc(mr[2], variables)
-            actual_rate =MLfunc(mr[1], variables)
+            exp_rate = exp_rate_f(variables)
+            actual_rate = actual_rate_f(variables)
                         
             # Occasional case where both are zero
             if exp_rate == 0.0: kconst = 0.0
@@ -3897,7 +4008,7 @@ class Interface(object):
         ## SURFACE REACTIONS
         
         # These are reactions with unexpected mathmeatics. 
-        for smr in self.__surface_math_reactions:
+        for smr, (exp_rate_f, actual_rate_f) in zip(self.__surface_math_reactions, self.__surface_math_reactions_f):
         
             # Might have a local paramter, so have to get the global ones then
             # possibly override with any local ones
@@ -3907,8 +4018,8 @@ class Interface(object):
             # Parameter can depend on anything and is actual rate/expected rate
             # of course expected rate is without parameter
             
-            exp_rate = MLfunc(smr[2], variables)
-            actual_rate =MLfunc(smr[1], variables)
+            exp_rate = exp_rate_f(variables)
+            actual_rate = actual_rate_f(variables)
             
             # Occasional case where both are zero
             if exp_rate == 0.0: kconst = 0.0
@@ -3957,19 +4068,19 @@ class Interface(object):
         
         # NOTE: delay in event is assumed to be in model time units, as specified in SBML documentation
         for ev_trig in self.__evnts_trig:
-            if (MLfunc(self.__evnts_trig[ev_trig], variables)):
+            if (self.__evnts_trig_f[ev_trig](variables)):
                 if (self.__evnts_flip[ev_trig] == False):
                     self.__evnts_flip[ev_trig] = True
                     # Store the time the event 'kicked-in', only if it's not already in the queue
                     if ev_trig not in self.__evnts_fire: 
                         self.__evnts_fire[ev_trig] = self.__time['time'][0]
-                        self.__evnts_dl[ev_trig][1] = MLfunc(self.__evnts_dl[ev_trig][0], variables)*self.__time_units
+                        self.__evnts_dl[ev_trig][1] = self.__evnts_dl_f[ev_trig](variables)*self.__time_units
                         # It might be necessary to evaluate the values at trigger time
                         if (self.__evnts_trigvals[ev_trig] == True):
                             self.__evnts_vals[ev_trig] = {}
-                            for ass in self.__evnts_ass[ev_trig]:
+                            for ass, ass_f in zip(self.__evnts_ass[ev_trig], self.__evnts_ass_f[ev_trig]):
                                 var = ass[0]
-                                self.__evnts_vals[ev_trig][var] = MLfunc(ass[1], variables)
+                                self.__evnts_vals[ev_trig][var] = ass_f(variables)
             else: self.__evnts_flip[ev_trig] = False
         
         # Now execute event if delay has been passed: delay may be zero
@@ -3987,12 +4098,12 @@ class Interface(object):
             delay_time = self.__evnts_dl[ev][1]
             if (stime >= fire_time + delay_time):
                 trigvals = self.__evnts_trigvals[ev]
-                for ass in self.__evnts_ass[ev]:
+                for ass, ass_f in zip(self.__evnts_ass[ev], self.__evnts_ass_f[ev]):
                     # Assignment variable could be a reaction constant or a species conc
                     var = ass[0]
                     if (trigvals): 
                         value = self.__evnts_vals[ev][var]
-                    else: value = MLfunc(ass[1], variables)
+                    else: value = ass_f(variables)
                     if (var in self.__species):
                         # Convert to STEPS units
                         value*=self.__species[var][1]
@@ -110,6 +110,69 @@ class _OptimizedResultPath:
     # TODO Not urgent: If depends on a single other, just return call._evaluate(solvStateId)
 
 
+class _VectorizedResultList:
+    """
+    Wrapper class around a _ResultList or _ResultCombiner whose children all output numpy arrays.
+    Children values are written to a preallocated array and combiners apply their vectorized
+    function to it, writing to a second preallocated array.
+    """
+
+    def __init__(self, rs):
+        self._children = []
+        start = 0
+        for c in rs.children:
+            end = start + c._getEvalLen()
+            self._children.append((c, slice(start, end)))
+            start = end
+
+        if len(self._children) == 1:
+            self._fill = self._fillSingle
+        else:
+            self._array = numpy.zeros(start, dtype=numpy.float64)
+
+        if isinstance(rs, nsaving._ResultCombiner):
+            self._arrFunc = rs._arrFunc
+            self._out = numpy.zeros(rs._getEvalLen(), dtype=numpy.float64)
+            self._evaluate = self._evaluateCombiner
+        else:
+            self._evaluate = self._fill
+
+    def _fillSingle(self, solvStateId=None):
+        return self._children[0][0]._evaluate(solvStateId)
+
+    def _fill(self, solvStateId=None):
+        for c, slc in self._children:
+            self._array[slc] = c._evaluate(solvStateId)
+        return self._array
+
+    def _evaluateCombiner(self, solvStateId=None):
+        self._arrFunc(self._fill(solvStateId), self._out)
+        return self._out
+
+
+def _VectorizeSelector(rs, arrayPaths):
+    """
+    Replace the evaluation of _ResultList and _ResultCombiner objects by vectorized versions
+    when all their children output numpy arrays. arrayPaths is the set of result paths that
+    output numpy arrays. Return whether rs outputs a numpy array.
+    """
+    if isinstance(rs, nsaving._ResultPath):
+        return rs in arrayPaths
+    elif isinstance(rs, nsaving._ResultList):
+        vectChildren = [_VectorizeSelector(c, arrayPaths) for c in rs.children]
+        if (
+            all(vectChildren)
+            and rs._distrInds is None
+            and (not isinstance(rs, nsaving._ResultCombiner) or rs._arrFunc is not None)
+        ):
+            rs._evaluate = _VectorizedResultList(rs)._evaluate
+            return True
+        else:
+            # Remove previous monkey patching
+            rs._evaluate = types.MethodType(rs.__class__._evaluate, rs)
+    return False
+
+
 ##########
 
 
@@ -425,11 +488,18 @@ def OptimizeSelectors(sim, selectors):
     allValues.setUpCallNodes()
 
     # Monkey patch result selectors
+    arrayPaths = set()
     for rs, indLst in rs2Ind.items():
         if any(allValues[i].hasBatchCall() for i in indLst):
             orp = _OptimizedResultPath(rs, [allValues[i] for i in indLst])
             rs._evaluate = orp._evaluate
+            arrayPaths.add(rs)
         else:
             # Remove previous monkey patching if the current one doesn't require patching
             rs._evaluate = types.MethodType(rs.__class__._evaluate, rs)
+
+    # Compile result lists and combiners into numpy operations when possible
+    for sel in selectors:
+        _VectorizeSelector(sel, arrayPaths)
+
     return selectors
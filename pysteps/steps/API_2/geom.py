@@ -56,6 +56,7 @@ __all__ = [
     'SDiffBoundary',
     'MeshPartition',
     'LinearMeshPartition',
+    'GraphPartition',
     'MetisPartition',
     'GmshPartition',
     'MorphPartition',
@@ -1266,6 +1267,10 @@ class _BaseTetMesh(Geometry):
         """Return a list of the steps objects that this named object holds."""
         return [self.stepsMesh]
 
+    def _getTetAdjacency(self):
+        """Return the whole-mesh tet->tet and tet->tri neighbor arrays, or None if not available"""
+        return None
+
     @property
     def tets(self):
         """All tetrahedrons in the mesh
@@ -1411,10 +1416,31 @@ class TetMesh(_BaseTetMesh):
         self._vertProxy = None
         self._triProxy = None
         self._tetProxy = None
+        self._tetAdjacency = None
         if _createObj:
             raise Exception('Cannot create a bare TetMesh, use one of the class methods.')
         super().__init__(*args, _createObj=False, **kwargs)
 
+    def _getTetAdjacency(self):
+        """Return the (nbTets, 4) arrays of tetrahedron and triangle neighbors of all tetrahedrons
+
+        Missing tetrahedron neighbors are set to UNKNOWN_TET. The arrays are only fetched once.
+        """
+        if self._tetAdjacency is None:
+            nbTets = self.stepsMesh.countTets()
+            tetTets = numpy.empty(nbTets * 4, dtype=INDEX_DTYPE)
+            tetTris = numpy.empty(nbTets * 4, dtype=INDEX_DTYPE)
+            if nbTets > 0:
+                inds = numpy.arange(nbTets, dtype=INDEX_DTYPE)
+                self.stepsMesh.getBatchTetTetNeighbsNP(inds, tetTets)
+                self.stepsMesh.getBatchTetTriNeighbsNP(inds, tetTris)
+            tetTets = tetTets.reshape((nbTets, 4))
+            tetTris = tetTris.reshape((nbTets, 4))
+            tetTets.flags.writeable = False
+            tetTris.flags.writeable = False
+            self._tetAdjacency = (tetTets, tetTris)
+        return self._tetAdjacency
+
     @classmethod
     def _FromStepsObject(cls, obj, comps=None, patches=None, name=None):
         """Create the interface object from a STEPS object."""
@@ -1469,7 +1495,7 @@ class TetMesh(_BaseTetMesh):
         return mesh
 
     @classmethod
-    def Load(cls, path, scale=1, strict=False, name=None):
+    def Load(cls, path, scale=1, strict=False, name=None, cache=None):
         """Load a mesh in STEPS
 
         The mesh is loaded from an XML file that was previously generated by the
@@ -1484,13 +1510,32 @@ class TetMesh(_BaseTetMesh):
         :type strict: bool
         :param name: Optional name for the mesh
         :type name: str
+        :param cache: Whether to use a binary cache of the mesh, stored next to the source
+            file(s). The default (None) loads the mesh from an up-to-date cache if it exists, True
+            also creates the cache when it does not exist and False always parses the source file(s).
+        :type cache: bool or None
 
         :returns: The loaded TetMesh
         :rtype: :py:class:`TetMesh`
         """
-        smesh, scomps, spatches = smeshio.loadMesh(path, scale, strict)
+        smesh, scomps, spatches, _ = smeshio.loadCachedMesh(
+            [path + '.xml'], ('xml', scale), lambda: smeshio.loadMesh(path, scale, strict) + (None,), cache
+        )
         return TetMesh._FromStepsObject(smesh, comps=scomps, patches=spatches, name=name)
 
+    @classmethod
+    def _LoadImported(cls, sources, params, importFunc, cache, name):
+        """Create a mesh from an smeshio import function, going through the binary mesh cache."""
+
+        def _import():
+            stepsMesh, ndprx, tetprx, triprx = importFunc()
+            return stepsMesh, None, None, (ndprx, tetprx, triprx)
+
+        stepsMesh, _, _, proxies = smeshio.loadCachedMesh(sources, params, _import, cache)
+        mesh = TetMesh._FromStepsObject(stepsMesh, name=name)
+        mesh._loadElementProxys(*proxies)
+        return mesh
+
     def _loadElementProxys(self, ndprx, tetprx, triprx):
         """Load the blocks and groups from ElementProxy objects."""
         self._vertProxy, self._triProxy, self._tetProxy = ndprx, triprx, tetprx
@@ -1511,7 +1556,7 @@ class TetMesh(_BaseTetMesh):
     # The shadow_mesh keyword parameter is left here for compatibility but is not documented since the
     # STEPS-CUBIT toolkit is deprecated.
     @classmethod
-    def LoadAbaqus(cls, filename, scale=1, ebs=None, shadow_mesh=None, name=None):
+    def LoadAbaqus(cls, filename, scale=1, ebs=None, shadow_mesh=None, name=None, cache=None):
         """Load a mesh from an ABAQUS-formated mesh file
 
         If blocks or groups of elements are present in the file, they will also be loaded.
@@ -1526,28 +1571,39 @@ class TetMesh(_BaseTetMesh):
         :type ebs: `List[str]`
         :param name: Optional name for the mesh
         :type name: str
+        :param cache: Whether to use a binary cache of the mesh, stored next to the source
+            file(s). The default (None) loads the mesh from an up-to-date cache if it exists, True
+            also creates the cache when it does not exist and False always parses the source file(s).
+        :type cache: bool or None
 
         :returns: The loaded TetMesh
         :rtype: :py:class:`TetMesh`
         """
+        if shadow_mesh is not None:
+            # The shadow mesh is filled during the import, it cannot come from the cache
+            cache = False
         if isinstance(filename, tuple) and len(filename) == 2:
             tetfile, trifile = filename
-            stepsMesh, ndprx, tetprx, triprx = smeshio.importAbaqus2(
-                tetfile, trifile, scale, shadow_mesh=shadow_mesh
+            return TetMesh._LoadImported(
+                [tetfile, trifile],
+                ('abaqus2', scale),
+                lambda: smeshio.importAbaqus2(tetfile, trifile, scale, shadow_mesh=shadow_mesh),
+                cache,
+                name,
             )
         elif isinstance(filename, str):
-            stepsMesh, ndprx, tetprx, triprx = smeshio.importAbaqus(
-                filename, scale, ebs=ebs, shadow_mesh=shadow_mesh
+            return TetMesh._LoadImported(
+                [filename],
+                ('abaqus', scale, ebs),
+                lambda: smeshio.importAbaqus(filename, scale, ebs=ebs, shadow_mesh=shadow_mesh),
+                cache,
+                name,
             )
         else:
             raise TypeError(f'Expected a string or a 2-tuple of strings, got {filename} instead.')
 
-        mesh = TetMesh._FromStepsObject(stepsMesh, name=name)
-        mesh._loadElementProxys(ndprx, tetprx, triprx)
-        return mesh
-
     @classmethod
-    def LoadGmsh(cls, filename, scale=1, name=None):
+    def LoadGmsh(cls, filename, scale=1, name=None, cache=None):
         """Load a mesh from a Gmsh (2.2 ASCII)-formated mesh file
 
         If blocks or groups of elements are present in the file, they will also be loaded.
@@ -1558,17 +1614,20 @@ class TetMesh(_BaseTetMesh):
         :type scale: float
         :param name: Optional name for the mesh
         :type name: str
+        :param cache: Whether to use a binary cache of the mesh, stored next to the source
+            file(s). The default (None) loads the mesh from an up-to-date cache if it exists, True
+            also creates the cache when it does not exist and False always parses the source file(s).
+        :type cache: bool or None
 
         :returns: The loaded TetMesh
         :rtype: :py:class:`TetMesh`
         """
-        stepsMesh, ndprx, tetprx, triprx = smeshio.importGmsh(filename, scale)
-        mesh = TetMesh._FromStepsObject(stepsMesh, name=name)
-        mesh._loadElementProxys(ndprx, tetprx, triprx)
-        return mesh
+        return TetMesh._LoadImported(
+            [filename], ('gmsh', scale), lambda: smeshio.importGmsh(filename, scale), cache, name
+        )
 
     @classmethod
-    def LoadVTK(cls, filename, scale=1, name=None):
+    def LoadVTK(cls, filename, scale=1, name=None, cache=None):
         """Load a mesh from a VTK (legacy ASCII)-formated mesh file
 
         If blocks or groups of elements are present in the file, they will also be loaded.
@@ -1579,17 +1638,20 @@ class TetMesh(_BaseTetMesh):
         :type scale: float
         :param name: Optional name for the mesh
         :type name: str
+        :param cache: Whether to use a binary cache of the mesh, stored next to the source
+            file(s). The default (None) loads the mesh from an up-to-date cache if it exists, True
+            also creates the cache when it does not exist and False always parses the source file(s).
+        :type cache: bool or None
 
         :returns: The loaded TetMesh
         :rtype: :py:class:`TetMesh`
         """
-        stepsMesh, ndprx, tetprx, triprx = smeshio.importVTK(filename, scale)
-        mesh = TetMesh._FromStepsObject(stepsMesh, name=name)
-        mesh._loadElementProxys(ndprx, tetprx, triprx)
-        return mesh
+        return TetMesh._LoadImported(
+            [filename], ('vtk', scale), lambda: smeshio.importVTK(filename, scale), cache, name
+        )
 
     @classmethod
-    def LoadTetGen(cls, pathroot, scale, name=None):
+    def LoadTetGen(cls, pathroot, scale, name=None, cache=None):
         """Load a mesh from a TetGen-formated set of files
 
         If blocks or groups of elements are present, they will also be loaded.
@@ -1601,6 +1663,10 @@ class TetMesh(_BaseTetMesh):
         :type scale: float
         :param name: Optional name for the mesh
         :type name: str
+        :param cache: Whether to use a binary cache of the mesh, stored next to the source
+            file(s). The default (None) loads the mesh from an up-to-date cache if it exists, True
+            also creates the cache when it does not exist and False always parses the source file(s).
+        :type cache: bool or None
 
         :returns: The loaded TetMesh
         :rtype: :py:class:`TetMesh`
@@ -1628,10 +1694,13 @@ class TetMesh(_BaseTetMesh):
 
         tetgen.berlios.de/files/tetgen-manual.pdf
         """
-        stepsMesh, ndprx, tetprx, triprx = smeshio.importTetGen(pathroot, scale)
-        mesh = TetMesh._FromStepsObject(stepsMesh, name=name)
-        mesh._loadElementProxys(ndprx, tetprx, triprx)
-        return mesh
+        return TetMesh._LoadImported(
+            [pathroot + '.node', pathroot + '.ele', pathroot + '.face'],
+            ('tetgen', scale),
+            lambda: smeshio.importTetGen(pathroot, scale),
+            cache,
+            name,
+        )
 
     def Save(self, path):
         """Save the mesh to an XML file
@@ -2642,7 +2711,8 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
     """Base convenience class for geometrical element lists
 
     :param lst: The list of elements
-    :type lst: Iterable[int] or range or Iterable[:py:class:`Reference`] or :py:class:`RefList`
+    :type lst: Iterable[int] or range or numpy.ndarray or Iterable[:py:class:`Reference`] or
+        :py:class:`RefList`
     :param mesh: Mesh object that contains the elements
     :type mesh: Union[:py:class:`TetMesh`, :py:class:`DistMesh`, None]
 
@@ -2650,6 +2720,10 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
     (see :py:class:`TetMesh`).
 
     Behaves like a python list but with additional functionalities.
+
+    If `lst` is a 1D numpy array, the indices are stored as an array of ``INDEX_DTYPE``. Set
+    operations between lists always produce array-backed lists and :py:class:`Reference` objects
+    are only created when elements are accessed.
     """
 
     class _OptimizationCM:
@@ -2754,6 +2828,10 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
             actualLst = copy.copy(lst.lst)
         elif isinstance(lst, range):
             actualLst = lst
+        elif isinstance(lst, numpy.ndarray):
+            if lst.ndim != 1 or not (lst.size == 0 or numpy.issubdtype(lst.dtype, numpy.integer)):
+                raise TypeError(f'Cannot initialize a list of {cls._refCls} from a {lst.dtype} array of shape {lst.shape}.')
+            actualLst = numpy.array(lst, dtype=INDEX_DTYPE)
         elif hasattr(lst, '__iter__'):
             lst = list(lst)
             actualLst = cls._getIdxLst(lst)
@@ -2837,8 +2915,14 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
 
         :meta public:
         """
+        if isinstance(self.lst, numpy.ndarray):
+            # Only accept the same keys as python lists
+            if isinstance(key, numbers.Integral):
+                return self.__class__._refCls(int(self.lst[key]), **self._cloneArgs)
+            elif not isinstance(key, slice):
+                raise TypeError(f'List indices must be integers or slices, not {type(key)}.')
         idxres = self.lst[key]
-        if isinstance(idxres, (list, range)):
+        if isinstance(idxres, (list, range, numpy.ndarray)):
             return self.__class__(idxres, **self._cloneArgs)
         else:
             return self.__class__._refCls(idxres, **self._cloneArgs)
@@ -2864,7 +2948,8 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
 
         :meta public:
         """
-        for idx in self.lst:
+        lst = map(int, self.lst) if isinstance(self.lst, numpy.ndarray) else self.lst
+        for idx in lst:
             yield self.__class__._refCls(idx, **self._cloneArgs, anonymous=True)
 
     def append(self, e):
@@ -2897,7 +2982,8 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         with self._modify():
             self.lst.remove(e._idx)
 
-    _ElemsAsSet_K = 'ElemsAsSet'
+    _ElemsAsArray_K = 'ElemsAsArray'
+    _ElemsAsBitmap_K = 'ElemsAsBitmap'
 
     def __contains__(self, elem):
         """Check whether the list contains an element
@@ -2919,13 +3005,16 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         :meta public:
         """
         if isinstance(elem, self.__class__._refCls):
-            # Optimization
-            if RefList._ElemsAsSet_K not in self._optimCM:
-                self._optimCM[RefList._ElemsAsSet_K] = set(self.lst)
-            return elem._idx in self._optimCM[RefList._ElemsAsSet_K]
+            return self._containsIdx(elem._idx)
         else:
             return False
 
+    def _containsIdx(self, idx):
+        if isinstance(self.lst, range):
+            return idx in self.lst
+        bitmap = self._getBitmap()
+        return 0 <= idx < len(bitmap) and bool(bitmap[idx])
+
     def __len__(self):
         """Get the length of the list
 
@@ -2956,6 +3045,10 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
                 raise Exception(
                     f'Cannot retrieve the index of an element that is associated to a different mesh.'
                 )
+            if isinstance(self.lst, numpy.ndarray):
+                if self._containsIdx(elem._idx):
+                    return int(numpy.argmax(self.lst == elem._idx))
+                raise ValueError(f'{elem} is not in list')
             return self.lst.index(elem._idx)
         else:
             raise TypeError(f'Expected a {self.__class__._refCls}, got {elem} instead.')
@@ -2967,8 +3060,48 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
             raise Exception('Cannot combine lists associated to different meshes.')
 
     def _getLst(self):
+        if isinstance(self.lst, numpy.ndarray):
+            return self.lst.tolist()
         return list(self.lst) if isinstance(self.lst, range) else self.lst
 
+    def _getIdxArray(self):
+        """Return the element indices as a read-only INDEX_DTYPE array"""
+        if isinstance(self.lst, numpy.ndarray):
+            return self.lst
+        if RefList._ElemsAsArray_K not in self._optimCM:
+            if isinstance(self.lst, range):
+                arr = numpy.arange(self.lst.start, self.lst.stop, self.lst.step, dtype=INDEX_DTYPE)
+            else:
+                arr = numpy.array(self.lst, dtype=INDEX_DTYPE)
+            arr.flags.writeable = False
+            self._optimCM[RefList._ElemsAsArray_K] = arr
+        return self._optimCM[RefList._ElemsAsArray_K]
+
+    def _getBitmap(self):
+        """Return a boolean array b such that b[idx] is True iff idx is in the list"""
+        if RefList._ElemsAsBitmap_K not in self._optimCM:
+            arr = self._getIdxArray()
+            bitmap = numpy.zeros(int(arr.max()) + 1 if len(arr) > 0 else 0, dtype=bool)
+            bitmap[arr] = True
+            self._optimCM[RefList._ElemsAsBitmap_K] = bitmap
+        return self._optimCM[RefList._ElemsAsBitmap_K]
+
+    def _isInMask(self, other):
+        """Return a boolean mask of the elements of this list that are also in other"""
+        arr = self._getIdxArray()
+        if isinstance(other.lst, range):
+            # Avoid allocating a bitmap for ranges
+            r = other.lst
+            if len(r) == 0:
+                return numpy.zeros(len(arr), dtype=bool)
+            arr = arr.astype(numpy.int64)
+            lo, hi = (r.start, r.stop) if r.step > 0 else (r[-1], r.start + 1)
+            return (arr >= lo) & (arr < hi) & ((arr - r.start) % r.step == 0)
+        bitmap = other._getBitmap()
+        mask = arr < len(bitmap)
+        mask[mask] = bitmap[arr[mask]]
+        return mask
+
     def __and__(self, other):
         """Compute the intersection between two lists
 
@@ -2986,8 +3119,7 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         :meta public:
         """
         self._checkSameType(other)
-        s2 = set(other.lst)
-        res = [i for i in self.lst if i in s2]
+        res = self._getIdxArray()[self._isInMask(other)]
         return self.__class__(res, **self._cloneArgs)
 
     def __or__(self, other):
@@ -3008,8 +3140,7 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         :meta public:
         """
         self._checkSameType(other)
-        s1 = set(self.lst)
-        res = self._getLst() + [j for j in other.lst if j not in s1]
+        res = numpy.concatenate((self._getIdxArray(), other._getIdxArray()[~other._isInMask(self)]))
         return self.__class__(res, **self._cloneArgs)
 
     def __sub__(self, other):
@@ -3032,8 +3163,7 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         :meta public:
         """
         self._checkSameType(other)
-        s2 = set(other.lst)
-        res = [i for i in self.lst if i not in s2]
+        res = self._getIdxArray()[~self._isInMask(other)]
         return self.__class__(res, **self._cloneArgs)
 
     def __xor__(self, other):
@@ -3057,8 +3187,9 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         :meta public:
         """
         self._checkSameType(other)
-        s1, s2 = set(self.lst), set(other.lst)
-        res = [i for i in self.lst if i not in s2] + [j for j in other.lst if j not in s1]
+        res = numpy.concatenate((
+            self._getIdxArray()[~self._isInMask(other)], other._getIdxArray()[~other._isInMask(self)]
+        ))
         return self.__class__(res, **self._cloneArgs)
 
     def __add__(self, other):
@@ -3081,7 +3212,11 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         :meta public:
         """
         self._checkSameType(other)
-        return self.__class__(self._getLst() + other._getLst(), **self._cloneArgs)
+        if isinstance(self.lst, numpy.ndarray) or isinstance(other.lst, numpy.ndarray):
+            res = numpy.concatenate((self._getIdxArray(), other._getIdxArray()))
+        else:
+            res = self._getLst() + other._getLst()
+        return self.__class__(res, **self._cloneArgs)
 
     def __eq__(self, other):
         """Test for the equality of two lists
@@ -3102,7 +3237,7 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
         """
         try:
             self._checkSameType(other)
-            return len(self) == len(other) and tuple(self.lst) == tuple(other.lst)
+            return len(self) == len(other) and numpy.array_equal(self._getIdxArray(), other._getIdxArray())
         except Exception:
             return False
 
@@ -3112,10 +3247,12 @@ class RefList(nutils.UsingObjects(nutils.Optional(_BaseTetMesh)), nutils.SolverP
 
         :type: List[int], read-only
         """
+        if isinstance(self.lst, numpy.ndarray):
+            return self.lst.tolist()
         return copy.copy(self.lst)
 
     def __hash__(self):
-        return hash((len(self), tuple(self.lst)))
+        return hash((len(self), tuple(self._getLst())))
 
     def __repr__(self):
         if self._autoNamed:
@@ -3287,8 +3424,9 @@ class TetList(RefList):
     def __getitem__(self, key):
         """Access one or several tetrahedron(s) from the list
 
-        :param key: Index of the tetrahedron, or slice, or 3D point
-        :type key: int or slice or Tuple[float, float, float] or :py:class:`Point`
+        :param key: Index of the tetrahedron, or slice, or 3D point, or array of 3D points
+        :type key: int or slice or Tuple[float, float, float] or :py:class:`Point` or
+            numpy.ndarray of shape (N, 3)
         :returns: The tetrahedron(s)
         :rtype: :py:class:`TetReference` or :py:class:`TetList`
 
@@ -3304,20 +3442,33 @@ class TetList(RefList):
             Tet(11)
             >>> mesh.tets[0, 0, 0] # Returns the tetrahedron which contains the point x=0, y=0, z=0
             Tet(123)
+            >>> mesh.tets[numpy.array([[0, 0, 0], [1e-6, 0, 0]])] # Tetrahedrons containing each point
+            TetList([123, 97])
 
         .. note::
             The index of an element in the list is in general different from its index in the mesh.
             :py:class:`TetList` is the only subclass of :py:class:`RefList` that can take a 3D point
-            as key of its __getitem__ special method.
+            as key of its __getitem__ special method. Arrays of points are located in a single
+            batch call, a :py:class:`KeyError` is raised if one of the points is not in the list.
 
         :meta public:
         """
+        if isinstance(key, numpy.ndarray) and key.ndim == 2 and key.shape[1] == 3:
+            idxs = self._findTetIdxsByPoints(key)
+            # Unknown tetrahedrons are larger than any index so they are never in the bitmap
+            bitmap = self._getBitmap()
+            found = idxs < len(bitmap)
+            found[found] = bitmap[idxs[found]]
+            if not found.all():
+                pos = key[numpy.argmin(found)]
+                raise KeyError(f'No Tetrahedron exists at position {pos} in this list.')
+            return self.__class__(idxs, **self._cloneArgs)
         try:
             return super().__getitem__(key)
         except TypeError:
             if hasattr(key, '__iter__') and len(key) == 3:
                 idx = self._findTetIdxByPoint(list(key))
-                if idx != UNKNOWN_TET and idx in self.lst:
+                if idx != UNKNOWN_TET and self._containsIdx(idx):
                     return TetReference(idx, **self._cloneArgs)
                 else:
                     raise KeyError(f'No Tetrahedron exists at position {key} in this list.')
@@ -3372,7 +3523,74 @@ class TetList(RefList):
         :param d: Topological distance to grow, defaults to 1
         :type d: int
         """
+        adj = self.mesh._getTetAdjacency()
+        if adj is None:
+            return self._dilateFromRefs(d)
+        tetTets, _ = adj
+
+        member = self._getTetMask(len(tetTets))
+        if TetList._CurrShell_K not in self._optimCM:
+            self._optimCM[TetList._CurrShell_K] = TetList._getBorderTets(tetTets, member)[0]
+        shell = TetList._dilateMask(tetTets, member, self._optimCM[TetList._CurrShell_K], d)
+
+        with self._modify():
+            self._optimCM[TetList._CurrShell_K] = shell
+            self.lst = numpy.flatnonzero(member).astype(INDEX_DTYPE)
+
+    def erode(self, d=1):
+        """Erodes the list, removing surface tetrahedrons
+
+        One cycle of erosion corresponds to removing all tetrahedrons that are on the surface of
+        the list (i.e. at least one of their four neighbors is not in the list). This operation is
+        repeated ``d`` times.
+
+        :param d: Topological distance to erode, defaults to 1
+        :type d: int
+        """
+        adj = self.mesh._getTetAdjacency()
+        if adj is None:
+            return self._erodeFromRefs(d)
+        tetTets, _ = adj
+
+        shell, onBorder = TetList._getBorderTets(tetTets, self._getTetMask(len(tetTets)))
+        shellMask = numpy.zeros(len(tetTets), dtype=bool)
+        shellMask[shell] = True
+        shellMask[onBorder] = True
+        TetList._dilateMask(tetTets, shellMask, numpy.flatnonzero(shellMask), d - 1)
+        arr = self._getIdxArray()
+        with self._modify():
+            self.lst = arr[~shellMask[arr]]
+
+    def _getTetMask(self, nbTets):
+        """Return a boolean array of size nbTets that is True for tetrahedrons in the list"""
+        member = numpy.zeros(nbTets, dtype=bool)
+        member[self._getIdxArray()] = True
+        return member
 
+    @staticmethod
+    def _getBorderTets(tetTets, member):
+        """Return the tetrahedrons from member that have a neighbor outside of member and the ones
+        that have less than 4 neighbors"""
+        inds = numpy.flatnonzero(member)
+        neighbs = tetTets[inds]
+        valid = neighbs != UNKNOWN_TET
+        outside = valid.copy()
+        outside[valid] = ~member[neighbs[valid]]
+        return inds[outside.any(axis=1)], inds[~valid.all(axis=1)]
+
+    @staticmethod
+    def _dilateMask(tetTets, member, shell, d):
+        """Grow the member mask d times from the shell tetrahedrons, return the last shell"""
+        for i in range(d):
+            if len(shell) == 0:
+                break
+            neighbs = tetTets[shell].ravel()
+            neighbs = neighbs[neighbs != UNKNOWN_TET]
+            shell = numpy.unique(neighbs[~member[neighbs]])
+            member[shell] = True
+        return shell
+
+    def _dilateFromRefs(self, d):
         prevShell = set(self.indices)
 
         if TetList._CurrShell_K not in self._optimCM:
@@ -3395,18 +3613,9 @@ class TetList(RefList):
 
         with self._modify():
             self._optimCM[TetList._CurrShell_K] = shell
-            self.lst = sorted(set(self.lst))
-
-    def erode(self, d=1):
-        """Erodes the list, removing surface tetrahedrons
-
-        One cycle of erosion corresponds to removing all tetrahedrons that are on the surface of
-        the list (i.e. at least one of their four neighbors is not in the list). This operation is
-        repeated ``d`` times.
+            self.lst = sorted(set(self._getLst()))
 
-        :param d: Topological distance to erode, defaults to 1
-        :type d: int
-        """
+    def _erodeFromRefs(self, d):
         shell = TetList(
             [
                 tet
@@ -3431,23 +3640,36 @@ class TetList(RefList):
         :type: :py:class:`TriList`, read-only
         """
         if TetList._CurrSurface_K not in self._optimCM:
-            if TetList._LastSurface_K in self._optimCM:
-                # Only compute the changes due to the addition or removal of tetrahedrons
-                oldLst, oldSurf = self._optimCM[TetList._LastSurface_K]
-                surf = set(oldSurf)
-                for tet in TetList(oldLst, **self._cloneArgs) ^ self:
-                    surf ^= set(tet.faces)
+            adj = self.mesh._getTetAdjacency()
+            if adj is not None:
+                # Triangles that appear an odd number of times in the faces of unique tetrahedrons
+                _, tetTris = adj
+                tris, counts = numpy.unique(
+                    tetTris[numpy.unique(self._getIdxArray())].ravel(), return_counts=True
+                )
+                surf = tris[counts % 2 == 1]
+                self._optimCM[TetList._CurrSurface_K] = TriList(surf, **self._cloneArgs)
             else:
-                # Compute the surface from scratch
-                surf = set()
-                for tet in sorted(set(self), key=lambda x:x._idx):
-                    surf ^= set(tet.faces)
-            # Keep the surface until next list change
-            self._optimCM[TetList._CurrSurface_K] = TriList(sorted(surf, key=lambda x: x._idx), **self._cloneArgs)
-            # Keep a version of the current list and surface, for diff computation later
-            self._optimCM[TetList._LastSurface_K] = (copy.copy(self.lst), self._optimCM[TetList._CurrSurface_K])
+                self._optimCM[TetList._CurrSurface_K] = self._surfaceFromRefs()
         return self._optimCM[TetList._CurrSurface_K]
 
+    def _surfaceFromRefs(self):
+        if TetList._LastSurface_K in self._optimCM:
+            # Only compute the changes due to the addition or removal of tetrahedrons
+            oldLst, oldSurf = self._optimCM[TetList._LastSurface_K]
+            surf = set(oldSurf)
+            for tet in TetList(oldLst, **self._cloneArgs) ^ self:
+                surf ^= set(tet.faces)
+        else:
+            # Compute the surface from scratch
+            surf = set()
+            for tet in sorted(set(self), key=lambda x:x._idx):
+                surf ^= set(tet.faces)
+        res = TriList(sorted(surf, key=lambda x: x._idx), **self._cloneArgs)
+        # Keep a version of the current list and surface, for diff computation later
+        self._optimCM[TetList._LastSurface_K] = (copy.copy(self.lst), res)
+        return res
+
     @property
     def Vol(self):
         """The summed volume of all tetrahedrons in the list
@@ -3505,7 +3727,14 @@ class TetList(RefList):
             raise Exception(ex)
 
     def _findTetIdxByPoint(self, pos):
-        return self.mesh.stepsMesh.findTetByPoint(pos)
+        return int(self._findTetIdxsByPoints(numpy.array([pos]))[0])
+
+    def _findTetIdxsByPoints(self, points):
+        """Return an INDEX_DTYPE array with the tetrahedron containing each point (N x 3 array)"""
+        points = numpy.ascontiguousarray(points, dtype=float).reshape(-1)
+        idxs = numpy.empty(len(points) // 3, dtype=INDEX_DTYPE)
+        self.mesh.stepsMesh.findTetsByPointsNP(points, idxs)
+        return idxs
 
 
 class _DistTetList(TetList, _DistRefList):
@@ -3539,6 +3768,9 @@ class _DistTetList(TetList, _DistRefList):
     def _findTetIdxByPoint(self, pos):
         return self.mesh.stepsMesh.findTetByPoint(pos, local=self._local)
 
+    def _findTetIdxsByPoints(self, points):
+        return numpy.array([self._findTetIdxByPoint(list(pos)) for pos in points], dtype=INDEX_DTYPE)
+
 
 TetList._distCls = _DistTetList
 
@@ -4119,9 +4351,17 @@ class MeshPartition(nutils.Params):
         """Validate the partitioning of the mesh"""
         sgdecomp.validatePartition(self._mesh.stepsMesh, self._tet_hosts, self._tri_hosts)
 
-    def printStats(self):
+    def printStats(self, tet_weights=None):
         """Print out partitioning stastics
 
+        In addition to the number of elements in each partition, the communication volume (number
+        of faces shared by each pair of partitions) and the imbalance ratio (maximum load divided by
+        the average load) are reported.
+
+        :param tet_weights: Optional computational cost of each tetrahedron, used for computing the
+            imbalance ratio. Defaults to 1 for all tetrahedrons.
+        :type tet_weights: List[float]
+
         :returns: ``(tet_stats, tri_stats, wm_stats, num_hosts, min_degree, max_degree, mean_degree)``
             [tet/tri/wm]_stats contains the number of tetrahedrons/triangles/well-mixed volumes in
             each hosting process, num_hosts provide the number of hosting processes,
@@ -4129,16 +4369,25 @@ class MeshPartition(nutils.Params):
             partitioning.
         """
         return sgdecomp.printPartitionStat(
-            self._tet_hosts, self._tri_hosts, self._wm_hosts, self._mesh.stepsMesh
+            self._tet_hosts, self._tri_hosts, self._wm_hosts, self._mesh.stepsMesh, tet_weights
         )
 
+    @property
+    def commVolume(self):
+        """The number of faces shared by tetrahedrons of each pair of partitions
+
+        :type: Dict[Tuple[int, int], int], read-only
+        """
+        return sgdecomp.getPartitionCommStat(self._mesh.stepsMesh, self._tet_hosts)
+
 
 def _getTriPartitionFromTet(mesh, tet_hosts, default_tris=None):
     """Return the tri partition corresponding to the tet partition given as an argument."""
-    triInds = set(default_tris.indices) if default_tris is not None else set()
-    for patch in mesh._getChildrenOfType(Patch):
-        triInds |= set(patch.tris.indices)
-    return sgdecomp.partitionTris(mesh.stepsMesh, tet_hosts, sorted(triInds))
+    lsts = [default_tris] if default_tris is not None else []
+    lsts += [patch.tris for patch in mesh._getChildrenOfType(Patch)]
+    arrs = [lst._getIdxArray() for lst in lsts]
+    triInds = numpy.unique(numpy.concatenate(arrs)) if len(arrs) > 0 else numpy.array([], dtype=INDEX_DTYPE)
+    return sgdecomp.partitionTris(mesh.stepsMesh, tet_hosts, triInds)
 
 
 def LinearMeshPartition(mesh, xbin, ybin, zbin, default_tris=None):
@@ -4171,6 +4420,62 @@ def LinearMeshPartition(mesh, xbin, ybin, zbin, default_tris=None):
     return MeshPartition(mesh, tet_hosts=tet_hosts, tri_hosts=tri_hosts)
 
 
+def GraphPartition(mesh, nparts, weights=None, method='inertial', max_imbalance=1.05, refine_passes=8,
+                   default_tris=None):
+    """Partition the mesh with recursive bisection and refinement on the tetrahedron graph
+
+    The tetrahedrons are first recursively bisected into ``nparts`` sets of similar weight. The
+    partition is then refined on the tetrahedron adjacency graph with Fiduccia-Mattheyses passes,
+    moving boundary tetrahedrons so as to reduce the number of faces shared by different
+    partitions. A triangle partition that matches the tetrahedron one is then computed.
+
+    :param mesh: The mesh to be partitioned
+    :type mesh: :py:class:`TetMesh`
+    :param nparts: Number of partitions
+    :type nparts: int
+    :param weights: Computational cost of each tetrahedron. If ``None``, all tetrahedrons have
+        the same cost, if ``'volume'``, the cost is the tetrahedron volume. An array with one cost
+        per tetrahedron can also be given, e.g. the number of species in the tetrahedron.
+    :type weights: Union[None, str, List[float]]
+    :param method: Bisection method, ``'inertial'`` splits along the principal axis of inertia,
+        ``'coordinate'`` splits along the longest axis of the bounding box.
+    :type method: str
+    :param max_imbalance: Maximum ratio between the load of a partition and the average load
+        allowed during refinement
+    :type max_imbalance: float
+    :param refine_passes: Maximum number of refinement passes, 0 disables refinement
+    :type refine_passes: int
+    :param default_tris: Optional list of triangles that should be partitioned even if they are
+        not part of any patch
+    :type default_tris: :py:class:`TriList`
+
+    :returns: The partition object
+    :rtype: :py:class:`MeshPartition`
+
+    .. note::
+        The triangle partition only takes into account triangles that are part of a
+        :py:class:`Patch`.
+
+    .. note::
+        Each refinement pass moves at most as many tetrahedrons as there are tetrahedrons on the
+        boundaries between partitions, and these moves are done in python. The cost of refinement
+        thus grows with the area of the partition boundaries. For very large meshes, it can be
+        limited with ``refine_passes``.
+    """
+    if isinstance(weights, str):
+        if weights != 'volume':
+            raise ValueError(f'Unknown weights type: {weights}, expected \'volume\'.')
+        nbTets = len(mesh.tets)
+        weights = numpy.zeros(nbTets)
+        if nbTets > 0:
+            mesh.stepsMesh.getBatchTetVolsNP(numpy.arange(nbTets, dtype=INDEX_DTYPE), weights)
+    tet_hosts = sgdecomp.graphPartition(
+        mesh.stepsMesh, nparts, weights, method, max_imbalance, refine_passes
+    )
+    tri_hosts = _getTriPartitionFromTet(mesh, tet_hosts, default_tris)
+    return MeshPartition(mesh, tet_hosts=tet_hosts, tri_hosts=tri_hosts)
+
+
 def MetisPartition(mesh, path, default_tris=None):
     """Partition the mesh using a Metis .epart file
 
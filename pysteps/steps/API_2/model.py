@@ -25,9 +25,13 @@
 import collections
 import copy
 from enum import Enum
+import hashlib
 import inspect
 import itertools
+import json
 import numbers
+import os
+import tempfile
 import warnings
 
 from steps import stepslib
@@ -139,13 +143,109 @@ class Model(nutils.UsableObject, nutils.StepsWrapperObject):
     :py:func:`steps.API_2.utils.NamedObject.Create`)::
 
         mdl.vsys
+
+    :param expansionCache: Optional path to a file in which the expansion of complexes into
+        complex states and of complex reactions into individual reactions is cached. If the file
+        exists, the expansions it contains are reused instead of being recomputed. Newly computed
+        expansions are written back to the file when the ``with mdl:`` block is exited or when
+        :py:func:`saveExpansionCache` is called.
+    :type expansionCache: Union[str, None]
+
+    Expansions are stored as JSON under a hash of the declaration they were computed from (complex
+    name, subunit states, ordering function, subunit selectors, etc.), so a modified model never
+    reuses stale expansions. Custom ordering functions are described by their code, default
+    arguments, closure and referenced global values; the expansions of complexes whose ordering
+    function depends on other kinds of objects are not cached. This is useful for models with large
+    complexes that are declared by several processes (MPI ranks, ensemble workers, successive
+    runs)::
+
+        mdl = Model(expansionCache='model_expansions.json')
+        with mdl:
+            ...
     """
 
-    def __init__(self, *args, _createObj=True, **kwargs):
+    _EXPANSION_CACHE_VERSION = 2
+
+    def __init__(self, *args, expansionCache=None, _createObj=True, **kwargs):
         super().__init__(*args, **kwargs)
         self.stepsModel = self._createStepsObj() if _createObj else None
         self.volSysConstraints = []
 
+        self._expansionCachePath = expansionCache
+        self._expansionCache = None
+        self._expansionCacheModified = False
+        if expansionCache is not None:
+            self._expansionCache = self._loadExpansionCache(expansionCache)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
+        if exc_type is None:
+            self.saveExpansionCache()
+
+    def _loadExpansionCache(self, path):
+        """Load the expansion cache from a file, return an empty cache if it cannot be used."""
+        if not os.path.isfile(path):
+            return {}
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as ex:
+            warnings.warn(f'Could not load the model expansion cache from {path}: {ex}')
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get('version') != Model._EXPANSION_CACHE_VERSION
+            or not isinstance(data.get('entries'), dict)
+        ):
+            warnings.warn(f'The model expansion cache in {path} has an unsupported format, ignoring it.')
+            return {}
+        return data['entries']
+
+    def _getCachedExpansion(self, key, func):
+        """Return the expansion corresponding to key, compute it with func if it is not cached.
+
+        key should be a tuple of python builtin values that fully describe the expansion, None
+        elements mean that the expansion cannot be cached. func should return lists or tuples
+        of strings and numbers, that are stored as JSON.
+        """
+        if self._expansionCache is None or any(k is None for k in key):
+            return func()
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        if digest not in self._expansionCache:
+            self._expansionCache[digest] = func()
+            self._expansionCacheModified = True
+        return self._expansionCache[digest]
+
+    def saveExpansionCache(self, path=None):
+        """Write the expansion cache to a file
+
+        :param path: Path to the file, defaults to the path given with the ``expansionCache``
+            keyword argument during the creation of the model.
+        :type path: Union[str, None]
+
+        Does nothing if the model was created without expansion cache. The file is replaced
+        atomically, so several processes can safely share the same cache file.
+        """
+        if self._expansionCache is None:
+            return
+        if path is None:
+            if not self._expansionCacheModified:
+                return
+            path = self._expansionCachePath
+        dirPath = os.path.dirname(os.path.abspath(path))
+        fd, tmpPath = tempfile.mkstemp(dir=dirPath, prefix='.tmp_expansion_cache_')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                data = dict(version=Model._EXPANSION_CACHE_VERSION, entries=self._expansionCache)
+                json.dump(data, f)
+            os.replace(tmpPath, path)
+        except BaseException:
+            if os.path.isfile(tmpPath):
+                os.remove(tmpPath)
+            raise
+        if path == self._expansionCachePath:
+            self._expansionCacheModified = False
+
     def _SetUpMdlDeps(self, geom):
         """Set up structures that depend on objects declared in the model."""
         # Start with vesicles because they can update rafts
@@ -504,6 +604,75 @@ def RotationalSymmetryOrdering(state):
     return max(rots, key=lambda state: sum(s2n[s] * (num + 1) ** p for p, s in enumerate(state)))
 
 
+def _Necklaces(n, k):
+    """Iterate over all necklaces of length n on an alphabet of size k
+
+    Each necklace is yielded as its lexicographically smallest rotation, a tuple of integers in
+    [0, k), in lexicographic order. Uses the Fredricksen-Kessler-Maiorana algorithm, which
+    generates the Lyndon words whose length divides n.
+    """
+    w = [-1]
+    while len(w) > 0:
+        w[-1] += 1
+        m = len(w)
+        if n % m == 0:
+            yield tuple(w * (n // m))
+        while len(w) < n:
+            w.append(w[-m])
+        while len(w) > 0 and w[-1] == k - 1:
+            w.pop()
+
+
+class _UncacheableValue(Exception):
+    """Raised when a value cannot be described independently of the current process."""
+
+
+def _describeForCache(value, _seen=None):
+    """Return a description of value that can be used to identify it across processes
+
+    Functions are described by their bytecode (including nested functions), their default
+    arguments, the content of their closure and the global values they reference. Raise
+    _UncacheableValue if value, or a value it depends on, cannot be described reliably.
+    """
+    if _seen is None:
+        _seen = set()
+    if value is None or isinstance(value, (bool, numbers.Number, str, bytes, Enum)):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, tuple(_describeForCache(v, _seen) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value).__name__, tuple(sorted((_describeForCache(v, _seen) for v in value), key=repr)))
+    if isinstance(value, dict):
+        items = ((_describeForCache(k, _seen), _describeForCache(v, _seen)) for k, v in value.items())
+        return ('dict', tuple(sorted(items, key=repr)))
+    if isinstance(value, nutils.NamedObject):
+        return (type(value).__qualname__, value.name)
+    if inspect.ismodule(value):
+        return ('module', value.__name__)
+    if inspect.isclass(value) or inspect.isbuiltin(value):
+        return ('qualname', value.__module__, value.__qualname__)
+    if inspect.iscode(value):
+        consts = tuple(_describeForCache(c, _seen) for c in value.co_consts)
+        return ('code', value.co_code.hex(), value.co_names, consts)
+    if inspect.isfunction(value):
+        if id(value) in _seen:
+            # Recursive functions
+            return ('function', value.__module__, value.__qualname__)
+        _seen.add(id(value))
+        code = value.__code__
+        cells = tuple(_describeForCache(c.cell_contents, _seen) for c in (value.__closure__ or ()))
+        globs = tuple(
+            (name, _describeForCache(value.__globals__[name], _seen))
+            for name in code.co_names if name in value.__globals__
+        )
+        return (
+            'function', value.__module__, value.__qualname__, _describeForCache(code, _seen),
+            _describeForCache(value.__defaults__, _seen), _describeForCache(value.__kwdefaults__, _seen),
+            cells, globs,
+        )
+    raise _UncacheableValue(value)
+
+
 ####################################
 # Complexes
 
@@ -609,8 +778,10 @@ class Complex(nutils.UsingObjects(Model)):
             statesAsSpecies = True
 
         self._order = order
+        self._susByName = {sus.name: sus for su in self._subUnits for sus in su._states}
 
         (mdl,) = self._getUsedObjects()
+        self._mdl = mdl
         self._statesAsSpecies = statesAsSpecies
         self.stepsComplex = None
         self._compStates = {}
@@ -668,14 +839,109 @@ class Complex(nutils.UsingObjects(Model)):
         """
         return [state for state, obj in self._compStates.items()]
 
+    def _getExpansionSignature(self):
+        """Return a description of the complex that fully determines its expansion in states.
+
+        Return None if the ordering function cannot be described reliably, e.g. if it depends on
+        objects that are neither builtin values nor STEPS named objects.
+        """
+        try:
+            orderDescr = _describeForCache(self._order)
+        except _UncacheableValue:
+            return None
+        return (
+            self.name,
+            tuple(tuple(sorted(sus.name for sus in su._states)) for su in self._subUnits),
+            hashlib.sha256(repr(orderDescr).encode()).hexdigest(),
+        )
+
+    def _statesFromNames(self, names):
+        """Return the tuple of SubUnitStates corresponding to a tuple of names."""
+        return tuple(self._susByName[name] for name in names)
+
+    def _iterCanonicalStates(self, allowed):
+        """Iterate over the unique states in which the ith subunit is in one of allowed[i]
+
+        Yield (key, state) pairs in which state is the canonical tuple of SubUnitStates (as
+        stored in ComplexState._state) and key is a tuple of state indices. When all subunit
+        states are allowed, sorting by key gives the order in which states first appear in the
+        cartesian product of subunit states.
+
+        States are encoded as tuples of integers (the index of each subunit state in the sorted
+        states of its subunit) and, for the built-in orderings, canonical states are generated
+        directly instead of deduplicating the full cartesian product: multisets of states for each
+        group of identical subunits with NoOrdering and necklaces with RotationalSymmetryOrdering.
+        """
+        suStates = [sorted(su._states, key=lambda x: x.name) for su in self._subUnits]
+        allowedInds = [sorted(suStates[i].index(sus) for sus in states) for i, states in enumerate(allowed)]
+
+        def decode(inds):
+            return tuple(suStates[i][j] for i, j in enumerate(inds))
+
+        n = len(self._subUnits)
+        if self._order is StrongOrdering:
+            for inds in itertools.product(*allowedInds):
+                yield inds, decode(inds)
+        elif self._order is NoOrdering:
+            # Within a group of identical subunits, canonical states are sorted
+            groups = {}
+            for i, su in enumerate(self._subUnits):
+                groups.setdefault(su, []).append(i)
+            groups = list(groups.values())
+            groupCombs = []
+            for pos in groups:
+                alw = [allowedInds[i] for i in pos]
+                if all(a == alw[0] for a in alw):
+                    groupCombs.append(list(itertools.combinations_with_replacement(alw[0], len(pos))))
+                else:
+                    groupCombs.append(sorted(set(tuple(sorted(c)) for c in itertools.product(*alw))))
+            for combs in itertools.product(*groupCombs):
+                inds = [None] * n
+                for pos, comb in zip(groups, combs):
+                    for i, j in zip(pos, comb):
+                        inds[i] = j
+                yield tuple(inds), decode(inds)
+        elif (
+            self._order is RotationalSymmetryOrdering
+            and all(su is self._subUnits[0] for su in self._subUnits)
+            and all(a == allowedInds[0] for a in allowedInds)
+        ):
+            # The canonical rotation is the one whose reverse is lexicographically maximal,
+            # i.e. the reverse of a necklace on the alphabet of states in decreasing order
+            alw = allowedInds[0]
+            k = len(alw)
+            for neck in _Necklaces(n, k):
+                inds = tuple(alw[k - 1 - d] for d in reversed(neck))
+                key = min(inds[i:] + inds[:i] for i in range(n))
+                yield key, decode(inds)
+        else:
+            # Custom ordering functions can only be applied to the full cartesian product
+            seen = set()
+            for inds in itertools.product(*allowedInds):
+                state = ComplexState(self, decode(inds))._state
+                if state not in seen:
+                    seen.add(state)
+                    yield inds, state
+
+    def _expandUniqueStates(self):
+        """Return the subunit state names of all unique complex states."""
+        states = sorted(self._iterCanonicalStates([su._states for su in self._subUnits]), key=lambda x: x[0])
+        return [tuple(sus.name for sus in state) for _, state in states]
+
+    def _getUniqueStates(self, mdl):
+        """Return all unique complex states, using the model expansion cache if possible."""
+        key = ('Complex._getUniqueStates', self._getExpansionSignature())
+        return [
+            ComplexState(self, self._statesFromNames(names), _canonical=True)
+            for names in mdl._getCachedExpansion(key, self._expandUniqueStates)
+        ]
+
     def _createStepsStates(self, mdl):
         """Create steps species for each complex state."""
-        for comb in itertools.product(*[sorted(su._states, key=lambda x: x.name) for su in self._subUnits]):
-            cs = ComplexState(self, comb)
-            if cs not in self._compStates:
-                spec = stepslib._py_Spec(cs.name, mdl.stepsModel)
-                cs._setStepsObjects(spec)
-                self._compStates[cs] = spec
+        for cs in self._getUniqueStates(mdl):
+            spec = stepslib._py_Spec(cs.name, mdl.stepsModel)
+            cs._setStepsObjects(spec)
+            self._compStates[cs] = spec
         return None
 
     def __iter__(self):
@@ -952,12 +1218,10 @@ class Channel(Complex):
         """Create steps ChanState objects for each channel state."""
         chan = stepslib._py_Chan(self.name, mdl.stepsModel)
         # Compute the channel state from the subunit states
-        for comb in itertools.product(*[sorted(su._states, key=lambda x: x.name) for su in self._subUnits]):
-            cs = ComplexState(self, comb)
-            if cs not in self._compStates:
-                chanState = stepslib._py_ChanState(cs.name, mdl.stepsModel, chan)
-                cs._setStepsObjects(chanState)
-                self._compStates[cs] = chanState
+        for cs in self._getUniqueStates(mdl):
+            chanState = stepslib._py_ChanState(cs.name, mdl.stepsModel, chan)
+            cs._setStepsObjects(chanState)
+            self._compStates[cs] = chanState
         return chan
 
 
@@ -2121,7 +2385,15 @@ class ComplexState(ReactionElement):
     _SIMPATH_ONLY_CHILDREN = True
 
     def __init__(
-        self, comp, state, *args, _stepsObj=None, _parentCompSel=None, _parentSelName=None, **kwargs
+        self,
+        comp,
+        state,
+        *args,
+        _stepsObj=None,
+        _parentCompSel=None,
+        _parentSelName=None,
+        _canonical=False,
+        **kwargs,
     ):
         self._comp = comp
         # check that the subunit states are compatible with the subunits
@@ -2129,7 +2401,11 @@ class ComplexState(ReactionElement):
             if st not in su._states:
                 raise TypeError(f'{st} is not a state of subunit {su}.')
 
-        self._state = self._reOrderState(self._comp._order(state))
+        if _canonical:
+            # The state was already ordered, typically when it comes from the expansion cache
+            self._state = tuple(state)
+        else:
+            self._state = self._reOrderState(self._comp._order(state))
         self._stepsObj = _stepsObj
 
         self._parentCompSel = _parentCompSel
@@ -2458,19 +2734,61 @@ class ComplexSelector(_ComplexReactionElement, nutils.MultiUsable):
 
         return cs
 
+    def _getExpansionSignature(self):
+        """Return a description of the subunit selectors that fully determines the expansion."""
+        return tuple(
+            sorted(
+                (tuple((tuple(sorted(s.name for s in sus._states)), sus._id) for sus in row) for row in self._subSels),
+                key=repr,
+            )
+        )
+
     def _getAllStates(self):
         """Return the set of all states that match the complex selector."""
+        comp = self._complex
+        key = ('ComplexSelector._getAllStates', comp._getExpansionSignature(), self._getExpansionSignature())
+        return [
+            ComplexState(comp, comp._statesFromNames(names), _parentCompSel=self, _canonical=True)
+            for names in comp._mdl._getCachedExpansion(key, self._expandAllStates)
+        ]
+
+    def _expandAllStates(self):
+        """Return the subunit state names of all states that match the complex selector."""
         states = set()
         for ss in self._subSels:
-            for comb in itertools.product(*[sus._states for sus in ss]):
-                states.add(ComplexState(self._complex, comb, _parentCompSel=self))
-        return sorted(states, key=lambda x: x.name)
+            for _, state in self._complex._iterCanonicalStates([sus._states for sus in ss]):
+                states.add(tuple(sus.name for sus in state))
+        return sorted(states, key=lambda names: '_'.join(names))
 
     def _getMatchingStates(self, rcs):
         """
         Return the pairs of states needed to declare a reaction in which self is on the lhs and
         rcs on the rhs.
         """
+        lcomp, rcomp = self._complex, rcs._complex
+        key = (
+            'ComplexSelector._getMatchingStates',
+            lcomp._getExpansionSignature(),
+            self._getExpansionSignature(),
+            rcomp._getExpansionSignature(),
+            rcs._getExpansionSignature(),
+        )
+        return [
+            (
+                ComplexState(lcomp, lcomp._statesFromNames(lnames), _parentCompSel=self, _canonical=True),
+                ComplexState(rcomp, rcomp._statesFromNames(rnames), _parentCompSel=rcs, _canonical=True),
+                rateMult,
+            )
+            for lnames, rnames, rateMult in lcomp._mdl._getCachedExpansion(
+                key, lambda: self._expandMatchingStates(rcs)
+            )
+        ]
+
+    def _expandMatchingStates(self, rcs):
+        """
+        Return the subunit state names of the pairs of states matched by _getMatchingStates, along
+        with the corresponding rate multiplier.
+        """
         l2rstates = {}
         for lss in self._subSels:
             for comb in itertools.product(*[sorted(sus._states, key=lambda x: x.name) for sus in lss]):
@@ -2531,13 +2849,15 @@ class ComplexSelector(_ComplexReactionElement, nutils.MultiUsable):
                             f'ComplexSelector {self} cannot be matched with ComplexSelector {rcs} '
                             f'for state {comb}. The reaction is undefined.'
                         )
-                lstate = ComplexState(self._complex, comb, _parentCompSel=self)
-                rstate = ComplexState(rcs._complex, destComb, _parentCompSel=rcs)
+                lstate = ComplexState(self._complex, comb)
+                rstate = ComplexState(rcs._complex, destComb)
                 l2rstates.setdefault(lstate, set()).add(rstate)
         allPairs = []
         for ls, rss in l2rstates.items():
             for rs in sorted(rss, key=lambda s: s.name):
-                allPairs.append((ls, rs, 1 / len(rss)))
+                allPairs.append(
+                    (tuple(sus.name for sus in ls._state), tuple(sus.name for sus in rs._state), 1 / len(rss))
+                )
         return allPairs
 
     def __or__(self, other):
@@ -38,19 +38,94 @@ class RNG:
     :type buffSz: int
     :param seed: Seed for the random number generator
     :type seed: int
+    :param stream: Index of the random number stream
+    :type stream: int
 
     Available algorithms:
         - ``'mt19937'`` (Mersenne Twister, based on the original mt19937.c)
         - ``'r123'``
 
+    Random number generators with the same algorithm and seed but different stream indices
+    produce independent sequences of random numbers. Stream 0 corresponds to the default
+    sequence for a given seed. With ``'r123'``, the stream index is used as the key of the
+    counter-based generator and streams are guaranteed not to overlap. With ``'mt19937'``, the
+    seed and stream index are used together as initialization key.
+
+    Independent generators can be obtained with :py:func:`stream` or :py:func:`spawn`, for
+    example to distribute runs of an ensemble to several workers::
+
+        rng = RNG('r123', 512, 1234)
+        runRngs = rng.spawn(nbRuns)
+        # Run i uses runRngs[i], regardless of which worker executes it
+
+    Random number generators can be pickled, their full state (including the position in the
+    stream) is then saved. It can also be explicitly saved and restored with
+    ``getState()`` and ``setState(state)``.
+
     Method and attributes are the same as in :py:class:`steps.API_1.rng.RNG`.
     """
 
-    def __init__(self, algoStr='mt19937', buffSz=512, seed=1):
+    def __init__(self, algoStr='mt19937', buffSz=512, seed=1, stream=0):
+        self._algoStr = algoStr
+        self._buffSz = buffSz
+        self._nextSpawned = [stream + 1]
         self.stepsrng = stepslib._py_rng_create(algoStr, buffSz)
-        self.stepsrng.initialize(seed)
+        self.stepsrng.initialize(seed, stream)
+
+    def stream(self, k):
+        """Return a new random number generator that uses stream k
+
+        :param k: Index of the stream
+        :type k: int
+
+        :returns: A random number generator with the same algorithm, buffer size, and seed
+            as this one but that uses stream k.
+        :rtype: :py:class:`RNG`
+        """
+        return RNG(self._algoStr, self._buffSz, self.stepsrng.getSeed(), k)
+
+    def spawn(self, n):
+        """Return n new random number generators that use independent streams
+
+        The returned generators use streams that were never returned by previous calls to
+        :py:func:`spawn` on this generator, on generators that it spawned, or on the
+        generator it was spawned from. Calling :py:func:`spawn` in the same order thus always
+        yields the same streams.
+
+        :param n: Number of random number generators
+        :type n: int
+
+        :returns: A list of n random number generators
+        :rtype: List[:py:class:`RNG`]
+        """
+        rngs = [self.stream(k) for k in self._spawnStreams(n)]
+        for rng in rngs:
+            rng._nextSpawned = self._nextSpawned
+        return rngs
+
+    def _spawnStreams(self, n):
+        """Reserve n unused stream indices and return them"""
+        if n < 0:
+            raise ValueError('Cannot spawn a negative number of random number generators.')
+        start = self._nextSpawned[0]
+        self._nextSpawned[0] += n
+        return range(start, start + n)
+
+    def __getstate__(self):
+        return (
+            self._algoStr, self._buffSz, self.stepsrng.getSeed(), self.stepsrng.getStreamIndex(),
+            self._nextSpawned[0], self.stepsrng.getState()
+        )
+
+    def __setstate__(self, state):
+        algoStr, buffSz, seed, stream, nextSpawned, rngState = state
+        self.__init__(algoStr, buffSz, seed, stream)
+        self._nextSpawned[0] = nextSpawned
+        self.stepsrng.setState(rngState)
 
     def __getattr__(self, name):
+        if name == 'stepsrng':
+            raise AttributeError(name)
         return getattr(self.stepsrng, name)
 
     def __call__(self, *args, **kwargs):
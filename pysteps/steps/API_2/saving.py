@@ -53,6 +53,7 @@ from . import utils as nutils
 __all__ = [
     'ResultSelector',
     'CustomResults',
+    'CheckpointResults',
     'DatabaseHandler',
     'DatabaseGroup',
     'SQLiteDBHandler',
@@ -141,6 +142,26 @@ class _MetaData(nutils.MutableDictInterface):
         return self._dict.keys()
 
 
+def _rsub(a, b):
+    return b - a
+
+
+def _rtruediv(a, b):
+    return b / a
+
+
+# Numpy equivalents of the binary operators used by result selectors, used for vectorized evaluation
+_NUMPY_BINARY_OPS = {
+    operator.add: numpy.add,
+    operator.sub: numpy.subtract,
+    operator.mul: numpy.multiply,
+    operator.truediv: numpy.true_divide,
+    operator.pow: numpy.power,
+    _rsub: lambda a, b, out: numpy.subtract(b, a, out=out),
+    _rtruediv: lambda a, b, out: numpy.true_divide(b, a, out=out),
+}
+
+
 class _LabelSelector:
     """Utility class for pointing to a specific label of a ResultSelector"""
     def __init__(self, sel, ind):
@@ -452,7 +473,14 @@ class ResultSelector:
         This method should be called before :py:func:`steps.API_2.sim.Simulation.newRun`
         has been called. The file is written in a custom binary format and can be read in a
         different python process by creating a result selector from file with
-        :py:func:`ResultSelector.FromFile`.
+        :py:func:`ResultSelector.FromFile`. Saved rows are stored as fixed-width blocks of
+        floating point values so that any slice of the data can be read without going through
+        the preceding rows.
+
+        .. note::
+            Numbers are read back as floats, integers included. Values that are not numbers, or
+            integers that cannot be exactly represented as 64 bits floats, are stored separately
+            and read back unchanged, but accessing them is slower.
 
         .. warning::
             After all simulations are finished, depending on the buffering policy, it is possible
@@ -546,6 +574,22 @@ class ResultSelector:
         self._dataHandler.save(t, self._evaluate(solvStateId))
         self._updateNextSaveTime()
 
+    def _getSaveTimesUntil(self, t, maxNb):
+        """
+        Return at most maxNb of the next save times that are lower or equal to t, without
+        updating the time of the next save.
+        """
+        if self._nextTime > t:
+            return numpy.empty(0)
+        if self._saveDt is not None:
+            end = min(self._saveTind + maxNb, int(t // self._saveDt) + 2)
+            times = numpy.arange(self._saveTind, end) * self._saveDt
+            return times[times <= t]
+        else:
+            times = numpy.array(self._saveTpnts[self._saveTind:self._saveTind + maxNb], dtype=float)
+            over = numpy.flatnonzero(times > t)
+            return times[:over[0]] if len(over) > 0 else times
+
     def _updateNextSaveTime(self):
         """Update the time of the next save."""
         if self._saveTind is not None:
@@ -622,12 +666,16 @@ class ResultSelector:
     def _binaryOp(self, other, op, symetric=False, opStr='{0} {1}'):
         """Return a _ResultCombiner that represents the binary operation op."""
         labelStrFunc=lambda s1, s2: opStr.format(s1, s2)
+        npOp = _NUMPY_BINARY_OPS.get(op)
 
         if isinstance(other, numbers.Number):
 
             def opFunc(x):
                 return [op(v, other) for v in x]
 
+            def arrFunc(x, out):
+                npOp(x, other, out=out)
+
             return _ResultCombiner(
                 opFunc,
                 lambda x: x,
@@ -638,6 +686,7 @@ class ResultSelector:
                 metaDataFunc=lambda vals: vals,
                 strDescr=opStr.format(self.description, other),
                 distribIndFunc=lambda inds: inds,
+                arrFunc=arrFunc if npOp is not None and isinstance(other, numbers.Real) else None,
             )
         elif isinstance(other, ResultSelector):
             self._checkCompatible(other)
@@ -646,6 +695,9 @@ class ResultSelector:
                 def opFunc(x):
                     return [op(v, x[-1]) for v in x[:-1]]
 
+                def arrFunc(x, out):
+                    npOp(x[:-1], x[-1], out=out)
+
                 def mtdtFunc(vals):
                     v2 = vals[-1]
                     vals = [v1 if v1 == v2 else None for v1 in vals[:-1]]
@@ -663,6 +715,7 @@ class ResultSelector:
                     labelStrFunc=labelStrFunc,
                     metaDataFunc=mtdtFunc,
                     strDescr=opStr.format(self.description, other.description),
+                    arrFunc=arrFunc if npOp is not None else None,
                 )
             elif symetric and self._getEvalLen() == 1:
                 return other._binaryOp(self, op, True, opStr)
@@ -671,6 +724,10 @@ class ResultSelector:
                     n = len(x) // 2
                     return [op(a, b) for a, b in zip(x[:n], x[n:])]
 
+                def arrFunc(x, out):
+                    n = len(x) // 2
+                    npOp(x[:n], x[n:], out=out)
+
                 def mtdtFunc(vals):
                     vals1 = vals[:len(vals) // 2]
                     vals2 = vals[len(vals) // 2:]
@@ -690,6 +747,7 @@ class ResultSelector:
                     metaDataFunc=mtdtFunc,
                     strDescr=opStr.format(self.description, other.description),
                     distribIndFunc=lambda inds: inds[:len(inds)//2],
+                    arrFunc=arrFunc if npOp is not None else None,
                 )
             else:
                 raise Exception(
@@ -784,7 +842,7 @@ class ResultSelector:
         return self._binaryOp(other, operator.truediv, symetric=False, opStr='({0} / {1})')
 
     def __rtruediv__(self, other):
-        return self._binaryOp(other, lambda a, b: b / a, symetric=False, opStr='({1} / {0})')
+        return self._binaryOp(other, _rtruediv, symetric=False, opStr='({1} / {0})')
 
     def __add__(self, other):
         """Add result selectors with the ``+`` operator
@@ -849,7 +907,7 @@ class ResultSelector:
         return self._binaryOp(other, operator.sub, symetric=False, opStr='({0} - {1})')
 
     def __rsub__(self, other):
-        return self._binaryOp(other, lambda a, b: b - a, symetric=False, opStr='({1} - {0})')
+        return self._binaryOp(other, _rsub, symetric=False, opStr='({1} - {0})')
 
     def __pow__(self, other):
         """Exponentiate result selectors with the ** operator
@@ -903,6 +961,7 @@ class ResultSelector:
             labelStrFunc=lambda *args: f"SUM({' + '.join(args)})",
             strDescr=f'SUM({sel.description})',
             distribIndFunc=lambda lst: [0],
+            arrFunc=lambda x, out: numpy.sum(x, keepdims=True, out=out),
         )
 
     @classmethod
@@ -929,6 +988,7 @@ class ResultSelector:
             labelStrFunc=lambda *args: f"MIN({', '.join(args)})",
             strDescr=f'MIN({sel.description})',
             distribIndFunc=lambda lst: [0],
+            arrFunc=lambda x, out: numpy.min(x, keepdims=True, out=out),
         )
 
     @classmethod
@@ -955,6 +1015,7 @@ class ResultSelector:
             labelStrFunc=lambda *args: f"MAX({', '.join(args)})",
             strDescr=f'MAX({sel.description})',
             distribIndFunc=lambda lst: [0],
+            arrFunc=lambda x, out: numpy.max(x, keepdims=True, out=out),
         )
 
     @classmethod
@@ -1071,6 +1132,34 @@ class CustomResults(ResultSelector):
         raise NotImplementedError('CustomResults cannot be combined with other result selectors.')
 
 
+class CheckpointResults(CustomResults):
+    """Class to save the cost of automatic checkpoints
+
+    Each automatic checkpoint taken by a simulation to which the :py:class:`CheckpointResults`
+    object was passed (see :py:func:`steps.API_2.sim.Simulation.autoCheckpoint`) saves one row
+    with the following columns:
+
+    - ``'stallTime'``: time (s) during which the simulation was blocked by the checkpoint
+    - ``'size'``: size (bytes) of the uncompressed solver state on the current rank
+
+    :param sim: The simulation for which we want to save data
+    :type sim: :py:class:`steps.API_2.sim.Simulation`
+
+    Usage::
+
+        cpres = CheckpointResults(sim)
+        sim.toSave(cpres)
+        sim.autoCheckpoint(10, keep=2, background=True, compress=True, results=cpres)
+    """
+    def __init__(self, sim, *args, **kwargs):
+        super().__init__(sim, [float, int], *args, **kwargs)
+        self.labels = ['stallTime', 'size']
+
+    def _strDescr(self):
+        """Return a default generic description of the ResultSelector."""
+        return 'CheckpointResults'
+
+
 class _ResultPath(ResultSelector):
     """
     Represents a SimPath to be saved during simulation.
@@ -1366,11 +1455,15 @@ class _ResultCombiner(_ResultList):
     Transforms results using function func that takes an iterable and outputs a list.
     function lenFunc should take the length of children output as an argument and return the
     length of the combiner output.
+    The optional function arrFunc is a vectorized version of func, it takes a numpy array of
+    children output and writes the combiner output to a preallocated numpy array passed as
+    second argument. It is used instead of func when all children output numpy arrays.
     """
 
     def __init__(self, func, lenFunc, *args, labelArgFunc=None, labelStrFunc=None, metaDataFunc=None,
-            strDescr=None, distribIndFunc=None, **kwargs):
+            strDescr=None, distribIndFunc=None, arrFunc=None, **kwargs):
         self.func = func
+        self._arrFunc = arrFunc
         super().__init__(*args, finalize=False, **kwargs)
         self._lenFunc = lenFunc
         self._labelArgFunc = labelArgFunc if labelArgFunc is not None else lambda i, chld: (f'{chld}[{i}]',)
@@ -1619,7 +1712,19 @@ class _FileDataHandler(_DataHandler):
     FILE_FORMAT_STR = '__steps_version__'
     FILE_FORMAT_OLDEST_VERSION = '3.6.0'
 
-    RESERVED_KEY_NAMES = [SELECTOR_DESCRIPTION_STR, FILE_FORMAT_STR]
+    # Files that contain this key in their metadata store rows as fixed-width float64 blocks.
+    # Values of columns that are declared as non-numeric through the value_type metadata are
+    # stored, for each run, in a pickled side table that is written after the rows and referenced
+    # by index in the row block. Values of other columns that cannot be exactly represented as
+    # float64 are stored in the same side table, under their (row, column) position, and NaN is
+    # written in the row block.
+    FILE_LAYOUT_STR = '__file_layout__'
+    COLUMNAR_LAYOUT = 'columnar'
+    COLUMNAR_DTYPE = '>f8'
+    # Integers with higher absolute values cannot always be exactly represented as float64
+    COLUMNAR_MAX_EXACT_INT = 2 ** 53
+
+    RESERVED_KEY_NAMES = [SELECTOR_DESCRIPTION_STR, FILE_FORMAT_STR, FILE_LAYOUT_STR]
 
     def __init__(self, parent, path, evalLen=None, buffering=-1, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
@@ -1640,13 +1745,29 @@ class _FileDataHandler(_DataHandler):
         # TODO Not urgent: make labels and metadata readonly
         self._labelEndPos = None
 
+        # Columnar layout data
+        self._columnar = False
+        self._compObjInds = None
+        self._sideTable = []
+        self._sideValues = {}
+
+        # Cached index of run headers, used by data accessors
+        self._runIndexCache = None
+
         # If we are reading from a file, we need to set the version
         if self._readOnly:
-            version = self.metaData(internal=True)._dict.get(
-                _FileDataHandler.FILE_FORMAT_STR,
-                _FileDataHandler.FILE_FORMAT_OLDEST_VERSION
-            )
+            mtdt = self.metaData(internal=True)._dict
+            version = mtdt.get(_FileDataHandler.FILE_FORMAT_STR, _FileDataHandler.FILE_FORMAT_OLDEST_VERSION)
             self._setVersion(version)
+            self._columnar = mtdt.get(_FileDataHandler.FILE_LAYOUT_STR) == _FileDataHandler.COLUMNAR_LAYOUT
+            if self._columnar:
+                self._compObjInds = self._getCompObjInds(mtdt)
+        else:
+            self._columnar = self._version > self._parseVersion(_FileDataHandler.FILE_FORMAT_OLDEST_VERSION)
+        # Only files written with pickled rows do not have fixed-width rows
+        self._fixedWidthRows = self._columnar or not self._version > self._parseVersion(
+            _FileDataHandler.FILE_FORMAT_OLDEST_VERSION
+        )
 
     def __del__(self):
         if hasattr(self, '_saveFile') and self._saveFile is not None:
@@ -1697,6 +1818,23 @@ class _FileDataHandler(_DataHandler):
             self.labels()
         return self._labelEndPos
 
+    @staticmethod
+    def _isExactFloat64(v):
+        """Return whether v is a number that is read back identically from a float64 block."""
+        if isinstance(v, numbers.Integral):
+            return abs(v) <= _FileDataHandler.COLUMNAR_MAX_EXACT_INT
+        return isinstance(v, numbers.Real)
+
+    @staticmethod
+    def _getCompObjInds(mtdt):
+        """Return the indices of columns that contain values that are not numbers, or None."""
+        tpes = mtdt.get('value_type', None)
+        if tpes is not None:
+            inds = [i for i, tpe in enumerate(tpes) if tpe is not None]
+            if len(inds) > 0:
+                return inds
+        return None
+
     def _newRun(self):
         """Signal that a new run of the simulation started."""
         super()._newRun()
@@ -1704,6 +1842,8 @@ class _FileDataHandler(_DataHandler):
         self.saveTime.append([])
         if nsim.MPI._shouldWrite:
             self._writeRunHeader(self._runId, 0, 1 + self._evalLen)
+            self._sideTable = []
+            self._sideValues = {}
 
     def save(self, t, row):
         """Save the data."""
@@ -1719,13 +1859,22 @@ class _FileDataHandler(_DataHandler):
                 self._saveFile = open(self._savePath, 'wb', buffering=self._saveBuffering)
             else:
                 self._saveFile = open(self._savePath, 'r+b', buffering=self._saveBuffering)
-                self._saveFile.seek(0, 2)
+                if self._columnar:
+                    # Discard the side table of the current run, it will be rewritten at the end of the run
+                    rowSize = numpy.dtype(_FileDataHandler.COLUMNAR_DTYPE).itemsize * self._fileHeaderInfo[2]
+                    headerSize = struct.calcsize(_FileDataHandler.HEADER_FORMAT)
+                    self._saveFile.seek(self._filePrevPos + headerSize + self._fileHeaderInfo[1] * rowSize)
+                    self._saveFile.truncate()
+                else:
+                    self._saveFile.seek(0, 2)
         return self._saveFile
 
     def _writeRunHeader(self, runId, nbRows, nbCols, writeNext=True):
         """Write the header line of a run."""
         self._openFile()
         if self._fileHeaderInfo is not None:
+            if self._columnar:
+                pickle.dump((self._sideTable, self._sideValues), self._saveFile)
             nxtPos = self._saveFile.seek(0, 1)
             self._saveFile.seek(self._filePrevPos, 0)
             if writeNext:
@@ -1758,6 +1907,9 @@ class _FileDataHandler(_DataHandler):
                 )
         mtdt[_FileDataHandler.FILE_FORMAT_STR] = steps.__version__
         mtdt[_FileDataHandler.SELECTOR_DESCRIPTION_STR] = self._parent.description
+        if self._columnar:
+            mtdt[_FileDataHandler.FILE_LAYOUT_STR] = _FileDataHandler.COLUMNAR_LAYOUT
+            self._compObjInds = self._getCompObjInds(mtdt)
 
         data = pickle.dumps(mtdt)
         self._writeInt(len(data))
@@ -1810,7 +1962,22 @@ class _FileDataHandler(_DataHandler):
     def _writeToFile(self, t, vals):
         """Write the data to file."""
         self._openFile()
-        pickle.dump((t, vals), self._saveFile)
+        if self._columnar:
+            vals = list(vals)
+            if self._compObjInds is not None:
+                for i in self._compObjInds:
+                    if vals[i] is not None:
+                        self._sideTable.append(vals[i])
+                        vals[i] = len(self._sideTable) - 1
+                    else:
+                        vals[i] = -1
+            for i, v in enumerate(vals):
+                if type(v) is not float and not _FileDataHandler._isExactFloat64(v):
+                    self._sideValues[(self._fileHeaderInfo[1], i)] = v
+                    vals[i] = math.nan
+            self._saveFile.write(numpy.array([t] + vals, dtype=_FileDataHandler.COLUMNAR_DTYPE).tobytes())
+        else:
+            pickle.dump((t, vals), self._saveFile)
         self._fileHeaderInfo[1] += 1
 
     def _finalizeFile(self):
@@ -1841,20 +2008,26 @@ class _SQLiteDataHandler(_DBDataHandler):
 
     TABLE_NAME_TEMPLATE = 'Group_{}_Selector_{}'
     COLUMN_NAME_TEMPLATE = 'Col_{} real'
+    PACKED_COLUMN_NAME = 'data'
+    PACKED_DTYPE = '<f8'
 
     MTDT_STEPS_VERSION_STR = '__steps_version__'
     MTDT_OLDEST_VERSION = '5.0.0'
+    MTDT_PACKED_ROWS_STR = '__packed_rows__'
 
-    RESERVED_KEY_NAMES = [MTDT_STEPS_VERSION_STR]
+    RESERVED_KEY_NAMES = [MTDT_STEPS_VERSION_STR, MTDT_PACKED_ROWS_STR]
 
     def __init__(
-        self, parent, dbh, commitFreq, *args, groupId=None, rsid=None, tableName=None, nbCols=None, **kwargs
+        self, parent, dbh, commitFreq, *args, packRows=False, groupId=None, rsid=None, tableName=None,
+        nbCols=None, **kwargs
     ):
         super().__init__(parent, *args, **kwargs)
         self._dbh = dbh
         self._conn = dbh._conn
         self._commitFreq = commitFreq
         self._commitInd = 0
+        self._packRows = packRows
+        self._pendingRows = []
 
         self._initialized = False
 
@@ -1867,25 +2040,28 @@ class _SQLiteDataHandler(_DBDataHandler):
         self._metaData = None
 
         if self._groupId is not None:
-            # Load version if we are reading from a database
-            version = self.metaData(internal=True).get(
-                _SQLiteDataHandler.MTDT_STEPS_VERSION_STR,
-                _SQLiteDataHandler.MTDT_OLDEST_VERSION
-            )
+            # Load version and row storage if we are reading from a database
+            mtdt = self.metaData(internal=True)
+            version = mtdt.get(_SQLiteDataHandler.MTDT_STEPS_VERSION_STR, _SQLiteDataHandler.MTDT_OLDEST_VERSION)
             self._setVersion(version)
+            self._packRows = mtdt.get(_SQLiteDataHandler.MTDT_PACKED_ROWS_STR, False)
 
     def time(self):
         """Return an accessor to the timepoints data."""
         self._checkCanAccess()
+        self._flush()
         return _SQLiteDataAccessor(
-            self._dbh, self._groupId, self._rsid, self._tableName, self._nbCols, saveTime=True
+            self._dbh, self._groupId, self._rsid, self._tableName, self._nbCols, saveTime=True,
+            packed=self._packRows
         )
 
     def data(self):
         """Return an accessor to the saved data."""
         self._checkCanAccess()
+        self._flush()
         return _SQLiteDataAccessor(
-            self._dbh, self._groupId, self._rsid, self._tableName, self._nbCols, saveTime=False
+            self._dbh, self._groupId, self._rsid, self._tableName, self._nbCols, saveTime=False,
+            packed=self._packRows
         )
 
     def labels(self):
@@ -1920,17 +2096,21 @@ class _SQLiteDataHandler(_DBDataHandler):
         lbls = self._parent.labels
         self._groupId = self._dbh._groupId
         self._rsid = self._parent._selectorInd
-        colStr = ', '.join(_SQLiteDataHandler.COLUMN_NAME_TEMPLATE.format(i) for i in range(len(lbls)))
 
         self._nbCols = len(lbls)
         self._tableName = _SQLiteDataHandler.TABLE_NAME_TEMPLATE.format(self._groupId, self._rsid)
-        self._insertStr = f"INSERT INTO {self._tableName} VALUES ({','.join('?'*(2+self._nbCols))});"
 
         # Check if the table already exists
         rows = self._conn.execute(
             f"SELECT name FROM sqlite_master WHERE type='table' AND name='{self._tableName}'"
         ).fetchall()
         if len(rows) == 0:
+            if self._packRows is None:
+                self._packRows = self._nbCols + 2 > SQLiteDBHandler._MAX_NB_COLUMNS
+            if self._packRows:
+                colStr = f'{_SQLiteDataHandler.PACKED_COLUMN_NAME} blob'
+            else:
+                colStr = ', '.join(_SQLiteDataHandler.COLUMN_NAME_TEMPLATE.format(i) for i in range(len(lbls)))
             # Create table
             self._conn.execute(f'CREATE TABLE {self._tableName} (runid int, time real, {colStr});')
             # Add table info to main table
@@ -1951,16 +2131,25 @@ class _SQLiteDataHandler(_DBDataHandler):
                         f'The metadata contains the reserved key name "{keyname}"'
                     )
             mtdt[_SQLiteDataHandler.MTDT_STEPS_VERSION_STR] = steps.__version__
+            if self._packRows:
+                mtdt[_SQLiteDataHandler.MTDT_PACKED_ROWS_STR] = True
             self._conn.execute(
                 f'INSERT INTO {SQLiteDBHandler._RS_META_DATA_TABLE_NAME} VALUES (?,?,?);',
                 (self._groupId, self._rsid, pickle.dumps(mtdt)),
             )
         else:
+            # Use the same row storage as the existing table
+            self._packRows = self._dbh._metaDataQuerry(self._groupId, self._rsid).get(
+                _SQLiteDataHandler.MTDT_PACKED_ROWS_STR, False
+            )
             # Initialize the runId to the last recorded one
             rid = self._conn.execute(f'SELECT MAX(runid) FROM {self._tableName}').fetchone()[0]
             if rid is not None:
                 self._runId = rid
 
+        nbVals = 3 if self._packRows else 2 + self._nbCols
+        self._insertStr = f"INSERT INTO {self._tableName} VALUES ({','.join('?'*nbVals)});"
+
         self._conn.commit()
         self._cursor = self._conn.cursor()
         self._initialized = True
@@ -1974,11 +2163,23 @@ class _SQLiteDataHandler(_DBDataHandler):
     def save(self, t, row):
         """Save the data."""
         if nsim.MPI._shouldWrite:
-            self._cursor.execute(self._insertStr, (self._runId, t) + tuple(row))
+            if self._packRows:
+                self._pendingRows.append(
+                    (self._runId, t, numpy.array(row, dtype=_SQLiteDataHandler.PACKED_DTYPE).tobytes())
+                )
+            else:
+                self._pendingRows.append((self._runId, t) + tuple(row))
             self._commitInd += 1
             if self._commitInd % self._commitFreq == 0:
+                self._flush()
                 self._conn.commit()
 
+    def _flush(self):
+        """Insert all pending rows in the database."""
+        if len(self._pendingRows) > 0:
+            self._cursor.executemany(self._insertStr, self._pendingRows)
+            self._pendingRows = []
+
 
 class _HDF5DataHandler(_DBDataHandler):
     """
@@ -1993,6 +2194,9 @@ class _HDF5DataHandler(_DBDataHandler):
     _TIME_DSET_NAME = 'time'
     _RUN_GROUP_TEMPLATE = 'Run_{}'
 
+    # Target size in bytes of data chunks when the chunk shape is chosen by STEPS
+    _CHUNK_TARGET_SIZE = 256 * 1024
+
     def __init__(self, dbh, parent, group, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
 
@@ -2004,6 +2208,13 @@ class _HDF5DataHandler(_DBDataHandler):
         self._time = None
         self._data = None
 
+        # Write-behind buffers, only used if the handler was created with writeBufferSize > 1
+        self._bufferSize = getattr(dbh, '_writeBufferSize', 1)
+        self._timeBuffer = None
+        self._dataBuffer = None
+        self._bufferInd = 0
+        self._nbWrittenRows = 0
+
         self._lbls = None
 
         # Vector representing the permutation that should be applied before saving the data to file
@@ -2021,11 +2232,13 @@ class _HDF5DataHandler(_DBDataHandler):
     def time(self):
         """Return an accessor to the timepoints data."""
         self._checkCanAccess()
+        self._syncRun()
         return _HDF5DataAccessor(self, True)
 
     def data(self):
         """Return an accessor to the saved data."""
         self._checkCanAccess()
+        self._syncRun()
         return _HDF5DataAccessor(self, False)
 
     def labels(self):
@@ -2118,6 +2331,7 @@ class _HDF5DataHandler(_DBDataHandler):
         dskwargs = self._dbh._dataSetKWargs
         if not self._initialized and self._group is not None:
             self._initialize()
+        self._syncRun()
         self._timeInd = -1
         super()._newRun()
 
@@ -2126,24 +2340,96 @@ class _HDF5DataHandler(_DBDataHandler):
             runGroup = self._group[_HDF5DataHandler._RUNS_GROUP_NAME].create_group(
                 _HDF5DataHandler._RUN_GROUP_TEMPLATE.format(self._runId)
             )
-            self._data = runGroup.create_dataset(
-                _HDF5DataHandler._DATA_DSET_NAME, (1, n), maxshape=(None, n), dtype='d', **dskwargs
-            )
-            self._time = runGroup.create_dataset(
-                _HDF5DataHandler._TIME_DSET_NAME, (1,), maxshape=(None,), dtype='d', **dskwargs
-            )
+            if self._bufferSize > 1:
+                nbRows = self._getExpectedNbRows()
+                if 'chunks' not in dskwargs:
+                    rowChunk, colChunk = self._getChunkShape(n)
+                    dskwargs = dict(dskwargs, chunks=(rowChunk, colChunk))
+                    timeChunks = (rowChunk,)
+                else:
+                    timeChunks = True
+                self._data = runGroup.create_dataset(
+                    _HDF5DataHandler._DATA_DSET_NAME, (nbRows, n), maxshape=(None, n), dtype='d', **dskwargs
+                )
+                self._time = runGroup.create_dataset(
+                    _HDF5DataHandler._TIME_DSET_NAME, (nbRows,), maxshape=(None,), dtype='d',
+                    **dict(dskwargs, chunks=timeChunks)
+                )
+                self._timeBuffer = numpy.empty((self._bufferSize,), dtype='d')
+                self._dataBuffer = numpy.empty((self._bufferSize, n), dtype='d')
+                self._bufferInd = 0
+                self._nbWrittenRows = 0
+            else:
+                self._data = runGroup.create_dataset(
+                    _HDF5DataHandler._DATA_DSET_NAME, (1, n), maxshape=(None, n), dtype='d', **dskwargs
+                )
+                self._time = runGroup.create_dataset(
+                    _HDF5DataHandler._TIME_DSET_NAME, (1,), maxshape=(None,), dtype='d', **dskwargs
+                )
+
+    def _getExpectedNbRows(self):
+        """Return the number of rows that the current run is expected to contain, if it is known"""
+        if self._parent._saveDt is None and self._parent._saveTpnts is not None:
+            return len(self._parent._saveTpnts)
+        return self._bufferSize
+
+    def _getChunkShape(self, nbCols):
+        """Return a (time, column) chunk shape that covers a full buffer flush"""
+        itemSize = numpy.dtype('d').itemsize
+        colChunk = min(nbCols, max(1, _HDF5DataHandler._CHUNK_TARGET_SIZE // (itemSize * self._bufferSize)))
+        rowChunk = max(1, min(self._bufferSize, _HDF5DataHandler._CHUNK_TARGET_SIZE // (itemSize * colChunk)))
+        return rowChunk, colChunk
+
+    def _flushBuffer(self):
+        """Write buffered rows to the file in a single block"""
+        if self._compObjInds is not None and self._dbh._compObjHandler is not None:
+            self._dbh._compObjHandler.flush()
+        if self._bufferInd == 0:
+            return
+        start = self._nbWrittenRows
+        end = start + self._bufferInd
+        if end > self._time.shape[0]:
+            # Grow geometrically to avoid resizing the datasets at each flush
+            newSize = max(end, 2 * self._time.shape[0])
+            self._time.resize(newSize, axis=0)
+            self._data.resize(newSize, axis=0)
+        self._time[start:end] = self._timeBuffer[:self._bufferInd]
+        self._data[start:end, :] = self._dataBuffer[:self._bufferInd, :]
+        self._nbWrittenRows = end
+        self._bufferInd = 0
+
+    def _syncRun(self):
+        """Flush buffered rows and trim the datasets of the current run to the saved rows"""
+        if self._bufferSize > 1 and self._time is not None and self._time:
+            self._flushBuffer()
+            if self._time.shape[0] != self._nbWrittenRows:
+                self._time.resize(self._nbWrittenRows, axis=0)
+                self._data.resize(self._nbWrittenRows, axis=0)
 
     def save(self, t, row):
         """Save the data."""
         if self._group is not None:
             self._timeInd += 1
+            if self._compObjInds is not None:
+                compObjHandler = self._dbh._compObjHandler
+                for i in self._compObjInds:
+                    row[i] = compObjHandler.write(row[i], flush=False)
+                if self._bufferSize <= 1:
+                    compObjHandler.flush()
+            if self._bufferSize > 1:
+                self._timeBuffer[self._bufferInd] = t
+                if self._colRemapping is None:
+                    self._dataBuffer[self._bufferInd, :] = row
+                else:
+                    self._dataBuffer[self._bufferInd, :] = numpy.array(row)[self._colRemapping]
+                self._bufferInd += 1
+                if self._bufferInd == self._bufferSize:
+                    self._flushBuffer()
+                return
             if self._timeInd >= self._time.shape[0]:
                 self._time.resize(self._timeInd + 1, axis=0)
                 self._data.resize(self._timeInd + 1, axis=0)
             self._time[self._timeInd] = t
-            if self._compObjInds is not None:
-                for i in self._compObjInds:
-                    row[i] = self._dbh._compObjHandler.write(row[i])
             if self._colRemapping is None:
                 self._data[self._timeInd, :] = numpy.array(row)
             else:
@@ -2223,6 +2509,9 @@ class _HDF5DistribDataHandler(_HDF5DataHandler):
 class _HDF5CompoundObjHandler(nutils.Versioned):
     """Utility class for writing compound objects to HDF groups
     Support writing python lists and dicts to HDF5 groups.
+
+    Objects are first serialised to in-memory buffers and appended to the HDF5 datasets when
+    flush() is called, with a single resize per dataset.
     """
 
     _COMPOBJ_GROUP_NAME = 'CompoundObjects'
@@ -2245,7 +2534,10 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
         _DATA_TYPE.LIST: (_IND_DTYPE, 'Lists'),
     }
 
-    def __init__(self, parentGroup, dbh, cachedTypes=[], readOnly=False, maxFullLoadSize=1024**2, **kwargs):
+    def __init__(
+        self, parentGroup, dbh, cachedTypes=[], readOnly=False, maxFullLoadSize=1024**2,
+        maxBufferSize=1024**2, **kwargs
+    ):
         super().__init__(**kwargs)
         self._parentGroup = parentGroup
         self._dbh = dbh
@@ -2258,6 +2550,14 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
         self._readOnly = readOnly
         self._maxFullLoadSize = maxFullLoadSize
 
+        # Write buffers
+        self._maxBufferSize = maxBufferSize
+        self._pendingData = None
+        self._pendingComps = []
+        self._nbPending = 0
+        self._dataLens = None
+        self._compLen = 0
+
         self._setUp()
 
     def _setUp(self):
@@ -2291,6 +2591,10 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
                 nutils._print(f'Loading full compound data subdataset: {dsetName}', 3)
                 self._dsets[-1] = self._dsets[-1][...]
 
+        self._pendingData = [[] for _ in self._dsets]
+        self._dataLens = [len(dset) for dset in self._dsets]
+        self._compLen = len(self._compDset)
+
         # Faster than if/else or match statement when needing to load a lot of objects
         ints, floats, strings, lists = self._dsets
         self._dataLoaders = [
@@ -2303,6 +2607,7 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
 
     def _getDataRanges(self, ind):
         """Return datasets and ranges that contain the data of the object with index ind."""
+        self.flush()
         tpe, start, end = self._compDset[ind, :]
         if tpe in [self._DATA_TYPE.FLOAT, self._DATA_TYPE.INT, self._DATA_TYPE.STRING]:
             if end >= start:
@@ -2322,17 +2627,18 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
         return val
 
     def _pushData(self, tpe, data):
-        dset = self._dsets[tpe]
-        start = len(dset)
+        start = self._dataLens[tpe]
         end = start + len(data)
-        dset.resize(end, axis=0)
-        dset[start:end] = data
+        self._pendingData[tpe].extend(data)
+        self._dataLens[tpe] = end
+        self._nbPending += len(data)
         return start, end
 
     def _pushCompound(self, tpe, start, end):
-        ind = self._compDset.shape[0]
-        self._compDset.resize(ind + 1, axis=0)
-        self._compDset[ind,:] = [tpe, start, end]
+        ind = self._compLen
+        self._pendingComps.append((tpe, start, end))
+        self._compLen += 1
+        self._nbPending += 1
         return ind
 
     def _pushObject(self, tpe, data, dataTpe=None):
@@ -2348,16 +2654,43 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
         else:
             return self._pushCompound(tpe, *self._pushData(dataTpe, data))
 
-    def write(self, obj):
+    def flush(self):
+        """Append all buffered compound objects to the HDF5 datasets"""
+        if len(self._pendingComps) == 0:
+            return
+        for dset, pending, (dtype, _) in zip(self._dsets, self._pendingData, self._DATA_INFO.values()):
+            if len(pending) > 0:
+                start = len(dset)
+                dset.resize(start + len(pending), axis=0)
+                dset[start:] = numpy.array(pending, dtype=dtype)
+                pending.clear()
+        start = len(self._compDset)
+        self._compDset.resize(start + len(self._pendingComps), axis=0)
+        self._compDset[start:, :] = numpy.array(self._pendingComps, dtype=self._IND_DTYPE)
+        self._pendingComps.clear()
+        self._nbPending = 0
+
+    def write(self, obj, flush=True):
+        """Write a compound object and return its index
+
+        If flush is False, the object is only serialised to the write buffers, it will be
+        written to file during the next call to flush(), or when the buffers get too large.
+        """
         if not self._cacheInit:
             # Initialize cache
             if len(self._caches) > 0:
-                for i, (tpe, start, end) in enumerate(self._compDset[...]):
-                    if tpe in self._caches:
-                        key = self._getCacheKey(self.read(i))
-                        self._caches[tpe][key] = i
+                tpes = numpy.array(self._compDset[...])[:, 0]
+                inds = [i for i, tpe in enumerate(tpes) if tpe in self._caches]
+                for i, obj2 in zip(inds, self.readMany(inds)):
+                    self._caches[tpes[i]][self._getCacheKey(obj2)] = i
             self._cacheInit = True
 
+        ind = self._write(obj)
+        if flush or self._nbPending >= self._maxBufferSize:
+            self.flush()
+        return ind
+
+    def _write(self, obj):
         if obj is None:
             return -1
         elif isinstance(obj, numbers.Number):
@@ -2377,10 +2710,10 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
                     return self._pushObject(self._DATA_TYPE.INT, obj)
             else:
                 # List of compounds
-                return self._pushObject(self._DATA_TYPE.LIST, [self.write(v) for v in obj])
+                return self._pushObject(self._DATA_TYPE.LIST, [self._write(v) for v in obj])
         elif isinstance(obj, dict):
-            indKeys = self.write(tuple(obj.keys()))
-            indVals = self.write(list(obj.values()))
+            indKeys = self._write(tuple(obj.keys()))
+            indVals = self._write(list(obj.values()))
             return self._pushObject(self._DATA_TYPE.DICT, [indKeys, indVals], dataTpe=self._DATA_TYPE.LIST)
         else:
             raise TypeError(f'Unsupported type {type(obj)} cannot be added to the HDF5 file.')
@@ -2388,6 +2721,8 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
     def read(self, ind):
         if ind < 0:
             return None
+        if len(self._pendingComps) > 0:
+            self.flush()
         try:
             tpe, start, end = self._compDset[ind, :]
             return self._dataLoaders[tpe](start, end)
@@ -2395,6 +2730,77 @@ class _HDF5CompoundObjHandler(nutils.Versioned):
             warnings.warn(f'Could not read compound object {ind}, returning None instead of its value.')
             return None
 
+    def _readBlock(self, data, first, last, nbValues):
+        """Return whether data[first:last] should be read as a single block to access nbValues values"""
+        return isinstance(data, numpy.ndarray) or last - first <= max(self._maxFullLoadSize, 4 * nbValues)
+
+    def _readRanges(self, data, starts, ends):
+        """Return the list of data[start:end] arrays for all start, end pairs"""
+        first, last = int(numpy.min(starts)), int(numpy.max(ends))
+        if self._readBlock(data, first, last, int(numpy.sum(ends - starts))):
+            block = data[first:last]
+            return [block[s - first:e - first] for s, e in zip(starts, ends)]
+        else:
+            return [data[s:e] for s, e in zip(starts, ends)]
+
+    def _decode(self, inds):
+        """Decode the compound objects whose sorted and unique indices are given in inds"""
+        first, last = int(inds[0]), int(inds[-1]) + 1
+        if self._readBlock(self._compDset, first, last, len(inds)):
+            comps = numpy.array(self._compDset[first:last, :])[inds - first, :]
+        else:
+            comps = numpy.array(self._compDset[inds, :])
+        tpes, starts, ends = comps[:, 0], comps[:, 1], comps[:, 2]
+
+        DTPE = self._DATA_TYPE
+        objs = [None] * len(inds)
+        for tpe in [DTPE.INT, DTPE.FLOAT, DTPE.STRING, DTPE.LIST, DTPE.DICT]:
+            sel = numpy.where(tpes == tpe)[0]
+            if len(sel) == 0:
+                continue
+            scalars = ends[sel] < starts[sel]
+            selEnds = numpy.where(scalars, starts[sel] + 1, ends[sel])
+            dsetTpe = DTPE.LIST if tpe == DTPE.DICT else tpe
+            chunks = self._readRanges(self._dsets[dsetTpe], starts[sel], selEnds)
+            if tpe in [DTPE.INT, DTPE.FLOAT]:
+                for i, scalar, chunk in zip(sel, scalars, chunks):
+                    objs[i] = chunk[0] if scalar else list(chunk)
+            elif tpe == DTPE.STRING:
+                for i, chunk in zip(sel, chunks):
+                    objs[i] = bytearray(chunk).decode('utf-8')
+            else:
+                # Decode all children in a single pass
+                children = self.readMany(numpy.concatenate(chunks))
+                pos = 0
+                for i, chunk in zip(sel, chunks):
+                    sub = children[pos:pos + len(chunk)]
+                    pos += len(chunk)
+                    objs[i] = sub if tpe == DTPE.LIST else {k: v for k, v in zip(*sub)}
+        return objs
+
+    def readMany(self, indices):
+        """Read several compound objects at once
+
+        Objects of the same type are decoded together, from contiguous blocks of the underlying
+        datasets. Return a list of objects in the same order as indices.
+        """
+        self.flush()
+        inds = numpy.array(indices, dtype=numpy.int64).ravel()
+        res = [None] * len(inds)
+        valid = numpy.where(inds >= 0)[0]
+        if len(valid) == 0:
+            return res
+        uniqInds, inv = numpy.unique(inds[valid], return_inverse=True)
+        nbComps = len(self._compDset)
+        for ind in uniqInds[uniqInds >= nbComps]:
+            warnings.warn(f'Could not read compound object {ind}, returning None instead of its value.')
+        known = uniqInds[uniqInds < nbComps]
+        objs = self._decode(known) if len(known) > 0 else []
+        objs += [None] * (len(uniqInds) - len(known))
+        for i, j in zip(valid, inv):
+            res[i] = objs[j]
+        return res
+
 
 class _XDMFDataHandler(_HDF5DataHandler):
     """
@@ -2463,15 +2869,11 @@ class _FileDataAccessor(nutils.Versioned):
     """
 
     HEADER_SIZE = struct.calcsize(_FileDataHandler.HEADER_FORMAT)
-    DATA_SIZE = struct.calcsize(_FileDataHandler.DATA_FORMAT)
     DEFAULT_MAXRUNID = sys.maxsize
 
     class UnexpectedEnd(Exception):
         pass
 
-    # TODO Optimization: save the number of runs and related data and only update it if the file
-    # was changed
-
     def __init__(self, fp, parent, saveTime=False):
         self._fp = fp
         self._saveTime = saveTime
@@ -2479,7 +2881,6 @@ class _FileDataAccessor(nutils.Versioned):
         self._dataStartPos = parent._dataStartPos
 
         self._file = open(self._fp, 'rb')
-        self._fileInfo = {}
         self._nbDims = 2 if saveTime else 3
 
         self._setVersion(self._parentHandler._version)
@@ -2488,28 +2889,46 @@ class _FileDataAccessor(nutils.Versioned):
         if hasattr(self, '_file') and self._file is not None:
             self._file.close()
 
-    def __len__(self):
-        if 'len' not in self._fileInfo:
-            pos = self._file.seek(0, 1)
-            self._file.seek(self._dataStartPos)
-            nb = 0
-            try:
+    def _getRunIndex(self):
+        """Return a list of (runId, nbRows, nbCols, nxt, headerPos) tuples, one for each run
+
+        The index is cached in the parent handler and is only updated if the file was modified since
+        it was computed. Since only the header of the last run can change when data is appended to the
+        file, the update only needs to read the headers from the last run onwards.
+        """
+        st = os.stat(self._fp)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._parentHandler._runIndexCache
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        if cached is not None and len(cached[1]) > 0 and cached[0][1] <= stamp[1]:
+            runs = cached[1][:-1]
+            pos = cached[1][-1][4]
+        else:
+            runs = []
+            pos = self._dataStartPos
+
+        filePos = self._file.seek(0, 1)
+        try:
+            while True:
+                self._file.seek(pos)
                 runId, nbRows, nbCols, nxt = struct.unpack(
                     _FileDataHandler.HEADER_FORMAT, self._file.read(_FileDataAccessor.HEADER_SIZE)
                 )
-                nb += 1
-                while nxt != 0:
-                    self._file.seek(nxt)
-                    runId, nbRows, nbCols, nxt = struct.unpack(
-                        _FileDataHandler.HEADER_FORMAT, self._file.read(_FileDataAccessor.HEADER_SIZE)
-                    )
-                    nb += 1
-            except struct.error:
-                pass
+                runs.append((runId, nbRows, nbCols, nxt, pos))
+                if nxt == 0:
+                    break
+                pos = nxt
+        except struct.error:
+            pass
+        self._file.seek(filePos)
 
-            self._file.seek(pos)
-            self._fileInfo['len'] = nb
-        return self._fileInfo['len']
+        self._parentHandler._runIndexCache = (stamp, runs)
+        return runs
+
+    def __len__(self):
+        return len(self._getRunIndex())
 
     def __getitem__(self, key, forceArray=False):
         key = nutils.formatKey(key, self._nbDims, forceSz=True)
@@ -2538,35 +2957,24 @@ class _FileDataAccessor(nutils.Versioned):
 
         # Otherwise, read from file
         res = []
-        # Find the number of runs first
-        nbRuns = len(self)
+        runIndex = self._getRunIndex()
+        nbRuns = len(runIndex)
 
         if nbRuns == 0:
             raise IndexError(f'Cannot access data, nothing has been written to the file.')
 
-        # Read header
-        self._file.seek(self._dataStartPos)
-        runId, nbRows, nbCols, nxt = struct.unpack(
-            _FileDataHandler.HEADER_FORMAT, self._file.read(_FileDataAccessor.HEADER_SIZE)
-        )
-
         # Iterate through runs
         for ind in nutils.getSliceIds(key[0], sz=nbRuns):
-            while runId != ind:
-                if nxt == 0:
-                    break
-                pos = self._file.seek(nxt)
-                try:
-                    runId, nbRows, nbCols, nxt = struct.unpack(
-                        _FileDataHandler.HEADER_FORMAT, self._file.read(_FileDataAccessor.HEADER_SIZE)
-                    )
-                except struct.error:
-                    break
-            if runId != ind:
+            if not 0 <= ind < nbRuns or runIndex[ind][0] != ind:
                 if isinstance(key[0], numbers.Integral) or key[0].stop is not None:
                     raise IndexError(f'Run {ind} is not in the file.')
                 else:
                     break
+            runId, nbRows, nbCols, nxt, headerPos = runIndex[ind]
+            dataPos = headerPos + _FileDataAccessor.HEADER_SIZE
+            if self._parentHandler._fixedWidthRows:
+                res.append(self._readFixedWidthRun(ind, key, dataPos, nbRows, nbCols, nxt))
+                continue
             # handle the cases in which the file was only partially written and nbRows == 0
             if nxt == 0 and nbRows == 0:
                 warnings.warn(
@@ -2589,6 +2997,7 @@ class _FileDataAccessor(nutils.Versioned):
             res.append([])
             # Read actual data
             try:
+                self._file.seek(dataPos)
                 for t, line in self._readRows(rowInds, nbCols):
                     if self._saveTime:
                         res[-1].append(t)
@@ -2609,27 +3018,89 @@ class _FileDataAccessor(nutils.Versioned):
         mk = tuple(slice(None) if isinstance(k, slice) else 0 for k in key)
         return nutils.nparray(_sliceData(res, mk))
 
-    @nutils.Versioned._versionRange(belowOrEq=_FileDataHandler.FILE_FORMAT_OLDEST_VERSION)
-    def _readRows(self, rowInds, nbCols):
-        datFormat = _FileDataHandler.DATA_FORMAT[0] + _FileDataHandler.DATA_FORMAT[1] * nbCols
-        pos = self._file.seek(0, 1)
-        try:
-            for ti in rowInds:
-                self._file.seek(pos + ti * nbCols * _FileDataAccessor.DATA_SIZE)
-                if self._saveTime:
-                    t, *line = struct.unpack(
-                        _FileDataHandler.DATA_FORMAT, self._file.read(_FileDataAccessor.DATA_SIZE)
-                    )
-                else:
-                    t, *line = struct.unpack(
-                        datFormat, self._file.read(_FileDataAccessor.DATA_SIZE * nbCols)
-                    )
+    def _readFixedWidthRun(self, runInd, key, dataPos, nbRows, nbCols, nxt):
+        """Read the rows and columns of a single run stored as fixed-width float64 rows.
 
-                yield t, line
-        except (EOFError, struct.error):
-            raise _FileDataAccessor.UnexpectedEnd()
+        Return a numpy array of time points or a 2D array of values, depending on self._saveTime.
+        """
+        rowSize = numpy.dtype(_FileDataHandler.COLUMNAR_DTYPE).itemsize * nbCols
+        availableRows = max(0, os.path.getsize(self._fp) - dataPos) // rowSize
+        partial = nxt == 0 and nbRows == 0
+        if partial:
+            # Partially written run, the number of rows can be deduced from the file size
+            nbRows = availableRows
+            if nbRows > 0:
+                warnings.warn(
+                    f'Run {runInd} from file {self._fp} was not correctly written to file, the '
+                    f'corresponding data will be partial.'
+                )
+        elif nbRows > availableRows:
+            raise IndexError(
+                f'Could not load time slice {key[1]} of run {runInd} from {self._fp}.'
+                f' The file might be corrupted.'
+            )
+        if nbRows > 0:
+            block = numpy.memmap(
+                self._fp, dtype=_FileDataHandler.COLUMNAR_DTYPE, mode='r', offset=dataPos, shape=(nbRows, nbCols)
+            )
+        else:
+            block = numpy.zeros((0, nbCols), dtype=_FileDataHandler.COLUMNAR_DTYPE)
+
+        rowKey = key[1]
+        if isinstance(rowKey, numbers.Integral):
+            if not -nbRows <= rowKey < nbRows:
+                raise IndexError(f'Could not load time slice {rowKey} of run {runInd} from {self._fp}.')
+            rowKey = slice(rowKey % nbRows, rowKey % nbRows + 1)
+        if self._saveTime:
+            return numpy.array(block[rowKey, 0], dtype=float)
+
+        colKey = key[2]
+        if isinstance(colKey, numbers.Integral):
+            if not -(nbCols - 1) <= colKey < nbCols - 1:
+                raise IndexError(f'Column {colKey} is out of range.')
+            colKey = [colKey % (nbCols - 1)]
+        colInds = numpy.arange(nbCols - 1)[colKey]
+        values = numpy.array(block[rowKey][:, colInds + 1], dtype=float)
+
+        if not self._parentHandler._columnar:
+            return values
+        compObjInds = self._parentHandler._compObjInds
+        hasCompObjs = compObjInds is not None and any(ci in compObjInds for ci in colInds)
+        # NaN values can mark values that were stored in the side table
+        if not hasCompObjs and not numpy.isnan(values).any():
+            return values
+
+        # Load values that are not float64 from the side table
+        sideTable = None
+        if not partial:
+            try:
+                self._file.seek(dataPos + nbRows * rowSize)
+                sideTable, sideValues = pickle.load(self._file)
+            except (EOFError, pickle.UnpicklingError):
+                pass
+        if sideTable is None:
+            if hasCompObjs:
+                warnings.warn(
+                    f'Could not read the objects of run {runInd} from {self._fp}, returning None instead.'
+                )
+            sideValues = {}
+        if not hasCompObjs and len(sideValues) == 0:
+            return values
+
+        objValues = values.astype(object)
+        if hasCompObjs:
+            for j, ci in enumerate(colInds):
+                if ci in compObjInds:
+                    for i, objInd in enumerate(values[:, j]):
+                        objValues[i, j] = sideTable[int(objInd)] if sideTable is not None and objInd >= 0 else None
+        if len(sideValues) > 0:
+            rowPos = {ri: i for i, ri in enumerate(range(nbRows)[rowKey])}
+            colPos = {ci: j for j, ci in enumerate(colInds.tolist())}
+            for (ri, ci), v in sideValues.items():
+                if ri in rowPos and ci in colPos:
+                    objValues[rowPos[ri], colPos[ci]] = v
+        return objValues
 
-    @nutils.Versioned._versionRange(above=_FileDataHandler.FILE_FORMAT_OLDEST_VERSION)
     def _readRows(self, rowInds, nbCols):
         currti = -1
         try:
@@ -2652,13 +3123,14 @@ class _SQLiteDataAccessor:
     Data accessor for SQLite database
     """
 
-    def __init__(self, dbh, groupid, rsid, tabName, nbCols, saveTime=False):
+    def __init__(self, dbh, groupid, rsid, tabName, nbCols, saveTime=False, packed=False):
         self._dbh = dbh
         self._groupid = groupid
         self._rsid = rsid
         self._tabName = tabName
         self._nbCols = nbCols
         self._saveTime = saveTime
+        self._packed = packed
         self._nbDims = 2 if saveTime else 3
 
         self._colLst = [_SQLiteDataHandler.COLUMN_NAME_TEMPLATE.format(ci) for ci in range(self._nbCols)]
@@ -2672,6 +3144,18 @@ class _SQLiteDataAccessor:
                     f'SELECT time FROM {self._tabName} WHERE runid={ri} ORDER BY time'
                 ).fetchall()
                 res.append([timeDat[i][0] for i in nutils.getSliceIds(key[1], len(timeDat))])
+            elif self._packed:
+                allDat = self._dbh._conn.execute(
+                    f'SELECT {_SQLiteDataHandler.PACKED_COLUMN_NAME} FROM {self._tabName} '
+                    f'WHERE runid={ri} ORDER BY time'
+                ).fetchall()
+                # Decode all rows in a single pass
+                allDat = numpy.frombuffer(
+                    b''.join(row[0] for row in allDat), dtype=_SQLiteDataHandler.PACKED_DTYPE
+                ).reshape(len(allDat), self._nbCols)
+                rowInds = list(nutils.getSliceIds(key[1], len(allDat)))
+                colInds = list(nutils.getSliceIds(key[2], self._nbCols))
+                res.append(allDat[rowInds][:, colInds])
             else:
                 colStr = ','.join(self._colLst[i] for i in nutils.getSliceIds(key[2], self._nbCols))
                 allDat = self._dbh._conn.execute(
@@ -2718,6 +3202,8 @@ class _HDF5DataAccessor(nutils.Versioned):
         runs = self._handler._group[_HDF5DataHandler._RUNS_GROUP_NAME]
         for ri in nutils.getSliceIds(key[0], sz=len(self)):
             res.append([])
+            # Compound objects are read all at once for each run
+            objPos, objInds = [], []
             runGrp = runs[_HDF5DataHandler._RUN_GROUP_TEMPLATE.format(ri)]
             runTime = runGrp[_HDF5DataHandler._TIME_DSET_NAME]
             runData = runGrp[_HDF5DataHandler._DATA_DSET_NAME]
@@ -2735,8 +3221,9 @@ class _HDF5DataAccessor(nutils.Versioned):
                             remapKey = nutils.getSliceIds(remapKey, runData.shape[1])
                         for k in remapKey:
                             if k in self._compObjInds:
-                                obj = self._handler._dbh._compObjHandler.read(int(runData[i, k]))
-                                res[-1][-1].append(obj)
+                                objPos.append((len(res[-1]) - 1, len(res[-1][-1])))
+                                objInds.append(int(runData[i, k]))
+                                res[-1][-1].append(None)
                             else:
                                 res[-1][-1].append(runData[i, k])
                     else:
@@ -2744,9 +3231,19 @@ class _HDF5DataAccessor(nutils.Versioned):
                         if isinstance(remapKey, slice):
                             res[-1].append(runData[i, remapKey])
                         elif hasattr(remapKey, '__iter__'):
-                            res[-1].append([runData[i, j] for j in remapKey])
+                            # Read all columns at once, h5py requires increasing indices
+                            cols = numpy.asarray(remapKey, dtype=int) % runData.shape[1]
+                            if len(cols) > 0:
+                                uniqCols, inv = numpy.unique(cols, return_inverse=True)
+                                res[-1].append(list(runData[i, uniqCols][inv]))
+                            else:
+                                res[-1].append([])
                         else:
                             res[-1].append([runData[i, remapKey]])
+            if len(objInds) > 0:
+                objs = self._handler._dbh._compObjHandler.readMany(objInds)
+                for (ti, ci), obj in zip(objPos, objs):
+                    res[-1][ti][ci] = obj
         if forceArray:
             return nutils.nparray(res)
         mk = tuple(slice(None) if isinstance(k, slice) or hasattr(k, '__iter__') else 0 for k in key)
@@ -3086,8 +3583,19 @@ class SQLiteDBHandler(DatabaseHandler):
     :param commitFreq: How frequently the data should be committed to the database. For example,
         this value is set to 10 by default which means that every 10 saving events, the data will
         be committed. If a result selector is saved every 10ms, it means the data will be committed
-        to database every 100ms.
+        to database every 100ms. Saved rows are kept in memory until they are committed and are
+        then inserted in a single batch.
     :type commitFreq: int
+    :param journalMode: Value of the SQLite ``journal_mode`` pragma (e.g. ``'WAL'``), the SQLite
+        default is used if not given.
+    :type journalMode: Union[str, None]
+    :param synchronous: Value of the SQLite ``synchronous`` pragma (e.g. ``'NORMAL'``), the SQLite
+        default is used if not given.
+    :type synchronous: Union[str, int, None]
+    :param packRows: Whether each saved row should be stored as a single BLOB of packed float64
+        values instead of one SQL column per value. If set to None, rows are only packed when the
+        result selector has too many values to be saved in distinct columns.
+    :type packRows: Union[bool, None]
     :param \*\*kwargs: Transmitted to :py:func:`sqlite3.connect`, see
         `documentation <https://docs.python.org/3/library/sqlite3.html#sqlite3.connect>`__ for
         details
@@ -3150,27 +3658,47 @@ class SQLiteDBHandler(DatabaseHandler):
     _GROUP_TABLE_NAME = 'SimGroups'
     _DEFAULT_COMMIT_FREQ = 10
     _GROUP_TABLE_KEYS = ['groupid', 'timestamp', 'uniqueid', 'nbselectors']
+    # Default maximum number of columns in SQLite tables
+    _MAX_NB_COLUMNS = 2000
+    _JOURNAL_MODES = ['DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF']
+    _SYNCHRONOUS_MODES = ['OFF', 'NORMAL', 'FULL', 'EXTRA', 0, 1, 2, 3]
 
-    def __init__(self, path, *args, commitFreq=-1, **kwargs):
+    def __init__(self, path, *args, commitFreq=-1, journalMode=None, synchronous=None, packRows=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._path = path
+        self._dataHandlers = []
         # Only rank 0 should actually connect to the database
         if nsim.MPI._shouldWrite:
             self._conn = sqlite3.connect(path, *args, **kwargs)
             self._conn.row_factory = sqlite3.Row
             self._connected = True
+            self._setPragma('journal_mode', journalMode, SQLiteDBHandler._JOURNAL_MODES)
+            self._setPragma('synchronous', synchronous, SQLiteDBHandler._SYNCHRONOUS_MODES)
             self._createTables()
         else:
             self._conn = None
             self._connected = False
 
         self._commitFreq = commitFreq if commitFreq > 0 else SQLiteDBHandler._DEFAULT_COMMIT_FREQ
+        self._packRows = packRows
 
         self._groupId = None
 
+    def _setPragma(self, name, value, allowed):
+        """Set a SQLite pragma if value is not None"""
+        if value is None:
+            return
+        if isinstance(value, str):
+            value = value.upper()
+        if value not in allowed:
+            raise ValueError(f'Unsupported value for {name}: {value}, expected one of {allowed}.')
+        self._conn.execute(f'PRAGMA {name}={value};')
+
     def _close(self):
         """Commit and close the connection."""
         if self._connected:
+            for handler in self._dataHandlers:
+                handler._flush()
             self._conn.commit()
             self._conn.close()
             self._connected = False
@@ -3188,7 +3716,9 @@ class SQLiteDBHandler(DatabaseHandler):
 
     def _getDataHandler(self, rs):
         """Return a _DBDataHandler for ResultSelector rs."""
-        return _SQLiteDataHandler(rs, self, self._commitFreq)
+        handler = _SQLiteDataHandler(rs, self, self._commitFreq, packRows=self._packRows)
+        self._dataHandlers.append(handler)
+        return handler
 
     def _newGroup(self, sim, uid, selectors, **kwargs):
         """Initialize the database and add a new run group."""
@@ -3498,8 +4028,10 @@ class HDF5Handler(DatabaseHandler, nutils.Versioned):
         details. Most notably, compression-related argument can be set there.
     :type hdf5FileKwArgs: dict
     :param internalKwArgs: Keyword arguments specific to the handling of HDF5 files by STEPS, currently
-        only supports `maxFullLoadSize` which improves reading speed of lists or dictionaries saved in
-        result selectors by fully loading some datasets in memory if their size is below `maxFullLoadSize`.
+        supports `maxFullLoadSize` which improves reading speed of lists or dictionaries saved in
+        result selectors by fully loading some datasets in memory if their size is below `maxFullLoadSize`,
+        `maxBufferSize` which sets the maximum number of values that lists or dictionaries can
+        occupy in memory before being written to file, and `writeBufferSize` (see below).
     :type internalKwArgs: dict
 
     Handles reading and writing to an HDF5 file and enables the saving of result selectors to that
@@ -3554,6 +4086,14 @@ class HDF5Handler(DatabaseHandler, nutils.Versioned):
     Note that :py:class:`XDMFHandler` inherits from :py:class:`HDF5Handler` and generates `.xmf` files
     that point to the HDF5 files and can be read by data visualization software such as
     `Paraview <https://www.paraview.org/>`_. 
+
+    By default, each saved row is directly written to the HDF5 file. When a lot of rows are saved,
+    setting ``internalKwArgs=dict(writeBufferSize=N)`` makes result selectors keep up to ``N`` rows in
+    memory and write them as a single block. Datasets are then pre-sized when the number of time
+    points is known (``timePoints`` argument of :py:func:`steps.API_2.sim.Simulation.toSave`) and
+    grown geometrically otherwise, and the chunk shape is chosen to match blocks of ``N`` rows
+    (unless ``chunks`` is given in ``hdf5DatasetKwArgs``). Buffered rows are written upon data access,
+    at the start of a new run and when the file is closed.
     """
 
     _TIMESTAMP_ATTR_NAME = 'timestamp'
@@ -3585,7 +4125,13 @@ class HDF5Handler(DatabaseHandler, nutils.Versioned):
         self._shouldWrite = nsim.MPI._shouldWrite
         self._fileKwArgs = hdf5FileKwArgs
         self._dataSetKWargs = hdf5DatasetKwArgs
-        self._internalKwArgs = internalKwArgs
+        self._internalKwArgs = dict(internalKwArgs)
+        self._writeBufferSize = self._internalKwArgs.pop('writeBufferSize', 1)
+        if not isinstance(self._writeBufferSize, numbers.Integral) or self._writeBufferSize < 1:
+            raise ValueError(f'writeBufferSize should be a strictly positive integer, got {self._writeBufferSize}.')
+
+        # Data handlers that might need to flush buffered data before the file is closed
+        self._dataHandlers = []
 
         self._nbSavingRanks = None
 
@@ -3597,6 +4143,11 @@ class HDF5Handler(DatabaseHandler, nutils.Versioned):
     def _close(self):
         """Close the file"""
         if hasattr(self, '_file') and self._file is not None:
+            if self._file:
+                for handler in self._dataHandlers:
+                    handler._syncRun()
+                if self._compObjHandler is not None:
+                    self._compObjHandler.flush()
             self._file.close()
         for rnk, dbh in self._distribRankDBHs.items():
             if rnk != nsim.MPI._rank:
@@ -3667,7 +4218,9 @@ class HDF5Handler(DatabaseHandler, nutils.Versioned):
         """Return a _DBDataHandler for ResultSelector rs."""
         if groupNamePattern is None:
             groupNamePattern = HDF5Handler._RS_GROUP_NAME
-        return _HDF5DataHandler(self, rs, self._getRsHDFGroup(rs, groupNamePattern), version=self._version)
+        handler = _HDF5DataHandler(self, rs, self._getRsHDFGroup(rs, groupNamePattern), version=self._version)
+        self._dataHandlers.append(handler)
+        return handler
 
     def _checkSelectors(self, uid, selectors):
         """Check that selectors in the HDF5 file match the simulation selectors"""
@@ -4248,7 +4801,9 @@ class XDMFHandler(HDF5Handler):
 
     def _getDataHandler(self, rs, groupNamePattern=None):
         """Return a _DBDataHandler for ResultSelector rs."""
-        return _XDMFDataHandler(self, rs, self._getRsHDFGroup(rs, groupNamePattern))
+        handler = _XDMFDataHandler(self, rs, self._getRsHDFGroup(rs, groupNamePattern))
+        self._dataHandlers.append(handler)
+        return handler
 
     def _newGroup(self, sim, uid, selectors, **kwargs):
         """Initialize the file and add a new run group."""
@@ -23,17 +23,27 @@
 ###
 
 import atexit
+import collections
+import concurrent.futures
+import contextlib
 import copy
 import enum
+import gzip
 import heapq
 import importlib
+import json
 import math
+import multiprocessing
 import numbers
 import numpy
 import os
 import re
+import shutil
 import sys
+import tempfile
+import time
 import warnings
+import weakref
 
 from steps import stepslib
 
@@ -50,6 +60,8 @@ __all__ = [
     'SBMLSimulation',
     'SimPath',
     'MPI',
+    'SimulationProfile',
+    'SimulationEventStats',
     'VesiclePathReference',
     'VesicleReference',
     'RaftReference',
@@ -138,11 +150,19 @@ class _SimPathDescr:
         if inst is None:
             return self
 
-        res = [self._getPathValue(path) for path in inst]
+        batchCalls = self._getBatchCalls(inst, 'get')
+        if batchCalls is not None:
+            res = self._getBatchValues(batchCalls)
+        else:
+            res = [self._getPathValue(path) for path in inst]
 
         return res[0] if len(res) == 1 and flatten else res
 
     def __set__(self, inst, val):
+        batchCalls = self._getBatchCalls(inst, 'set')
+        if batchCalls is not None and self._setBatchValues(batchCalls, val):
+            return
+
         paths = list(path for path in inst)
         if len(paths) == 0:
             raise SimPathInvalidPath(f'Empty path.')
@@ -166,6 +186,123 @@ class _SimPathDescr:
             for path in paths:
                 self._setPathValue(path, val)
 
+    def _getBatchCalls(self, inst, prefix):
+        """
+        Return a list of (lst, path, func, indices, params, kwparams) tuples if all the paths in
+        inst can be handled by batch NP solver methods, None otherwise.
+
+        This is only possible when the locations of the path are element lists (e.g. from
+        sim.TETS(...)) that are all followed by the same single chain of objects, like in
+        sim.TETS(tets).S1.Count. 'path' is the path corresponding to the first element of 'lst'.
+        """
+        sim = inst._sim
+        if sim._isDistributed() or inst._hasRunTimeObject():
+            return None
+        locs = inst._elems.get(sim, {})
+        if len(locs) == 0 or not all(isinstance(lst, ngeom.RefList) and len(lst) > 0 for lst in locs):
+            return None
+        # Do not bother with batch calls for single values
+        if sum(len(lst) for lst in locs) < 2:
+            return None
+
+        calls = []
+        for lst, subs in locs.items():
+            chain = tuple()
+            while len(subs) > 0:
+                if len(subs) > 1:
+                    return None
+                (e, subs), = subs.items()
+                if (
+                    e._simPathCombinerClass() is not None
+                    or e._solverModifier() is not None
+                    or list(e._simPathWalkExpand()) != [e]
+                ):
+                    return None
+                chain += (e,)
+            path = (sim, lst[0]) + chain
+            if prefix == 'set' and type(path[-1])._solverSetValue is not nutils.SolverPathObject._solverSetValue:
+                return None
+
+            funcName = prefix + 'Batch' + ''.join(e._solverStr() for e in path[1:]) + self.name + 'sNP'
+            func = getattr(sim.stepsSolver, funcName, None)
+            if func is None:
+                return None
+            params = sum((e._solverId() for e in chain), tuple())
+            kwparams = {}
+            for e in path[1:]:
+                kwparams.update(e._solverKeywordParams())
+            # Copy the indices, the solver methods do not accept read-only arrays
+            indices = numpy.array(lst._getIdxArray(), dtype=ngeom.INDEX_DTYPE)
+            calls.append((lst, path, func, indices, params, kwparams))
+
+        return calls
+
+    def _getBatchValues(self, calls):
+        """Return the list of values corresponding to batch calls from _getBatchCalls."""
+        res = []
+        for _, _, func, indices, params, kwparams in calls:
+            vals = numpy.zeros(len(indices), dtype=numpy.float64)
+            try:
+                func(indices, *params, vals, **kwparams)
+            except Exception as e:
+                raise SolverCallError(f'Exception raised during call to solver: {e}')
+            res += vals.tolist()
+        return res
+
+    def _setBatchValues(self, calls, val):
+        """
+        Set values with batch calls from _getBatchCalls. Return False without setting anything if
+        val cannot be set in batch, True otherwise. Parameters are only recorded for scalar values,
+        setting an array of values removes the previous record for the list.
+        """
+        if (
+            isinstance(val, (nmodel.XDepFunc, nutils.NamedObject, nutils.Params))
+            or hasattr(val, '__call__')
+        ):
+            return False
+
+        n = sum(len(indices) for _, _, _, indices, _, _ in calls)
+        allParams = []
+        if hasattr(val, '__iter__') and not isinstance(val, (str, nutils.Parameter)):
+            # Potentially different values for each element
+            arr = numpy.asarray(val)
+            if arr.ndim != 1 or arr.dtype.kind not in 'biuf':
+                return False
+            if len(arr) != n:
+                raise SimPathInvalidPath(
+                    f'Path covers {n} elements while the values that it should be assigned '
+                    f'contain {len(arr)} elements.'
+                )
+            start = 0
+            for lst, path, *_ in calls:
+                _, v = self._getParamAndValue(path, arr[start:start + len(lst)])
+                allParams.append((None, v))
+                start += len(lst)
+        else:
+            if isinstance(val, nutils.Parameter):
+                if not isinstance(val.value, numbers.Number):
+                    return False
+            elif not isinstance(val, numbers.Number):
+                return False
+            param, v = self._getParamAndValue(calls[0][1], val)
+            allParams = [(param, v)] * len(calls)
+
+        for (lst, path, func, indices, params, kwparams), (param, v) in zip(calls, allParams):
+            # Keep track of scalar values that were set with a Parameter, once for the whole list
+            pathStr = '.'.join(str(e) for e in (lst,) + path[2:]) + f'.{self.name}'
+            if param is not None:
+                path[0]._setParameter(pathStr, param)
+            else:
+                path[0]._parameters.pop(pathStr, None)
+
+            vals = numpy.empty(len(indices), dtype=numpy.float64)
+            vals[:] = v
+            try:
+                func(indices, *params, vals, **kwparams)
+            except Exception as e:
+                raise SolverCallError(f'Exception raised during call to solver: {e}')
+        return True
+
     def _getFinalPathsFunction(self, finalPaths, prefix='get'):
         """
         Return a function that, when called with no arguments, generates the values associated
@@ -224,7 +361,28 @@ class _SimPathDescr:
             raise Exception(f'Cannot set simulation paths that involve value combining.')
 
         val = self._processValue(path, val)
+        param, val = self._getParamAndValue(path, val)
 
+        # Keep track of values that were set with a Parameter
+        pathStr = '.'.join(str(v) for v in path[1:]) + f'.{self.name}'
+        path[0]._setParameter(pathStr, param)
+
+        fun, params, kwparams = self._getFunction('set', path)
+        if isinstance(val, nutils.Params):
+            args, kwargs = val.args, val.kwargs
+        else:
+            args = [path[-1]._solverSetValue(self.name, val)]
+            kwargs = {}
+        try:
+            fun(*params, *args, **kwparams, **kwargs)
+        except Exception as e:
+            raise SolverCallError(f'Exception raised during call to solver: {e}')
+
+    def _getParamAndValue(self, path, val):
+        """
+        Return a Parameter corresponding to "val" and the value, in the units expected by the
+        solver, that should be set for path "path".
+        """
         # Parameter checks and potential conversions
         if isinstance(val, nutils.Parameter):
             param = val
@@ -251,20 +409,7 @@ class _SimPathDescr:
             else:
                 # "Default" behavior
                 val = param.value
-        # Keep track of values that were set with a Parameter
-        pathStr = '.'.join(str(v) for v in path[1:]) + f'.{self.name}'
-        path[0]._setParameter(pathStr, param)
-
-        fun, params, kwparams = self._getFunction('set', path)
-        if isinstance(val, nutils.Params):
-            args, kwargs = val.args, val.kwargs
-        else:
-            args = [path[-1]._solverSetValue(self.name, val)]
-            kwargs = {}
-        try:
-            fun(*params, *args, **kwparams, **kwargs)
-        except Exception as e:
-            raise SolverCallError(f'Exception raised during call to solver: {e}')
+        return param, val
 
     def _getFunction(self, prefix, path):
         """
@@ -1579,53 +1724,148 @@ class MPI:
             return getattr(stepslib, nutils._CYTHON_PREFIX + name)
 
 
+def _localCheckpointPath(name):
+    """Return the path of the checkpoint file written by the current rank"""
+    return name + f'_{MPI._rank}' if MPI._nhosts > 1 else name
+
+
 class _SimulationCheckpointer:
     """Class that manages the auto checkpointing
 
-    Uses the same mechanism (i.e. the _nextSave heapq in Simulation) as result selectors.
-    It only implement the ResultSelector methods called by Simulation.run() and Simulation.newRun().
+    Checkpoints are scheduled like result selectors: Simulation.run() merges the times returned by
+    _getSaveTimesUntil() with the ones of result selectors and Simulation.step() uses the _nextSave
+    heapq. It only implements the ResultSelector methods called by Simulation.run(),
+    Simulation.step() and Simulation.newRun().
+
+    Checkpoints are first written to a staging file and then moved to their final path with an
+    atomic rename, so that a complete checkpoint is always available on disk. In background mode,
+    the staging file is written in a RAM backed directory and the compression and disk write are
+    done by a single writer thread. Errors raised by the writer thread are raised at the end of the
+    next call to Simulation.run() or Simulation.step() that follows the end of the write, or when
+    the interpreter exits.
     """
 
+    _DEFAULT_STAGING_DIR = '/dev/shm'
+
+    # Checkpointers that might have a pending background write when the interpreter exits
+    _instances = weakref.WeakSet()
+
     def __init__(self, sim):
         self._sim = sim
         self._period = math.inf
         self._prefix = ''
-        self._onlyLast = False
+        self._keep = None
+        self._background = False
+        self._compress = False
+        self._stagingDir = None
+        self._results = None
 
         self._nextTime = math.inf
         self._tind = 0
         self._startTime = 0
-        self._lastName = None
+        self._savedPaths = collections.deque()
 
-    def setup(self, time, period, prefix, onlyLast):
+        self._executor = None
+        self._pending = None
+
+        _SimulationCheckpointer._instances.add(self)
+
+    def setup(self, t, period, prefix, keep, background, compress, stagingDir, results):
+        self.wait()
         if period is None:
             self._period = math.inf
             self._nextTime = math.inf
             self._startTime = math.inf
         else:
             self._period = period
-            self._startTime = time
-            self._nextTime = time
+            self._startTime = t
+            self._nextTime = t
         self._prefix = prefix
-        self._onlyLast = onlyLast
+        self._keep = keep
+        self._background = background
+        self._compress = compress
+        if stagingDir is None and background and os.access(self._DEFAULT_STAGING_DIR, os.W_OK):
+            stagingDir = self._DEFAULT_STAGING_DIR
+        self._stagingDir = stagingDir
+        self._results = results
         self._tind = 0
-        self._lastName = None
+        self._savedPaths.clear()
+        if background and period is not None:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        elif self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def wait(self):
+        """Wait for the pending background write, if any, and raise its exceptions"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def _checkErrors(self):
+        """Raise the exceptions of the pending background write if it is already completed"""
+        if self._pending is not None and self._pending.done():
+            self.wait()
 
     def _newRun(self):
         self._tind = -1
         self._updateNextSaveTime()
 
-    def _save(self, time, _):
-        newName = f'{self._prefix}_{self._sim._runId}_{time}_{self._sim._solverStr}_cp'
-        self._sim.checkpoint(newName)
-        if self._onlyLast and self._lastName is not None:
-            if MPI._nhosts > 1:
-                os.remove(self._lastName + f'_{MPI._rank}')
-            else:
-                os.remove(self._lastName)
-        self._lastName = newName
+    def _save(self, t, _):
+        newName = f'{self._prefix}_{self._sim._runId}_{t}_{self._sim._solverStr}_cp'
+        if self._stagingDir is not None:
+            stagingName = os.path.join(
+                self._stagingDir, f'{os.getpid()}_{os.path.basename(newName)}.staging'
+            )
+        else:
+            stagingName = newName + '.staging'
+
+        t0 = time.perf_counter()
+        # Only one checkpoint can be in flight at a time
+        self.wait()
+        self._sim.checkpoint(stagingName)
+        stallTime = time.perf_counter() - t0
+
+        stagingPath = _localCheckpointPath(stagingName)
+        finalPath = _localCheckpointPath(newName) + ('.gz' if self._compress else '')
+        size = os.path.getsize(stagingPath)
+
+        if self._background:
+            self._pending = self._executor.submit(self._write, stagingPath, finalPath)
+        else:
+            self._write(stagingPath, finalPath)
+            stallTime = time.perf_counter() - t0
+
+        if self._results is not None:
+            self._results.save([stallTime, size])
         self._updateNextSaveTime()
 
+    def _write(self, stagingPath, finalPath):
+        """Move a staged checkpoint to its final path and remove the checkpoints that should not
+        be retained
+        """
+        tmpPath = finalPath + '.part'
+        if self._compress:
+            with open(stagingPath, 'rb') as src, gzip.open(tmpPath, 'wb', compresslevel=1) as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(stagingPath)
+        else:
+            shutil.move(stagingPath, tmpPath)
+        os.replace(tmpPath, finalPath)
+
+        self._savedPaths.append(finalPath)
+        if self._keep is not None:
+            while len(self._savedPaths) > self._keep:
+                os.remove(self._savedPaths.popleft())
+
+    def _getSaveTimesUntil(self, t, maxNb):
+        """Return at most maxNb of the next save times that are lower or equal to t"""
+        if self._nextTime > t:
+            return numpy.empty(0)
+        times = self._startTime + numpy.arange(self._tind, self._tind + maxNb) * self._period
+        return times[times <= t]
+
     def _updateNextSaveTime(self):
         self._tind += 1
         if self._period == math.inf:
@@ -1634,6 +1874,272 @@ class _SimulationCheckpointer:
             self._nextTime = self._startTime + self._tind * self._period
 
 
+def _waitCheckpointers():
+    """Complete the pending background checkpoint writes before the interpreter exits"""
+    for checkpointer in list(_SimulationCheckpointer._instances):
+        checkpointer.wait()
+
+
+atexit.register(_waitCheckpointers)
+
+
+# Simulation and run parameters of the ensemble being run, inherited by forked workers
+_ENSEMBLE_PARAMS = None
+
+# Data handlers of the parent process, only set in ensemble workers
+_ENSEMBLE_PARENT_HANDLERS = None
+
+
+def _initEnsembleWorker():
+    """Redirect the saving of result selectors to memory in an ensemble worker process"""
+    global _ENSEMBLE_PARENT_HANDLERS
+    sim = _ENSEMBLE_PARAMS[0]
+    # Keep references to the parent's data handlers so that they are never finalized by the worker
+    _ENSEMBLE_PARENT_HANDLERS = [rs._dataHandler for rs in sim._resultSelectors]
+    for rs in sim._resultSelectors:
+        rs._dataHandler = nsaving._MemoryDataHandler(rs)
+
+
+def _runEnsembleWorker(args):
+    """Run a single realisation in an ensemble worker process and return the saved rows"""
+    sim, seed, t, initFunc = _ENSEMBLE_PARAMS
+    ind, runId, stream = args
+    sim._runId = runId - 1
+    sim._runEnsembleRealisation(seed, stream, ind, t, initFunc)
+    runRows = []
+    for rs in sim._resultSelectors:
+        runRows.append((rs._dataHandler.saveTime[-1], rs._dataHandler.saveData[-1]))
+        rs._dataHandler.clear()
+    return runRows
+
+
+@nutils.FreezeAfterInit
+class SimulationProfile:
+    """Profiling data collected by the native STEPS region tracker
+
+    Objects of this class should not be created by the user, they are returned by
+    :py:func:`Simulation.profile`. The data is only available after the end of the ``with``
+    block.
+
+    Instrumented regions are declared in the solvers (e.g. ``Tetexact``, ``TetOpSplit``, and the
+    SSA, diffusion and E-field operators of ``DistTetOpSplit``), solvers without instrumentation
+    do not report any region.
+    """
+
+    def __init__(self, trace):
+        self._trace = trace
+
+        self.regions = {}
+        """Dictionary mapping region names to their statistics
+
+        Each value is a dictionary with the following keys:
+
+        - ``'count'``: the number of times the region was executed on the current rank
+        - ``'time'``: total wall time spent in the region (s)
+        - ``'memory'``: high watermark memory at the end of the region (MB)
+        - ``'memoryDelta'``: total increase of the peak memory usage in the region (MB)
+
+        ``'time'``, ``'memory'``, and ``'memoryDelta'`` are dictionaries with ``'min'``, ``'max'``,
+        and ``'avg'`` keys that hold the corresponding statistic across MPI ranks.
+
+        :type: Dict[str, dict]
+        """
+
+        self.events = []
+        """List of (name, start, duration) tuples for each region execution on the current rank
+
+        Only filled if tracing was enabled, times are in microseconds and start times are
+        relative to the beginning of the ``with`` block.
+
+        :type: List[Tuple[str, float, float]]
+        """
+
+    def _start(self):
+        if stepslib._py_profilingEnabled():
+            raise Exception('Profiling is already enabled, profile() blocks cannot be nested.')
+        stepslib._py_profilingReset()
+        stepslib._py_profilingEnable(True, self._trace)
+
+    def _stop(self):
+        stepslib._py_profilingEnable(False, False)
+        self.regions = {}
+        for stats in stepslib._py_profilingStats():
+            name = stats.pop('name')
+            self.regions[name] = stats
+        self.events = stepslib._py_profilingEvents()
+
+    def toJSON(self, path):
+        """Write the region statistics to a JSON file
+
+        :param path: The file path
+        :type path: str
+
+        When using MPI, only rank 0 writes the file since statistics were already reduced across
+        ranks.
+        """
+        if MPI._shouldWrite:
+            with open(path, 'w') as f:
+                json.dump(dict(regions=self.regions, nhosts=MPI._nhosts), f, indent=2)
+
+    def toChromeTrace(self, path):
+        """Write the recorded region executions to a Chrome trace file
+
+        :param path: The file path
+        :type path: str
+
+        The file can be opened with ``chrome://tracing`` or https://ui.perfetto.dev. It requires
+        the profiling to be done with ``trace=True``. When using MPI, each rank writes its own
+        file, with the rank appended to the path (``path_rank``).
+        """
+        if not self._trace:
+            raise Exception('Chrome traces require the profiling to be started with trace=True.')
+        if MPI._nhosts > 1:
+            path = f'{path}_{MPI._rank}'
+        events = [
+            dict(name=name, ph='X', ts=start, dur=duration, pid=MPI._rank, tid=0)
+            for name, start, duration in self.events
+        ]
+        with open(path, 'w') as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit='ms'), f)
+
+
+@nutils.FreezeAfterInit
+class SimulationEventStats:
+    """Per kproc type event accounting collected by SSA solvers
+
+    Objects of this class should not be created by the user, they are returned by
+    :py:func:`Simulation.eventStats`. The data is only available after the end of the ``with``
+    block.
+
+    Counters are kept for each group of kprocs sharing the same kind (``'Reac'``, ``'Diff'``,
+    ``'SReac'``, ``'SDiff'``, ``'VDepSReac'``, or ``'GHKcurr'``), name and location (compartment
+    or patch name). Each group is described by a dictionary with the following keys:
+
+    - ``'events'``: number of times a kproc of the group was selected and applied by the SSA
+    - ``'updates'``: number of propensity updates
+    - ``'updateTime'``: time spent updating propensities (s)
+    - ``'selectTime'``: time spent selecting the next kproc, attributed to the selected kproc (s)
+
+    With ``TetOpSplit``, diffusion is handled by the operator splitting and is not counted in
+    ``'events'``, only its propensity updates are recorded.
+    """
+
+    _COUNTERS = ['events', 'updates', 'updateTime', 'selectTime']
+
+    def __init__(self, solver):
+        self._solver = solver
+
+        self.entries = []
+        """List of per (kind, name, location) statistics on the current rank
+
+        Each element is a dictionary with ``'kind'``, ``'name'``, and ``'location'`` keys in
+        addition to the counters.
+
+        :type: List[dict]
+        """
+
+        self.ranks = []
+        """List of counters summed over all kprocs for each MPI rank
+
+        :type: List[dict]
+        """
+
+        self._allEntries = []
+
+    def _start(self):
+        self._solver.resetEventStats()
+        self._solver.enableEventStats(True)
+
+    def _stop(self):
+        self._solver.enableEventStats(False)
+        self.entries = self._solver.getEventStats()
+        if MPI._nhosts > 1:
+            # Only import mpi4py when necessary
+            import mpi4py.MPI
+            allEntries = mpi4py.MPI.COMM_WORLD.allgather(self.entries)
+        else:
+            allEntries = [self.entries]
+        self._allEntries = allEntries
+        self.ranks = [self._aggregate(entries, lambda e: None).get(None, self._zeros()) for entries in allEntries]
+
+    @classmethod
+    def _zeros(cls):
+        return {c: 0 for c in cls._COUNTERS}
+
+    @classmethod
+    def _aggregate(cls, entries, keyFunc):
+        res = {}
+        for entry in entries:
+            agg = res.setdefault(keyFunc(entry), cls._zeros())
+            for c in cls._COUNTERS:
+                agg[c] += entry[c]
+        return res
+
+    def _allRanksEntries(self):
+        return [entry for entries in self._allEntries for entry in entries]
+
+    def byName(self):
+        """Return the counters summed across locations and ranks for each kproc name
+
+        :returns: A dictionary mapping ``(kind, name)`` tuples to counters
+        :rtype: Dict[Tuple[str, str], dict]
+        """
+        return self._aggregate(self._allRanksEntries(), lambda e: (e['kind'], e['name']))
+
+    def byLocation(self):
+        """Return the counters summed across kprocs and ranks for each compartment or patch
+
+        :returns: A dictionary mapping location names to counters
+        :rtype: Dict[str, dict]
+        """
+        return self._aggregate(self._allRanksEntries(), lambda e: e['location'])
+
+    def report(self, n=10, sortBy='events'):
+        """Return a text report of the kprocs with the highest counters
+
+        :param n: Maximum number of kprocs to list
+        :type n: int
+        :param sortBy: The counter used to sort kprocs, one of ``'events'``, ``'updates'``,
+            ``'updateTime'``, or ``'selectTime'``
+        :type sortBy: str
+
+        :returns: The report, with one line per (kind, name) and one line per rank
+        :rtype: str
+        """
+        if sortBy not in self._COUNTERS:
+            raise ValueError(f'Expected one of {self._COUNTERS}, got {sortBy}.')
+        byName = sorted(self.byName().items(), key=lambda kv: kv[1][sortBy], reverse=True)
+        totEvents = sum(v['events'] for _, v in byName)
+        lines = [f'{"Kind":<10}{"Name":<30}{"Events":>14}{"%":>8}{"Updates":>14}{"Upd. (s)":>12}{"Sel. (s)":>12}']
+        for (kind, name), v in byName[:n]:
+            frac = 100 * v['events'] / totEvents if totEvents > 0 else 0
+            lines.append(
+                f'{kind:<10}{name:<30}{v["events"]:>14}{frac:>8.2f}{v["updates"]:>14}'
+                f'{v["updateTime"]:>12.4g}{v["selectTime"]:>12.4g}'
+            )
+        if len(self.ranks) > 1:
+            lines.append('')
+            lines.append(f'{"Rank":<40}{"Events":>14}{"":>8}{"Updates":>14}{"Upd. (s)":>12}{"Sel. (s)":>12}')
+            for rank, v in enumerate(self.ranks):
+                lines.append(
+                    f'{rank:<40}{v["events"]:>14}{"":>8}{v["updates"]:>14}'
+                    f'{v["updateTime"]:>12.4g}{v["selectTime"]:>12.4g}'
+                )
+        return '\n'.join(lines)
+
+    def toJSON(self, path):
+        """Write the statistics of all ranks to a JSON file
+
+        :param path: The file path
+        :type path: str
+
+        When using MPI, only rank 0 writes the file.
+        """
+        if MPI._shouldWrite:
+            with open(path, 'w') as f:
+                json.dump(dict(ranks=self._allEntries), f, indent=2)
+
+
 @nutils.FreezeAfterInit
 class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedParameterizedObject):
     r"""The main simulation class
@@ -1767,6 +2273,8 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
                     rs._updateNextSaveTime()
                 oldSave = heapq.heapreplace(self._nextSave, (rs._nextTime, rs))
 
+        self._checkpointer._checkErrors()
+
     def run(self, t):
         """Run the simulation until a given time
 
@@ -1784,21 +2292,25 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
 
         self._discardPastSaves(currT)
 
-        while len(self._nextSave) > 0 and self._nextSave[0][0] <= t:
-            # Do not run if the time is identical to current time
-            if self._nextSave[0][0] > currT:
-                self.stepsSolver.run(self._nextSave[0][0])
-                currT = self._nextSave[0][0]
-
-            oldSave = self._nextSave[0]
-            while self._nextSave[0][0] == oldSave[0]:
-                rstime, rs = self._nextSave[0]
-                rs._save(rstime, rstime)
-                oldSave = heapq.heapreplace(self._nextSave, (rs._nextTime, rs))
+        # The save schedule updates the next save times of events, the heap needs to be rebuilt
+        # even if the run is interrupted
+        try:
+            for rstime, events in self._getSaveSchedule(t):
+                # Do not run if the time is identical to current time
+                if rstime > currT:
+                    self.stepsSolver.run(rstime)
+                    currT = rstime
+
+                for rs in events:
+                    rs._save(rstime, rstime)
+        finally:
+            self._initNextSave()
 
         if t > currT:
             self.stepsSolver.run(t)
 
+        self._checkpointer._checkErrors()
+
     def newRun(self, reset=True):
         """Reset the solver and signal the start of a new run
 
@@ -1823,6 +2335,157 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
         # Update data saving structures
         self._newRun()
 
+    def runEnsemble(self, nRuns, t, initFunc=None, workers=None):
+        """Run several independent realisations of the simulation
+
+        Each realisation is equivalent to calling :py:func:`newRun`, setting the initial state with
+        ``initFunc`` and calling :py:func:`run`. The realisations are distributed to ``workers``
+        processes and the data saved by their result selectors is sent back to the result
+        selectors of this simulation, that save it in the usual way (memory, file or database). Runs
+        are saved in order, as if they had all been run sequentially in this process.
+
+        Each realisation uses its own random number stream (see
+        :py:func:`steps.API_2.rng.RNG.spawn`), the saved data does thus not depend on the
+        number of workers.
+
+        :param nRuns: Number of realisations
+        :type nRuns: int
+        :param t: Run each realisation until this time (in seconds)
+        :type t: float
+        :param initFunc: Function called with the simulation and the index of the realisation
+            (between 0 and ``nRuns - 1``) as parameters, after the solver was reset. It should
+            be used to set the initial state of each realisation.
+        :type initFunc: Callable[[:py:class:`Simulation`, int], None]
+        :param workers: Number of worker processes, defaults to the number of CPUs. If it is
+            1, all realisations are run in this process.
+        :type workers: int
+
+        Usage::
+
+            def init(sim, i):
+                sim.comp.S1.Count = 100
+
+            sim.toSave(rs1, rs2, dt=0.01)
+            with HDF5Handler(dbPath) as hdf:
+                sim.toDB(hdf, 'MySimulation')
+                sim.runEnsemble(1000, 10, init, workers=8)
+
+        .. note::
+            Worker processes are created by forking the current process so that they inherit
+            the simulation, ``initFunc`` thus does not need to be picklable. On platforms on which
+            forking is not available, all realisations are run in this process. Modifications made
+            to the simulation in worker processes, apart from saved data, are not transmitted back
+            to this process; in particular the state of the solver is unchanged after the call
+            when more than one worker is used.
+
+        .. note::
+            This method is only available with serial solvers.
+        """
+        global _ENSEMBLE_PARAMS
+        if self._solverStr not in Simulation.SERIAL_SOLVERS:
+            raise Exception(f'runEnsemble is only available for serial solvers.')
+        if self.rng is None:
+            raise Exception(f'runEnsemble requires the simulation to have a random number generator.')
+        if not isinstance(nRuns, numbers.Integral) or nRuns < 0:
+            raise ValueError(f'Expected a positive number of runs, got {nRuns} instead.')
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, nRuns)
+        if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            warnings.warn(f'Forking processes is not available, all runs will be done in the main process.')
+            workers = 1
+
+        seed = self.rng.getSeed()
+        runs = [(i, self._runId + 1 + i, stream) for i, stream in enumerate(self.rng._spawnStreams(nRuns))]
+        rngState = self.rng.getState()
+        try:
+            if workers <= 1:
+                for ind, _, stream in runs:
+                    self._runEnsembleRealisation(seed, stream, ind, t, initFunc)
+            else:
+                _ENSEMBLE_PARAMS = (self, seed, t, initFunc)
+                with multiprocessing.get_context('fork').Pool(workers, _initEnsembleWorker) as pool:
+                    for runRows in pool.imap(_runEnsembleWorker, runs):
+                        self._newRun()
+                        for rs, (times, rows) in zip(self._resultSelectors, runRows):
+                            for rstime, row in zip(times, rows):
+                                rs._dataHandler.save(rstime, row)
+        finally:
+            _ENSEMBLE_PARAMS = None
+            self.rng.setState(rngState)
+
+    def _runEnsembleRealisation(self, seed, stream, ind, t, initFunc):
+        """Run a single realisation of an ensemble, using random number stream stream"""
+        self.rng.initialize(seed, stream)
+        self.newRun()
+        if initFunc is not None:
+            initFunc(self, ind)
+        self.run(t)
+
+    @contextlib.contextmanager
+    def profile(self, trace=False):
+        """Context manager for profiling the simulation
+
+        :param trace: Whether each execution of instrumented regions should be recorded, this is
+            required for exporting Chrome traces.
+        :type trace: bool
+
+        :returns: An object holding the profiling data, available after the end of the ``with``
+            block.
+        :rtype: :py:class:`SimulationProfile`
+
+        The native STEPS region tracker is enabled at runtime for the duration of the ``with``
+        block, it does not require STEPS to be built with profiling support::
+
+            with sim.profile(trace=True) as prof:
+                sim.run(1)
+
+            prof.regions            # Per region time, call counts and memory usage
+            prof.toJSON('profile.json')
+            prof.toChromeTrace('profile_trace.json')
+
+        When using MPI, all ranks need to enter and exit the ``with`` block since statistics are
+        reduced across ranks at the end of the block.
+        """
+        prof = SimulationProfile(trace)
+        prof._start()
+        try:
+            yield prof
+        finally:
+            prof._stop()
+
+    @contextlib.contextmanager
+    def eventStats(self):
+        """Context manager for per reaction and diffusion event accounting
+
+        :returns: An object holding the event statistics, available after the end of the
+            ``with`` block.
+        :rtype: :py:class:`SimulationEventStats`
+
+        Only ``'Tetexact'`` and ``'TetOpSplit'`` solvers support event accounting::
+
+            with sim.eventStats() as stats:
+                sim.run(1)
+
+            print(stats.report(n=10))
+            stats.byName()          # Counters per (kind, name)
+            stats.byLocation()      # Counters per compartment or patch
+            stats.ranks             # Counters per MPI rank
+
+        When using MPI, all ranks need to enter and exit the ``with`` block since statistics are
+        gathered across ranks at the end of the block.
+        """
+        if not hasattr(self.stepsSolver, 'enableEventStats'):
+            raise NotImplementedError(
+                f'Event accounting is not available with the {self._solverStr} solver.'
+            )
+        stats = SimulationEventStats(self.stepsSolver)
+        stats._start()
+        try:
+            yield stats
+        finally:
+            stats._stop()
+
     def toSave(self, *selectors, dt=None, timePoints=None):
         """Add result selectors to the simulation
 
@@ -1898,7 +2561,8 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
             rs._toDB(dbh)
         return group if MPI._shouldWrite else None
 
-    def autoCheckpoint(self, period, prefix='', onlyLast=False):
+    def autoCheckpoint(self, period, prefix='', onlyLast=False, keep=None, background=False,
+                       compress=False, stagingDir=None, results=None):
         """Activates automatic checkpointing
 
         After this method has been called, all subsequent calls to :py:func:`step` or
@@ -1913,7 +2577,34 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
             the pattern ``'{prefix}_{runId}_{time}_{solver}_cp'``.
         :type prefix: str
         :param onlyLast: If True, remove previous checkpoints when a new chekpoint is being saved.
+            Equivalent to ``keep=1``.
         :type onlyLast: bool
+        :param keep: The number of most recent checkpoints that should be retained, None to keep
+            all of them.
+        :type keep: int or None
+        :param background: If True, the simulation is only blocked while the solver state is
+            written to the staging directory, the compression and disk write are done in a
+            background thread.
+        :type background: bool
+        :param compress: If True, checkpoints are compressed with gzip and ``'.gz'`` is appended to
+            their file names. They can be restored with :py:func:`restore` without decompressing
+            them first.
+        :type compress: bool
+        :param stagingDir: Directory in which the solver state is written before being moved to
+            its final path. Defaults to ``'/dev/shm'`` in background mode if it is available and to
+            the checkpoint directory otherwise.
+        :type stagingDir: str or None
+        :param results: Optional result selector in which the stall time and size of each
+            checkpoint are saved.
+        :type results: :py:class:`steps.API_2.saving.CheckpointResults`
+
+        Checkpoints are always written to a temporary file first and atomically renamed so that
+        an interrupted checkpoint never replaces a complete one. In background mode, at most one
+        checkpoint can be pending: if the previous one is still being written when a new
+        checkpoint is due, the simulation waits for it to complete. Errors that occur during a
+        background write are raised by the first call to :py:func:`run` or :py:func:`step` that
+        returns after the write ended. Calling ``sim.autoCheckpoint(None)`` waits for the pending
+        write and stops the background thread.
         """
         if not isinstance(period, numbers.Number) and period is not None:
             raise TypeError(f'Expected a number or None, got {period} instead.')
@@ -1921,7 +2612,17 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
             raise TypeError(f'Expected a string for prefix parameter, got {prefix} instead.')
         if period is not None and period <= 0:
             raise ValueError(f'The auto checkpoint period needs to be strictly positive, got {period}.')
-        self._checkpointer.setup(self.Time, period, prefix, onlyLast)
+        if onlyLast:
+            if keep not in (None, 1):
+                raise ValueError(f'onlyLast=True is incompatible with keep={keep}.')
+            keep = 1
+        if keep is not None and (not isinstance(keep, numbers.Integral) or keep < 1):
+            raise ValueError(f'The number of retained checkpoints needs to be at least 1, got {keep}.')
+        if results is not None and not isinstance(results, nsaving.CheckpointResults):
+            raise TypeError(f'Expected a CheckpointResults object, got {results} instead.')
+        self._checkpointer.setup(
+            self.Time, period, prefix, keep, background, compress, stagingDir, results
+        )
         if self._nextSave is not None:
             self._initNextSave()
 
@@ -1975,6 +2676,41 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
         self._nextSave = [(rs._nextTime, rs) for rs in eventLst]
         heapq.heapify(self._nextSave)
 
+    # Maximum number of save times that are computed at once for each saving event
+    _SAVE_SCHEDULE_CHUNK_SIZE = 4096
+
+    def _getSaveSchedule(self, t):
+        """Yield (time, events) tuples for all saving events until time t, in chronological order
+
+        Save times of all events are computed in chunks and merged, events that need to be saved at
+        the same time are grouped together, in the order in which they were added.
+        """
+        events = self._resultSelectors + [self._checkpointer]
+        maxNb = Simulation._SAVE_SCHEDULE_CHUNK_SIZE
+        while True:
+            # Only the times up to the horizon are known for all events
+            horizon = t
+            allTimes = []
+            for ev in events:
+                times = ev._getSaveTimesUntil(t, maxNb)
+                if len(times) == maxNb:
+                    horizon = min(horizon, times[-1])
+                allTimes.append(times)
+            lens = [len(times) for times in allTimes]
+            if sum(lens) == 0:
+                return
+
+            allTimes = numpy.concatenate(allTimes)
+            evInds = numpy.repeat(numpy.arange(len(events)), lens)
+            order = numpy.argsort(allTimes, kind='stable')
+            allTimes = allTimes[order]
+            nb = numpy.searchsorted(allTimes, horizon, side='right')
+            tpnts, starts = numpy.unique(allTimes[:nb], return_index=True)
+            bounds = starts.tolist() + [nb]
+            evInds = evInds[order].tolist()
+            for i, tpnt in enumerate(tpnts.tolist()):
+                yield tpnt, [events[j] for j in evInds[bounds[i]:bounds[i + 1]]]
+
     def _discardPastSaves(self, currT):
         """Discard saving points that are already passed."""
         while self._nextSave[0][0] < currT:
@@ -2249,10 +2985,23 @@ class Simulation(nutils.NamedObject, nutils.StepsWrapperObject, nutils.AdvancedP
     def restore(self, fname):
         """Restore the simulation state to a previously saved checkpoint
 
-        :param fname: The file name / path
+        :param fname: The file name / path, without the ``'.gz'`` extension for compressed
+            checkpoints
         :type fname: str
         """
-        self.stepsSolver.restore(fname)
+        # Make sure pending automatic checkpoints are on disk
+        self._checkpointer.wait()
+        if fname.endswith('.gz'):
+            fname = fname[:-3]
+        localPath = _localCheckpointPath(fname)
+        if os.path.isfile(localPath) or not os.path.isfile(localPath + '.gz'):
+            self.stepsSolver.restore(fname)
+        else:
+            with tempfile.TemporaryDirectory() as tmpDir:
+                tmpName = os.path.join(tmpDir, 'cp')
+                with gzip.open(localPath + '.gz', 'rb') as src, open(_localCheckpointPath(tmpName), 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                self.stepsSolver.restore(tmpName)
 
     def saveMembOpt(self, fname):
         """Saves the vertex optimization in the Efield structure
@@ -82,6 +82,9 @@ cdef extern from "mpi/tetopsplit/tetopsplit.hpp" namespace "steps::mpi::tetopspl
         double getTemp() except +
         double getA0() except +
         uint getNSteps() except +
+        void enableEventStats(bool) except +
+        void resetEventStats() except +
+        std.vector[steps_solver.KProcStats] getEventStats() except +
         double getCompVol(std.string) except +
         double getCompSpecCount(std.string, std.string) except +
         void setCompSpecCount(std.string, std.string, double) except +
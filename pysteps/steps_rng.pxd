@@ -38,6 +38,11 @@ cdef extern from "rng/rng.hpp" namespace "steps::rng":
     cdef cppclass RNG:
         RNG(uint) except +
         void initialize(unsigned long)
+        void initialize(unsigned long, unsigned long) except +
+        unsigned long seed()
+        unsigned long stream()
+        std.string getState() except +
+        void setState(std.string) except +
         uint min()
         uint max()
         uint operator()()
@@ -51,6 +56,11 @@ cdef extern from "rng/rng.hpp" namespace "steps::rng":
         long getPsn(float)
         float getStdNrm()
         uint getBinom(uint, double)
+        void fillUnfIE(double*, size_t)
+        void fillExp(double, double*, size_t)
+        void fillPsn(double*, uint*, size_t)
+        void fillBinom(uint*, double*, uint*, size_t)
+        void fillStdNrm(double*, size_t)
 
 
 # ======================================================================================================================
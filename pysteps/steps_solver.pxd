@@ -126,6 +126,21 @@ cdef extern from "solver/reacdef.hpp" namespace "steps::solver":
         Reacdef(Statedef*, uint, steps_model.Reac*)
 
 
+# ======================================================================================================================
+cdef extern from "solver/event_stats.hpp" namespace "steps::solver":
+# ----------------------------------------------------------------------------------------------------------------------
+
+    ###### Cybinding for KProcStats ######
+    cdef cppclass KProcStats:
+        std.string kind
+        std.string name
+        std.string location
+        unsigned long long events
+        unsigned long long updates
+        double updateTime
+        double selectTime
+
+
 # ======================================================================================================================
 cdef extern from "solver/chandef.hpp" namespace "steps::solver":
 # ----------------------------------------------------------------------------------------------------------------------
@@ -53,6 +53,9 @@ cdef extern from "tetexact/tetexact.hpp" namespace "steps::tetexact":
         double getTemp() except +
         double getA0() except +
         uint getNSteps() except +
+        void enableEventStats(bool) except +
+        void resetEventStats() except +
+        std.vector[steps_solver.KProcStats] getEventStats() except +
         double getCompVol(std.string) except +
         double getCompSpecCount(std.string, std.string) except +
         void setCompSpecCount(std.string, std.string, double) except +
@@ -178,6 +178,7 @@ cdef extern from "geom/tetmesh.hpp" namespace "steps::tetmesh":
         steps.tetrahedron_global_id findTetByPoint(std.vector[double]) except +
         steps.tetrahedron_global_id findTetByPointLinear(std.vector[double]) except +
         steps.tetrahedron_global_id findTetByPointWalk(std.vector[double]) except +
+        void findTetsByPointsNP(double*, int, steps.index_t*, int) except +
         bool isPointInTet(std.vector[double], steps.tetrahedron_global_id) except +
         std.vector[double] getBoundMin() except +
         std.vector[double] getBoundMax() except +
@@ -185,14 +186,17 @@ cdef extern from "geom/tetmesh.hpp" namespace "steps::tetmesh":
         std.vector[steps.index_t] getSurfTris() except +
         std.vector[double] getBatchTetBarycenters(std.vector[steps.tetrahedron_global_id]) except +
         void getBatchTetBarycentersNP(steps.tetrahedron_global_id*, int, double*, int) except +
-        std.vector[double] getBatchTriBarycenters(std.vector[steps.tetrahedron_global_id]) except +
-        void getBatchTriBarycentersNP(steps.tetrahedron_global_id*, int, double*, int) except +
+        std.vector[double] getBatchTriBarycenters(std.vector[steps.triangle_global_id]) except +
+        void getBatchTriBarycentersNP(steps.triangle_global_id*, int, double*, int) except +
         std.vector[double] getBatchVertices(std.vector[steps.index_t]) except +
         void getBatchVerticesNP(steps.index_t*, int, double*, int) except +
         std.vector[steps.index_t] getBatchTris(std.vector[steps.index_t]) except +
         void getBatchTrisNP(steps.index_t*, int, steps.index_t*, int) except +
         std.vector[steps.index_t] getBatchTets(std.vector[steps.index_t]) except +
         void getBatchTetsNP(steps.index_t*, int, steps.index_t*, int) except +
+        void getBatchTetTriNeighbsNP(steps.index_t*, int, steps.index_t*, int) except +
+        void getBatchTetTetNeighbsNP(steps.index_t*, int, steps.index_t*, int) except +
+        void getBatchTriTetNeighbsNP(steps.index_t*, int, steps.index_t*, int) except +
         steps.index_t getTriVerticesSetSizeNP(steps.index_t*, int) except +
         steps.index_t getTetVerticesSetSizeNP(steps.index_t*, int) except +
         void getTriVerticesMappingSetNP(steps.index_t*, int, steps.index_t*, int, steps.index_t*, int) except +
@@ -59,6 +59,9 @@ class HDF5BlenderLoader(objects.BlenderCollection, state.State):
         str,
         'Unique run group identifier, only needed if several run groups exist in the file (see the documentation of steps.API_2.sim.Simulation.toDB)'] = None
     rInd: Annotated[int, 'Run index, defaults to -1 (last run in the run group)'] = -1
+    sharedMemory: Annotated[
+        bool,
+        'Whether frame data should be transferred through shared memory when the data loading server runs on the same machine'] = True
 
     include: Annotated[
         str,
@@ -109,6 +112,11 @@ class HDF5BlenderLoader(objects.BlenderCollection, state.State):
         self._allElems = {}
         self._meshes = {}
 
+        # Frame data
+        self._frameKeys = {}
+        # States are cached separately, only keep the most recent frames
+        self._frameCache = utils.FrameDataCache(maxFrames=2)
+
         m = QueueManager(address=(self.server, self.port), authkey=self.authkey.encode('utf-8'))
         m.connect()
 
@@ -116,7 +124,9 @@ class HDF5BlenderLoader(objects.BlenderCollection, state.State):
 
         atexit.register(self._exitServer)
 
-        envInfo = {'numpy_version': np.__version__}
+        useSharedMemory = (self.sharedMemory and utils.shared_memory is not None
+                           and self.server in ['localhost', '127.0.0.1'])
+        envInfo = {'numpy_version': np.__version__, 'shared_memory': useSharedMemory}
         self._queue_snd.put((self.dbInd, self.rInd, self.include, self.exclude, envInfo))
         if self._queue_rcv.get() == Orders.EXIT:
             print('Data loading server exited, exiting Blender.', file=sys.stderr)
@@ -135,6 +145,7 @@ class HDF5BlenderLoader(objects.BlenderCollection, state.State):
         return {'time': t1 + (t2 - t1) * ratio}
 
     def _exitServer(self):
+        self._frameCache.clear()
         self._queue_snd.put((Orders.EXIT, ))
 
     def _getData(self, name):
@@ -250,9 +261,27 @@ class HDF5BlenderLoader(objects.BlenderCollection, state.State):
 
         self._simTimeSteps = self._getData('_timeSteps')
 
+    def _getFrameData(self, key, args, tind):
+        """Return the tuple of arrays corresponding to frame data key at time index tind
+
+        All the frame data that was registered so far is requested in a single order and the
+        server prefetches the following frames.
+        """
+        if key not in self._frameKeys:
+            self._queue_snd.put((Orders.REGISTER_FRAME_DATA.value, key[0].value, *args))
+            # Keep a reference to args so that keys based on object ids stay valid
+            self._frameKeys[key] = (self._queue_rcv.get(), args)
+        kid, _ = self._frameKeys[key]
+        data = self._frameCache.get(tind, kid)
+        if data is None:
+            keyIds = self._frameCache.missing(tind, [k for k, _ in self._frameKeys.values()])
+            self._queue_snd.put((Orders.GET_FRAME.value, tind, keyIds))
+            self._frameCache.add(tind, *self._queue_rcv.get())
+            data = self._frameCache.get(tind, kid)
+        return data
+
     def _getElemSpecCount(self, spec, loc, tind):
-        self._queue_snd.put((Orders.GET_ELEM_SPEC_COUNT.value, spec, loc.value, tind))
-        return self._queue_rcv.get()
+        return self._getFrameData((Orders.GET_ELEM_SPEC_COUNT, spec, loc.value), (spec, loc.value), tind)
 
     def _getVesLinkSpecRelPos(self, lspec, tind):
         self._queue_snd.put((Orders.GET_VES_LINKSPEC_REL_POS.value, lspec, tind))
@@ -287,8 +316,8 @@ class HDF5BlenderLoader(objects.BlenderCollection, state.State):
         return self._queue_rcv.get()
 
     def _getVertsV(self, vertInds, tind):
-        self._queue_snd.put((Orders.GET_VERTS_V.value, vertInds, tind))
-        return self._queue_rcv.get()
+        verts, = self._getFrameData((Orders.GET_VERTS_V, id(vertInds)), (vertInds, ), tind)
+        return verts
 
     def _preFrameChange(self, scene, depg):
         if 0 <= scene.frame_current <= scene.frame_end:
@@ -23,21 +23,24 @@
 ###
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing.managers import BaseManager
 import numpy as np
 from queue import Queue
 import re
 import warnings
 
+from . import utils as butils
 from .utils import Orders, Loc, Event, zipNone, cartesian2Spherical
 
 
 class _HDF5BlenderDataLoader:
 
-    def __init__(self, HDFPath, queue_snd, queue_rcv):
+    def __init__(self, HDFPath, queue_snd, queue_rcv, prefetch=4):
         self._hdfPath = HDFPath
         self._queue_snd = queue_snd
         self._queue_rcv = queue_rcv
+        self._prefetchSize = prefetch
 
     def isIncluded(self, name):
         return any(reg.match(name)
@@ -60,7 +63,15 @@ class _HDF5BlenderDataLoader:
         self._vesEvents = {}
         self._raftEvents = {}
 
+        # Frame data
+        self._frameKeys = []
+        self._frameKeyIds = {}
+        self._prefetched = {}
+        self._sentBlocks = []
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
         self._dbInd, self._rInd, include, exclude, envInfo = self._queue_rcv.get()
+        self._useSharedMemory = envInfo.get('shared_memory', False) and butils.shared_memory is not None
         # Check that Blender's numpy version is compatible with the locally installed one
         servNpVer = utils.Versioned._parseVersion(np.__version__)
         blendNpVer = utils.Versioned._parseVersion(envInfo.get('numpy_version', '0.0'))
@@ -94,6 +105,8 @@ class _HDF5BlenderDataLoader:
 
             while True:
                 order, *args = self._queue_rcv.get()
+                # Blender maps shared memory blocks before sending the next order
+                self._releaseSentBlocks()
                 ret = None
                 print('Received order', Orders(order))
                 if order is Orders.GET_MESH:
@@ -120,6 +133,10 @@ class _HDF5BlenderDataLoader:
                     ret = self._getRaftEvents(*args)
                 elif order == Orders.GET_VERTS_V:
                     ret = self._getVertsV(*args)
+                elif order == Orders.REGISTER_FRAME_DATA:
+                    ret = self._registerFrameData(*args)
+                elif order == Orders.GET_FRAME:
+                    ret = self._getFrame(*args)
                 elif order is Orders.GET_DATA:
                     name, = args
                     ret = getattr(self, name)
@@ -128,8 +145,83 @@ class _HDF5BlenderDataLoader:
                 else:
                     raise NotImplementedError(f'No such order: {order}')
                 self._queue_snd.put(ret)
+            for future in self._prefetched.values():
+                future.cancel()
+            self._executor.shutdown(wait=True)
+        self._releaseSentBlocks()
         utils.SetVerbosity(1)
 
+    def _releaseSentBlocks(self):
+        for block in self._sentBlocks:
+            block.close()
+            block.unlink()
+        self._sentBlocks = []
+
+    def _registerFrameData(self, order, *args):
+        """Register data that should be sent with each frame and return its identifier"""
+        order = Orders(order)
+        if order == Orders.GET_ELEM_SPEC_COUNT:
+            spec, loc = args
+            key = (order, spec, loc)
+        elif order == Orders.GET_VERTS_V:
+            vertInds, = args
+            key = (order, tuple(vertInds))
+        else:
+            raise NotImplementedError(f'Order {order} cannot be used for frame data.')
+        if key not in self._frameKeyIds:
+            if order == Orders.GET_VERTS_V:
+                self._frameKeys.append((order, self._groupVertsPot(vertInds)))
+            else:
+                self._frameKeys.append(key)
+            self._frameKeyIds[key] = len(self._frameKeys) - 1
+        return self._frameKeyIds[key]
+
+    def _computeFrame(self, tind, keyIds):
+        """Return a list of tuples of arrays, one tuple for each frame data identifier in keyIds"""
+        res = []
+        for kid in keyIds:
+            order, *args = self._frameKeys[kid]
+            if order == Orders.GET_ELEM_SPEC_COUNT:
+                res.append(self._getElemSpecCounts(*args, tind))
+            elif order == Orders.GET_VERTS_V:
+                res.append((self._readVertsV(*args, tind), ))
+        return res
+
+    def _prefetch(self, tind):
+        """Compute the data of upcoming frames in a background thread"""
+        lastTind = min(tind + self._prefetchSize, self._maxTind if self._maxTind is not None else tind)
+        for t in list(self._prefetched.keys()):
+            if not tind < t <= lastTind:
+                self._prefetched.pop(t).cancel()
+        keyIds = list(range(len(self._frameKeys)))
+        for t in range(tind + 1, lastTind + 1):
+            if t not in self._prefetched:
+                self._prefetched[t] = self._executor.submit(
+                    lambda t: (keyIds, self._computeFrame(t, keyIds)), t
+                )
+
+    def _getFrame(self, tind, keyIds):
+        """Return the data of frame tind for all given frame data identifiers
+
+        The arrays are written to a shared memory block if Blender runs on the same machine.
+        """
+        frameData = {}
+        future = self._prefetched.pop(tind, None)
+        if future is not None and not future.cancelled():
+            frameData = dict(zip(*future.result()))
+        missing = [kid for kid in keyIds if kid not in frameData]
+        frameData.update(zip(missing, self._computeFrame(tind, missing)))
+
+        allArrays = [frameData[kid] for kid in keyIds]
+        block, descr = butils.packArrays([arr for arrays in allArrays for arr in arrays],
+                                         self._useSharedMemory)
+        if block is not None:
+            self._sentBlocks.append(block)
+
+        self._prefetch(tind)
+
+        return keyIds, [len(arrays) for arrays in allArrays], descr
+
     def _getMesh(self, hdf, hdfgroup, meshGroup):
         self._allElems = {
             Loc.VERT: {},  # {elem_ind: (x, y, z)}
@@ -393,11 +485,12 @@ class _HDF5BlenderDataLoader:
         allCounts = []
         if loc in self._spec2Rs and spec in self._spec2Rs[loc]:
             for sel, (elems, inds) in self._spec2Rs[loc][spec].items():
-                for idx, cnt in zip(elems, sel.data[self._rInd, tind, inds]):
-                    allElems.append(idx)
-                    allCounts.append(cnt)
+                allElems.append(np.asarray(elems))
+                allCounts.append(np.asarray(sel.data[self._rInd, tind, inds], dtype=float).ravel())
 
-        return (allElems, allCounts)
+        if len(allElems) == 0:
+            return (np.array([], dtype=int), np.array([], dtype=float))
+        return (np.concatenate(allElems), np.concatenate(allCounts))
 
     def _getVesInSpecCounts(self, ves, tind):
         allCounts = {}
@@ -590,16 +683,32 @@ class _HDF5BlenderDataLoader:
             events.setdefault(ridx, []).append(ev)
         return events
 
-    def _getVertsV(self, vertInds, tind):
-        verts = []
-        for v in vertInds:
+    def _groupVertsPot(self, vertInds):
+        """Group vertices by result selector
+
+        Return None if the potential of some vertices was not saved.
+        """
+        groups = {}
+        for i, v in enumerate(vertInds):
             sel, colInd = self._vertsPot.get(v, (None, None))
-            if sel is not None:
-                #TODO Optimization: better data access
-                verts.append(float(sel.data[self._rInd, tind, colInd]))
-            else:
+            if sel is None:
                 return None
-        return np.array(verts)
+            pos, colInds = groups.setdefault(sel, ([], []))
+            pos.append(i)
+            colInds.append(colInd)
+        return len(vertInds), [(sel, np.array(pos), colInds) for sel, (pos, colInds) in groups.items()]
+
+    def _readVertsV(self, vertGroups, tind):
+        if vertGroups is None:
+            return None
+        nbVerts, groups = vertGroups
+        verts = np.empty(nbVerts, dtype=float)
+        for sel, pos, colInds in groups:
+            verts[pos] = np.asarray(sel.data[self._rInd, tind, colInds], dtype=float).ravel()
+        return verts
+
+    def _getVertsV(self, vertInds, tind):
+        return self._readVertsV(self._groupVertsPot(vertInds), tind)
 
 
 D2BQueue, B2DQueue = Queue(), Queue()
@@ -640,13 +749,18 @@ if __name__ == '__main__':
                         action='store',
                         help='Authentication key to connect to the data loading server',
                         default='STEPSBlender')
+    parser.add_argument('--prefetch',
+                        type=int,
+                        action='store',
+                        help='Number of upcoming frames whose data is loaded in advance',
+                        default=4)
 
     args = parser.parse_args()
 
     m = QueueManager(address=('', args.port), authkey=args.authkey.encode('utf-8'))
     m.start()
 
-    dataLoader = _HDF5BlenderDataLoader(args.HDFPath, m.get_D2BQueue(), m.get_B2DQueue())
+    dataLoader = _HDF5BlenderDataLoader(args.HDFPath, m.get_D2BQueue(), m.get_B2DQueue(), prefetch=args.prefetch)
     print(f'Data loading server listening on port {args.port}')
     dataLoader.serve()
     m.shutdown()
@@ -29,6 +29,11 @@ import inspect
 import numpy as np
 import typing
 
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    shared_memory = None
+
 ####################################################################################################
 
 
@@ -49,6 +54,8 @@ class Orders(enum.IntEnum):
     GET_RAFT_EVENTS = 13
     GET_VERTS_V = 14
     OK = 15
+    REGISTER_FRAME_DATA = 16
+    GET_FRAME = 17
 
 
 class Loc(enum.Enum):
@@ -100,6 +107,112 @@ emissionType = typing.Annotated[float, 'Emission strength']
 
 ####################################################################################################
 
+_SHM_ALIGNMENT = 64
+
+
+def packArrays(arrays, useSharedMemory):
+    """Pack a list of numpy arrays (or None values) for sending them to another process
+
+    Return a (block, description) tuple. If useSharedMemory is True, the arrays are copied to a single
+    shared memory block, otherwise block is None and the arrays are sent directly in the description.
+    """
+    arrays = [None if arr is None else np.ascontiguousarray(arr) for arr in arrays]
+    if not useSharedMemory:
+        return None, ('arrays', arrays)
+    layout = []
+    size = 0
+    for arr in arrays:
+        if arr is None:
+            layout.append(None)
+        else:
+            size = -(-size // _SHM_ALIGNMENT) * _SHM_ALIGNMENT
+            layout.append((arr.dtype.str, arr.shape, size))
+            size += arr.nbytes
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for arr, lay in zip(arrays, layout):
+        if lay is not None:
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf, offset=lay[2])[...] = arr
+    return block, ('shm', block.name, layout)
+
+
+def unpackArrays(descr, blocks):
+    """Return the list of arrays described by descr, see packArrays
+
+    Arrays from shared memory are mapped without copy, the corresponding shared memory objects are
+    appended to blocks and should be kept alive as long as the arrays are used.
+    """
+    if descr[0] == 'arrays':
+        return descr[1]
+    _, name, layout = descr
+    block = shared_memory.SharedMemory(name=name)
+    if getattr(shared_memory, '_USE_POSIX', False):
+        # The block is owned by the process that created it, it should not be unlinked from here
+        resource_tracker.unregister(block._name, 'shared_memory')
+    blocks.append(block)
+    return [
+        None if lay is None else np.ndarray(lay[1], dtype=np.dtype(lay[0]), buffer=block.buf, offset=lay[2])
+        for lay in layout
+    ]
+
+
+class FrameDataCache:
+    """Cache of the frame data received from the data loading server
+
+    The arrays of the most recent frames are kept along with the shared memory blocks they are
+    mapped from. The blocks of a frame are closed when the frame is evicted; blocks whose arrays are
+    still referenced elsewhere are closed at a later eviction.
+    """
+
+    def __init__(self, maxFrames=2):
+        self._maxFrames = maxFrames
+        self._frames = {}
+        self._pendingBlocks = []
+
+    def get(self, tind, kid):
+        """Return the tuple of arrays for frame data identifier kid at time index tind, or None"""
+        frame = self._frames.pop(tind, None)
+        if frame is None:
+            return None
+        # Most recently used frames are kept last
+        self._frames[tind] = frame
+        return frame[0].get(kid)
+
+    def missing(self, tind, keyIds):
+        """Return the frame data identifiers from keyIds that are not cached for time index tind"""
+        data, _ = self._frames.get(tind, ({}, []))
+        return [kid for kid in keyIds if kid not in data]
+
+    def add(self, tind, keyIds, sizes, descr):
+        """Add the frame data returned by a GET_FRAME order"""
+        data, blocks = self._frames.pop(tind, ({}, []))
+        self._frames[tind] = (data, blocks)
+        arrays = unpackArrays(descr, blocks)
+        start = 0
+        for kid, sz in zip(keyIds, sizes):
+            data[kid] = tuple(arrays[start:start + sz])
+            start += sz
+        self._evict(self._maxFrames)
+
+    def clear(self):
+        """Remove all frames and close as many shared memory blocks as possible"""
+        self._evict(0)
+
+    def _evict(self, maxFrames):
+        while len(self._frames) > maxFrames:
+            _, blocks = self._frames.pop(next(iter(self._frames)))
+            self._pendingBlocks += blocks
+        remaining = []
+        for block in self._pendingBlocks:
+            try:
+                block.close()
+            except BufferError:
+                # Arrays mapped from the block are still in use
+                remaining.append(block)
+        self._pendingBlocks = remaining
+
+
+####################################################################################################
+
 
 def spherical2Cartesian(spos):
     if len(spos.shape) == 1:
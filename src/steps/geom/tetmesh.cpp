@@ -27,6 +27,7 @@
 #include "tetmesh.hpp"
 
 #include <algorithm>
+#include <cmath>
 #include <cstdlib>
 #include <ctime>
 #include <iostream>
@@ -744,13 +745,13 @@ tetrahedron_global_id Tetmesh::findTetByPoint(std::vector<double> const& p) cons
 ////////////////////////////////////////////////////////////////////////////////
 
 tetrahedron_global_id Tetmesh::findTetByPoint(position_abs const& pos) const {
-    // linear | walk. Feel free to change this parameter based on
-    // performance
+    // linear | grid. Feel free to change this parameter based on
+    // performance. The grid is built once and shared with later searches.
     constexpr size_t threshold = 100;
     if (pTetsN < threshold) {
         return findTetByPointLinear(pos);
     } else {
-        return findTetByPointWalk(pos);
+        return findTetByPointGrid(pos);
     }
 }
 
@@ -901,6 +902,131 @@ tetrahedron_global_id Tetmesh::findTetByPointWalk(
 
 ////////////////////////////////////////////////////////////////////////////////
 
+index_t Tetmesh::TetGrid::cellCoord(double x, int dim) const {
+    const double c = (x - origin[dim]) / cell_size;
+    if (!(c > 0.0)) {
+        return 0;
+    }
+    return std::min(static_cast<index_t>(c), dims[dim] - 1);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+const Tetmesh::TetGrid& Tetmesh::getTetGrid() const {
+    std::call_once(pTetGridFlag, [this]() {
+        auto grid = std::make_unique<TetGrid>();
+        grid->origin = pBBox.min();
+        const point3d extent = pBBox.max() - pBBox.min();
+
+        // Aim for about one tetrahedron per cell
+        const double volume = extent[0] * extent[1] * extent[2];
+        double cell_size = std::cbrt(volume / std::max(static_cast<double>(pTetsN), 1.0));
+        if (!(cell_size > 0.0) or !std::isfinite(cell_size)) {
+            cell_size = std::max({extent[0], extent[1], extent[2], 1.0});
+        }
+        grid->cell_size = cell_size;
+        for (int d = 0; d < 3; ++d) {
+            const double n = std::ceil(extent[d] / cell_size);
+            grid->dims[d] = static_cast<index_t>(std::clamp(n, 1.0, 1024.0));
+        }
+        const std::size_t ncells = static_cast<std::size_t>(grid->dims[0]) * grid->dims[1] *
+                                   grid->dims[2];
+
+        // Tetrahedrons are slightly enlarged to account for the tolerance of tet_inside
+        const double pad = 1e-9 * cell_size;
+        const auto tet_cells = [&](index_t tidx, std::array<index_t, 3>& lo, std::array<index_t, 3>& hi) {
+            const tet_verts& v = pTets[tidx];
+            for (int d = 0; d < 3; ++d) {
+                double vmin = pVerts[v[0].get()][d];
+                double vmax = vmin;
+                for (int i = 1; i < 4; ++i) {
+                    vmin = std::min(vmin, pVerts[v[i].get()][d]);
+                    vmax = std::max(vmax, pVerts[v[i].get()][d]);
+                }
+                lo[d] = grid->cellCoord(vmin - pad, d);
+                hi[d] = grid->cellCoord(vmax + pad, d);
+            }
+        };
+
+        // Count the tetrahedrons in each cell and then fill the cells, in increasing tetrahedron
+        // order so that the search returns the same tetrahedron as a linear search
+        std::vector<index_t> counts(ncells + 1, 0);
+        std::array<index_t, 3> lo{}, hi{};
+        for (auto tidx = 0u; tidx < pTetsN; ++tidx) {
+            tet_cells(tidx, lo, hi);
+            for (auto i = lo[0]; i <= hi[0]; ++i) {
+                for (auto j = lo[1]; j <= hi[1]; ++j) {
+                    for (auto k = lo[2]; k <= hi[2]; ++k) {
+                        ++counts[grid->cellIndex(i, j, k) + 1];
+                    }
+                }
+            }
+        }
+        for (std::size_t c = 1; c <= ncells; ++c) {
+            counts[c] += counts[c - 1];
+        }
+        grid->offsets = counts;
+        grid->tets.resize(counts[ncells]);
+        for (auto tidx = 0u; tidx < pTetsN; ++tidx) {
+            tet_cells(tidx, lo, hi);
+            for (auto i = lo[0]; i <= hi[0]; ++i) {
+                for (auto j = lo[1]; j <= hi[1]; ++j) {
+                    for (auto k = lo[2]; k <= hi[2]; ++k) {
+                        grid->tets[counts[grid->cellIndex(i, j, k)]++] = tetrahedron_global_id(tidx);
+                    }
+                }
+            }
+        }
+        pTetGrid = std::move(grid);
+    });
+    return *pTetGrid;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+tetrahedron_global_id Tetmesh::findTetByPointGrid(const position_abs& pos) const {
+    const point3d p{pos[0], pos[1], pos[2]};
+
+    if (!pBBox.contains(p)) {
+        return {};
+    }
+
+    const TetGrid& grid = getTetGrid();
+    const index_t c = grid.cellIndex(grid.cellCoord(p[0], 0),
+                                     grid.cellCoord(p[1], 1),
+                                     grid.cellCoord(p[2], 2));
+    for (auto ind = grid.offsets[c]; ind < grid.offsets[c + 1]; ++ind) {
+        const auto tet = grid.tets[ind];
+        const tet_verts& v = pTets[tet.get()];
+        if (math::tet_inside(pVerts[v[0].get()],
+                             pVerts[v[1].get()],
+                             pVerts[v[2].get()],
+                             pVerts[v[3].get()],
+                             p)) {
+            return tet;
+        }
+    }
+
+    return {};
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void Tetmesh::findTetsByPointsNP(const double* points,
+                                 int input_size,
+                                 index_t* tets,
+                                 int output_size) const {
+    ArgErrLogIf(input_size != output_size * 3,
+                "Length of points array should be 3 * length of output array.");
+
+    for (int i = 0; i < output_size; ++i) {
+        const position_abs pos{points[3 * i], points[3 * i + 1], points[3 * i + 2]};
+        tets[i] = findTetByPointGrid(pos).get();
+    }
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
 std::vector<double> Tetmesh::getBoundMin() const {
     return as_vector(pBBox.min());
 }
@@ -1257,6 +1383,42 @@ void Tetmesh::getBatchTetsNP(const index_t* t_indices,
 
 ////////////////////////////////////////////////////////////////////////////////
 
+void Tetmesh::getBatchTetTriNeighbsNP(const index_t* t_indices,
+                                      int input_size,
+                                      index_t* tri_indices,
+                                      int output_size) const {
+    ArgErrLogIf(input_size * 4 != output_size,
+                "Length of output array should be 4 * length of input array.");
+
+    batch_copy_components_n(pTet_tri_neighbours, t_indices, input_size, tri_indices);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void Tetmesh::getBatchTetTetNeighbsNP(const index_t* t_indices,
+                                      int input_size,
+                                      index_t* tet_indices,
+                                      int output_size) const {
+    ArgErrLogIf(input_size * 4 != output_size,
+                "Length of output array should be 4 * length of input array.");
+
+    batch_copy_components_n(pTet_tet_neighbours, t_indices, input_size, tet_indices);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void Tetmesh::getBatchTriTetNeighbsNP(const index_t* t_indices,
+                                      int input_size,
+                                      index_t* tet_indices,
+                                      int output_size) const {
+    ArgErrLogIf(input_size * 2 != output_size,
+                "Length of output array should be 2 * length of input array.");
+
+    batch_copy_components_n(pTri_tet_neighbours, t_indices, input_size, tet_indices);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
 uint Tetmesh::getTriVerticesSetSizeNP(const index_t* t_indices, int input_size) const {
     std::set<index_t> unique_indices;
     batch_copy_components_n(pTris,
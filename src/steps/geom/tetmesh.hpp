@@ -26,7 +26,10 @@
 
 #pragma once
 
+#include <array>
 #include <map>
+#include <memory>
+#include <mutex>
 #include <set>
 #include <vector>
 
@@ -455,6 +458,21 @@ class Tetmesh: public wm::Geom {
         double maxSqDist = -1,
         uint minNb = 0) const;
 
+    /// Same results as findTetByPoint but the tetrahedron is searched with a uniform grid over
+    /// the mesh bounding box. The grid is built on first use and kept for subsequent searches.
+    tetrahedron_global_id findTetByPointGrid(const position_abs& p) const;
+
+    /// Find the tetrahedrons that encompass a list of points
+    ///
+    /// \param points Coordinates of the points, x, y, z for each point.
+    /// \param input_size Length of points, should be 3 * output_size.
+    /// \param tets Output array for tetrahedron indices, UNKNOWN_TET for points outside the mesh.
+    /// \param output_size Number of points.
+    void findTetsByPointsNP(const double* points,
+                            int input_size,
+                            index_t* tets,
+                            int output_size) const;
+
     ////////////////////////////////////////////////////////////////////////
     // DATA ACCESS (EXPOSED TO PYTHON): MESH
     ////////////////////////////////////////////////////////////////////////
@@ -575,6 +593,26 @@ class Tetmesh: public wm::Geom {
                         index_t* v_indices,
                         int output_size) const;
 
+    /// Get the triangle neighbors of a list of tetrahedrons
+    void getBatchTetTriNeighbsNP(const index_t* t_indices,
+                                 int input_size,
+                                 index_t* tri_indices,
+                                 int output_size) const;
+
+    /// Get the tetrahedron neighbors of a list of tetrahedrons
+    /// Missing neighbors are set to UNKNOWN_TET
+    void getBatchTetTetNeighbsNP(const index_t* t_indices,
+                                 int input_size,
+                                 index_t* tet_indices,
+                                 int output_size) const;
+
+    /// Get the tetrahedron neighbors of a list of triangles
+    /// Missing neighbors are set to UNKNOWN_TET
+    void getBatchTriTetNeighbsNP(const index_t* t_indices,
+                                 int input_size,
+                                 index_t* tet_indices,
+                                 int output_size) const;
+
     /// Return the size of a set with unique vertex indices of a list of triangles
     /// preparation function for future numpy data access
     uint getTriVerticesSetSizeNP(const index_t* t_indices, int input_size) const;
@@ -1070,6 +1108,24 @@ class Tetmesh: public wm::Geom {
     /// Build pBars, pBarsN, pTri_bars from pTris.
     void buildBarData();
 
+    /// Uniform grid over the mesh bounding box used to locate points
+    struct TetGrid {
+        point3d origin;
+        double cell_size{1.0};
+        std::array<index_t, 3> dims{1, 1, 1};
+        /// Tetrahedrons whose bounding box overlaps cell c are tets[offsets[c]:offsets[c + 1]]
+        std::vector<index_t> offsets;
+        std::vector<tetrahedron_global_id> tets;
+
+        index_t cellCoord(double x, int dim) const;
+        index_t cellIndex(index_t i, index_t j, index_t k) const {
+            return (i * dims[1] + j) * dims[2] + k;
+        }
+    };
+
+    /// Return the point location grid, build it if needed
+    const TetGrid& getTetGrid() const;
+
     ///////////////////////// DATA: VERTICES ///////////////////////////////
     ///
     /// The total number of vertices in the mesh
@@ -1136,6 +1192,10 @@ class Tetmesh: public wm::Geom {
     /// Information about the minimal and maximal boundary values
     math::bounding_box pBBox;
 
+    /// Point location grid, built lazily
+    mutable std::unique_ptr<TetGrid> pTetGrid;
+    mutable std::once_flag pTetGridFlag;
+
     ////////////////////////////////////////////////////////////////////////
 
     std::map<std::string, tetmesh::TmComp*> pTmComps;
@@ -1986,6 +1986,94 @@ uint TetOpSplitP::getNSteps() const {
 
 ////////////////////////////////////////////////////////////////////////////////
 
+void TetOpSplitP::enableEventStats(bool enabled) {
+    if (enabled) {
+        pEventStats.enable(_getEventStatsKeys());
+    } else {
+        pEventStats.disable();
+    }
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void TetOpSplitP::resetEventStats() {
+    pEventStats.reset();
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+std::vector<solver::KProcStats> TetOpSplitP::getEventStats() const {
+    return pEventStats.stats();
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+std::vector<solver::EventStats::Key> TetOpSplitP::_getEventStatsKeys() {
+    std::vector<solver::EventStats::Key> keys(pKProcs.size());
+
+    // kprocs are stored in each hosted element in the order they were created
+    // by setupKProcs(), reacs first, then diffs for tets
+    auto addVolKeys = [&keys](WmVol& vol, bool withDiffs) {
+        if (!vol.getInHost()) {
+            return;
+        }
+        auto& kprocs = vol.kprocs();
+        auto* cdef = vol.compdef();
+        uint j = 0;
+        for (auto i: solver::reac_local_id::range(cdef->countReacs())) {
+            keys[kprocs[j++]->schedIDX().get()] = {"Reac", cdef->reacdef(i).name(), cdef->name()};
+        }
+        if (withDiffs) {
+            for (auto i: solver::diff_local_id::range(cdef->countDiffs())) {
+                keys[kprocs[j++]->schedIDX().get()] = {"Diff", cdef->diffdef(i).name(), cdef->name()};
+            }
+        }
+    };
+
+    for (auto const& t: pTets) {
+        if (t != nullptr) {
+            addVolKeys(*t, true);
+        }
+    }
+
+    for (auto const& wmv: pWmVols) {
+        if (wmv != nullptr) {
+            addVolKeys(*wmv, false);
+        }
+    }
+
+    for (auto const& t: pTris) {
+        if (t == nullptr || !t->getInHost()) {
+            continue;
+        }
+        auto& kprocs = t->kprocs();
+        auto* pdef = t->patchdef();
+        uint j = 0;
+        for (auto i: solver::sreac_local_id::range(pdef->countSReacs())) {
+            keys[kprocs[j++]->schedIDX().get()] = {"SReac", pdef->sreacdef(i).name(), pdef->name()};
+        }
+        for (auto i: solver::surfdiff_local_id::range(pdef->countSurfDiffs())) {
+            keys[kprocs[j++]->schedIDX().get()] = {"SDiff", pdef->surfdiffdef(i).name(), pdef->name()};
+        }
+        if (efflag()) {
+            for (auto i: solver::vdepsreac_local_id::range(pdef->countVDepSReacs())) {
+                keys[kprocs[j++]->schedIDX().get()] = {"VDepSReac",
+                                                       pdef->vdepsreacdef(i).name(),
+                                                       pdef->name()};
+            }
+            for (auto i: solver::ghkcurr_local_id::range(pdef->countGHKcurrs())) {
+                keys[kprocs[j++]->schedIDX().get()] = {"GHKcurr",
+                                                       pdef->ghkcurrdef(i).name(),
+                                                       pdef->name()};
+            }
+        }
+    }
+
+    return keys;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
 void TetOpSplitP::setTime(double time) {
     statedef().setTime(time);
 }
@@ -3214,7 +3302,7 @@ solver::kproc_global_id TetOpSplitP::addKProc(KProc* kp, bool Vdep) {
 
 ////////////////////////////////////////////////////////////////////////////////
 
-KProc* TetOpSplitP::_getNext() const {
+KProc* TetOpSplitP::_selectNext() const {
     AssertLog(pA0 >= 0.0);
     // Quick check to see whether nothing is there.
     if (pA0 == 0.0) {
@@ -3354,6 +3442,9 @@ KProc* TetOpSplitP::_getNext() const {
 ////////////////////////////////////////////////////////////////////////////////
 
 void TetOpSplitP::_executeStep(KProc* kp, double dt, double period) {
+    if (pEventStats.enabled()) {
+        pEventStats.addEvent(kp->schedIDX());
+    }
     kp->apply(rng(), dt, statedef().time(), period);
     statedef().incTime(dt);
 
@@ -5519,7 +5610,7 @@ void TetOpSplitP::_updateSum() {
 
 ////////////////////////////////////////////////////////////////////////////////
 
-void TetOpSplitP::_updateElement(KProc* kp) {
+void TetOpSplitP::_updateElementRate(KProc* kp) {
     if (kp->getType() == KP_DIFF || kp->getType() == KP_SDIFF) {
         kp->crData.rate = kp->rate(this);
         return;
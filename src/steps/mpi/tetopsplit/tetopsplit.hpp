@@ -46,6 +46,7 @@
 #include "geom/tetmesh.hpp"
 #include "solver/api.hpp"
 #include "solver/efield/efield.hpp"
+#include "solver/event_stats.hpp"
 #include "solver/statedef.hpp"
 
 namespace steps::mpi::tetopsplit {
@@ -144,6 +145,19 @@ class TetOpSplitP: public solver::API {
 
     uint getNSteps() const override;
 
+    ////////////////////////////////////////////////////////////////////////
+    // SOLVER STATE ACCESS:
+    //      EVENT STATISTICS
+    ////////////////////////////////////////////////////////////////////////
+
+    /// Start or stop the per kproc type event accounting of the local rank
+    void enableEventStats(bool enabled);
+    /// Reset the event counters and timings of the local rank
+    void resetEventStats();
+    /// Return the event statistics of the kprocs hosted by the local rank,
+    /// grouped by kproc kind, name and location
+    std::vector<solver::KProcStats> getEventStats() const;
+
     ////////////////////////////////////////////////////////////////////////
     // SOLVER STATE ACCESS:
     //      ADVANCE
@@ -592,7 +606,19 @@ class TetOpSplitP: public solver::API {
         return pKProcs[i]->rate();
     }
 
-    KProc* _getNext() const;
+    KProc* _selectNext() const;
+
+    inline KProc* _getNext() {
+        if (!pEventStats.enabled()) {
+            return _selectNext();
+        }
+        auto start = solver::EventStats::clock::now();
+        KProc* kp = _selectNext();
+        if (kp != nullptr) {
+            pEventStats.addSelect(kp->schedIDX(), start);
+        }
+        return kp;
+    }
 
     // void _reset();
 
@@ -863,6 +889,13 @@ class TetOpSplitP: public solver::API {
     // Now stored as base pointer
     util::strongid_vector<tetrahedron_global_id, Tet*> pTets;
 
+    // Per kproc type event accounting, disabled by default
+    solver::EventStats pEventStats;
+
+    // Return the (kind, name, location) key of each kproc, indexed by SchedIDX.
+    // Kprocs that are not hosted by this rank get an empty key.
+    std::vector<solver::EventStats::Key> _getEventStatsKeys();
+
     ////////////////////////////////////////////////////////////////////////
     // Diffusion Data and Methods
     ////////////////////////////////////////////////////////////////////////
@@ -909,7 +942,17 @@ class TetOpSplitP: public solver::API {
     void _extendNGroups(uint new_size);
     void _extendGroup(CRGroup* group, uint size = 1024);
     void _updateSum();
-    void _updateElement(KProc* kp);
+    void _updateElementRate(KProc* kp);
+
+    inline void _updateElement(KProc* kp) {
+        if (!pEventStats.enabled()) {
+            _updateElementRate(kp);
+            return;
+        }
+        auto start = solver::EventStats::clock::now();
+        _updateElementRate(kp);
+        pEventStats.addUpdate(kp->schedIDX(), start);
+    }
 
     ////////////////////////////////////////////////////////////////////////
     void _partition();
@@ -24,6 +24,8 @@
 
  */
 
+#include <cstdint>
+
 #include "mt19937.hpp"
 
 #include "util/checkpointing.hpp"
@@ -46,6 +48,44 @@ void MT19937::concreteInitialize(ulong seed) {
 
 ////////////////////////////////////////////////////////////////////////////////
 
+void MT19937::concreteInitializeStream(ulong seed, ulong stream) {
+    const ulong init_key[4] = {seed & 0xffffffffUL,
+                               (static_cast<std::uint64_t>(seed) >> 32) & 0xffffffffUL,
+                               stream & 0xffffffffUL,
+                               (static_cast<std::uint64_t>(stream) >> 32) & 0xffffffffUL};
+    const int key_length = 4;
+
+    concreteInitialize(19650218UL);
+    int i = 1, j = 0;
+    for (int k = MT_N; k; k--) {
+        pState[i] = (pState[i] ^ ((pState[i - 1] ^ (pState[i - 1] >> 30)) * 1664525UL)) +
+                    init_key[j] + j;  // non linear
+        pState[i] &= 0xffffffffUL;   // for WORDSIZE > 32 machines
+        i++;
+        j++;
+        if (i >= MT_N) {
+            pState[0] = pState[MT_N - 1];
+            i = 1;
+        }
+        if (j >= key_length) {
+            j = 0;
+        }
+    }
+    for (int k = MT_N - 1; k; k--) {
+        pState[i] = (pState[i] ^ ((pState[i - 1] ^ (pState[i - 1] >> 30)) * 1566083941UL)) -
+                    i;                // non linear
+        pState[i] &= 0xffffffffUL;  // for WORDSIZE > 32 machines
+        i++;
+        if (i >= MT_N) {
+            pState[0] = pState[MT_N - 1];
+            i = 1;
+        }
+    }
+    pState[0] = 0x80000000UL;  // MSB is 1; assuring non-zero initial array
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
 /// Fills the buffer with random numbers on [0,0xffffffff]-interval.
 void MT19937::concreteFillBuffer() {
     ulong y;
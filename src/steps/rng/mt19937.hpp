@@ -110,6 +110,12 @@ class MT19937: public RNG {
     /// \param seed Seed for the generator.
     virtual void concreteInitialize(unsigned long seed) override;
 
+    /// Initialize the generator for the given substream.
+    ///
+    /// Uses the init_by_array key initialization from the original mt19937.c with
+    /// the seed and the stream index as key.
+    virtual void concreteInitializeStream(unsigned long seed, unsigned long stream) override;
+
     /// Fills the buffer with random numbers on [0,0xffffffff]-interval.
     ///
     virtual void concreteFillBuffer() override;
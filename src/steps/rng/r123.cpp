@@ -33,6 +33,7 @@
 // STEPS headers.
 #include "r123.hpp"
 // util
+#include "util/checkpointing.hpp"
 #include "util/error.hpp"
 // logging
 ////////////////////////////////////////////////////////////////////////////////
@@ -53,7 +54,15 @@ void R123::concreteInitialize(unsigned long seed) {
     ctr[0] = 0;           /// Incrementing the counter
     ctr[1] = 0;           /// Incrementing the counter
     ctr[2] = seed;        /// First 32 bits of 64-bit seed
-    ctr[3] = seed >> 32;  /// Last 32 bits of the seed
+    ctr[3] = static_cast<std::uint64_t>(seed) >> 32;  /// Last 32 bits of the seed
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void R123::concreteInitializeStream(unsigned long seed, unsigned long stream) {
+    concreteInitialize(seed);
+    key[0] = stream;        /// First 32 bits of 64-bit stream index
+    key[1] = static_cast<std::uint64_t>(stream) >> 32;  /// Last 32 bits of the stream index
 }
 
 ////////////////////////////////////////////////////////////////////////////////
@@ -87,17 +96,16 @@ void R123::concreteFillBuffer() {
 
 void R123::checkpoint(std::ostream& cp_file) const {
     RNG::checkpoint(cp_file);
-    CLOG(INFO, "general_log")
-        << "Warning - r123 checkpointing is not implemented, runs might not be reproducible "
-        << std::endl;
-    // TODO Implement checkpoint for r123
+    util::checkpoint(cp_file, key);
+    util::checkpoint(cp_file, ctr);
 }
 
 ////////////////////////////////////////////////////////////////////////////////
 
 void R123::restore(std::istream& cp_file) {
     RNG::restore(cp_file);
-    // TODO Implement checkpoint for r123
+    util::restore(cp_file, key);
+    util::restore(cp_file, ctr);
 }
 
 }  // namespace steps::rng
@@ -95,6 +95,12 @@ class R123: public RNG {
     /// \param seed Seed for the generator.
     virtual void concreteInitialize(unsigned long seed) override;
 
+    /// Initialize the generator with seed for the given substream.
+    ///
+    /// The stream index is used as the Philox key, different streams are thus
+    /// guaranteed not to overlap.
+    virtual void concreteInitializeStream(unsigned long seed, unsigned long stream) override;
+
     /// Fills the buffer with random numbers on [0,0xffffffff]-interval.
     ///
     virtual void concreteFillBuffer() override;
@@ -28,6 +28,7 @@
 
 #include <cmath>
 #include <random>
+#include <sstream>
 
 #include "small_binomial.hpp"
 #include "util/checkpointing.hpp"
@@ -59,6 +60,7 @@ void RNG::checkpoint(std::ostream& cp_file) const {
     util::checkpoint(cp_file, static_cast<uint>(rEnd - rBuffer.get()));
     util::checkpoint(cp_file, pInitialized);
     util::checkpoint(cp_file, pSeed);
+    util::checkpoint(cp_file, pStream);
 }
 
 ////////////////////////////////////////////////////////////////////////////////
@@ -72,14 +74,26 @@ void RNG::restore(std::istream& cp_file) {
     rEnd = rBuffer.get() + shift;
     util::restore(cp_file, pInitialized);
     util::restore(cp_file, pSeed);
+    util::restore(cp_file, pStream);
 }
 
 ////////////////////////////////////////////////////////////////////////////////
 
 void RNG::initialize(ulong const& seed) {
+    initialize(seed, 0);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void RNG::initialize(ulong const& seed, ulong const& stream) {
     AssertLog(rBuffer != nullptr);
-    concreteInitialize(seed);
+    if (stream == 0) {
+        concreteInitialize(seed);
+    } else {
+        concreteInitializeStream(seed, stream);
+    }
     pSeed = seed;
+    pStream = stream;
     pInitialized = true;
     concreteFillBuffer();
     rNext = rBuffer.get();
@@ -87,12 +101,43 @@ void RNG::initialize(ulong const& seed) {
 
 ////////////////////////////////////////////////////////////////////////////////
 
+void RNG::concreteInitializeStream(ulong seed, ulong stream) {
+    if (stream != 0) {
+        ArgErrLog("This random number generator does not support substreams.");
+    }
+    concreteInitialize(seed);
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
 ulong RNG::seed() const {
     return pSeed;
 }
 
 ////////////////////////////////////////////////////////////////////////////////
 
+ulong RNG::stream() const {
+    return pStream;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+std::string RNG::getState() const {
+    std::ostringstream ostr;
+    checkpoint(ostr);
+    return ostr.str();
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void RNG::setState(const std::string& state) {
+    std::istringstream istr(state);
+    restore(istr);
+    ArgErrLogIf(istr.fail(), "The random number generator state could not be restored.");
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
 float RNG::getStdExp() {
     static float q[8] = {
         0.6931472, 0.9333737, 0.9888778, 0.9984959, 0.9998293, 0.9999833, 0.9999986, 0.9999999};
@@ -525,4 +570,45 @@ uint RNG::getBinom(uint t, double p) {
     return distribution(*this);
 }
 
+////////////////////////////////////////////////////////////////////////////////
+
+void RNG::fillUnfIE(double* out, std::size_t n) {
+    for (std::size_t i = 0; i < n; ++i) {
+        out[i] = getUnfIE();
+    }
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void RNG::fillExp(double lambda, double* out, std::size_t n) {
+    const double scale = 1.0 / lambda;
+    for (std::size_t i = 0; i < n; ++i) {
+        out[i] = scale * static_cast<double>(getStdExp());
+    }
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void RNG::fillPsn(const double* lambdas, uint* out, std::size_t n) {
+    for (std::size_t i = 0; i < n; ++i) {
+        out[i] = static_cast<uint>(getPsn(static_cast<float>(lambdas[i])));
+    }
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void RNG::fillBinom(const uint* ts, const double* ps, uint* out, std::size_t n) {
+    for (std::size_t i = 0; i < n; ++i) {
+        out[i] = getBinom(ts[i], ps[i]);
+    }
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void RNG::fillStdNrm(double* out, std::size_t n) {
+    for (std::size_t i = 0; i < n; ++i) {
+        out[i] = static_cast<double>(getStdNrm());
+    }
+}
+
 }  // namespace steps::rng
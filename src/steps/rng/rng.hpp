@@ -26,8 +26,10 @@
 
 #pragma once
 
+#include <cstddef>
 #include <iosfwd>
 #include <memory>
+#include <string>
 
 #include "math/tools.hpp"
 
@@ -56,9 +58,29 @@ class RNG {
     /// \param seed Seed for the generator.
     void initialize(unsigned long const& seed);
 
+    /// Initialize the generator with seed and select an independent substream.
+    ///
+    /// Generators initialized with the same seed and different stream indices produce
+    /// independent sequences. Stream 0 is identical to initialize(seed).
+    ///
+    /// \param seed Seed for the generator.
+    /// \param stream Index of the substream.
+    void initialize(unsigned long const& seed, unsigned long const& stream);
+
     /// Return the seed of the generator.
     unsigned long seed() const;
 
+    /// Return the substream index of the generator.
+    unsigned long stream() const;
+
+    /// Return the full state of the generator, including its position in the stream.
+    std::string getState() const;
+
+    /// Restore a state previously obtained with getState().
+    ///
+    /// \param state Serialized state, the generator needs to be of the same type.
+    void setState(const std::string& state);
+
     /// Minimax inclusive range for the C++11 compatibility
     static constexpr unsigned int min() {
         return 0;
@@ -129,6 +151,26 @@ class RNG {
     ///
     unsigned int getBinom(unsigned int t, double p);
 
+    /// Fill out with n uniform random numbers on [0,1).
+    ///
+    void fillUnfIE(double* out, std::size_t n);
+
+    /// Fill out with n exponentially distributed numbers, see getExp.
+    ///
+    void fillExp(double lambda, double* out, std::size_t n);
+
+    /// Fill out with n Poisson-distributed numbers with means lambdas.
+    ///
+    void fillPsn(const double* lambdas, unsigned int* out, std::size_t n);
+
+    /// Fill out with n binomially distributed numbers with parameters ts and ps.
+    ///
+    void fillBinom(const unsigned int* ts, const double* ps, unsigned int* out, std::size_t n);
+
+    /// Fill out with n standard normally distributed random numbers.
+    ///
+    void fillStdNrm(double* out, std::size_t n);
+
     /**
      * Function that rounds a double value to one of the closest straddling integers
      * with a probability dependent on the proximity
@@ -164,6 +206,11 @@ class RNG {
 
     virtual void concreteInitialize(unsigned long seed) = 0;
 
+    /// Initialize the generator with seed for the given substream.
+    ///
+    /// The default implementation only supports stream 0.
+    virtual void concreteInitializeStream(unsigned long seed, unsigned long stream);
+
     /// Fills the buffer with random numbers on [0,0xffffffff]-interval.
     ///
     virtual void concreteFillBuffer() = 0;
@@ -171,6 +218,7 @@ class RNG {
   private:
     bool pInitialized;
     unsigned long pSeed{};
+    unsigned long pStream{};
 };
 
 using RNGptr = std::shared_ptr<RNG>;
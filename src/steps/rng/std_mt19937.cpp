@@ -24,7 +24,12 @@
 
  */
 
+#include <cstdint>
+#include <sstream>
+#include <string>
+
 #include "rng/std_mt19937.hpp"
+#include "util/checkpointing.hpp"
 #include "util/error.hpp"
 
 // logging
@@ -40,6 +45,14 @@ void STDMT19937::concreteInitialize(unsigned long seed) {
     rng_.seed(seed);
 }
 
+void STDMT19937::concreteInitializeStream(unsigned long seed, unsigned long stream) {
+    std::seed_seq seq{static_cast<std::uint32_t>(seed),
+                      static_cast<std::uint32_t>(static_cast<std::uint64_t>(seed) >> 32),
+                      static_cast<std::uint32_t>(stream),
+                      static_cast<std::uint32_t>(static_cast<std::uint64_t>(stream) >> 32)};
+    rng_.seed(seq);
+}
+
 void STDMT19937::concreteFillBuffer() {
     for (unsigned int i = 0; i < rSize; ++i) {
         rBuffer.get()[i] = rng_();
@@ -50,17 +63,23 @@ void STDMT19937::concreteFillBuffer() {
 
 void STDMT19937::checkpoint(std::ostream& cp_file) const {
     RNG::checkpoint(cp_file);
-    CLOG(INFO, "general_log") << "Warning - std_mt19937 checkpointing is not implemented, runs "
-                                 "might not be reproducible "
-                              << std::endl;
-    // TODO Implement checkpoint for std_mt19937
+    // The engine state is only accessible through its textual representation
+    std::ostringstream engine;
+    engine << rng_;
+    util::checkpoint(cp_file, engine.str());
 }
 
 ////////////////////////////////////////////////////////////////////////////////
 
 void STDMT19937::restore(std::istream& cp_file) {
     RNG::restore(cp_file);
-    // TODO Implement checkpoint for std_mt19937
+    std::string state;
+    util::restore(cp_file, state);
+    std::istringstream engine(state);
+    engine >> rng_;
+    if (engine.fail()) {
+        CheckpointErrLog("Unable to restore the std::mt19937 engine state.");
+    }
 }
 
 }  // namespace steps::rng
@@ -44,6 +44,8 @@ class STDMT19937: public RNG {
   protected:
     void concreteInitialize(unsigned long seed) override;
 
+    void concreteInitializeStream(unsigned long seed, unsigned long stream) override;
+
     void concreteFillBuffer() override;
 
     std::mt19937 rng_;
@@ -0,0 +1,146 @@
+/*
+ #################################################################################
+#
+#    STEPS - STochastic Engine for Pathway Simulation
+#    Copyright (C) 2007-2023 Okinawa Institute of Science and Technology, Japan.
+#    Copyright (C) 2003-2006 University of Antwerp, Belgium.
+#    
+#    See the file AUTHORS for details.
+#    This file is part of STEPS.
+#    
+#    STEPS is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License version 3,
+#    as published by the Free Software Foundation.
+#    
+#    STEPS is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#    
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#################################################################################   
+
+ */
+
+#pragma once
+
+#include <chrono>
+#include <map>
+#include <string>
+#include <tuple>
+#include <vector>
+
+#include "solver/fwd.hpp"
+
+namespace steps::solver {
+
+////////////////////////////////////////////////////////////////////////////////
+
+/// Event statistics of all kprocs that share the same kind (e.g. "Reac",
+/// "Diff", "SReac"), name and location (compartment or patch name).
+struct KProcStats {
+    std::string kind;
+    std::string name;
+    std::string location;
+    /// Number of times a kproc was applied
+    unsigned long long events{0};
+    /// Number of propensity updates
+    unsigned long long updates{0};
+    /// Time spent updating propensities (s)
+    double updateTime{0.0};
+    /// Time spent selecting the next kproc, attributed to the selected one (s)
+    double selectTime{0.0};
+};
+
+////////////////////////////////////////////////////////////////////////////////
+
+/// Per kproc type event accounting for SSA solvers.
+///
+/// When enabled, the solver notifies the accounting object of each event,
+/// propensity update and kproc selection. Counters are accumulated in groups
+/// of kprocs that share the same key, the group of each kproc is looked up
+/// from its schedule index.
+class EventStats {
+  public:
+    using clock = std::chrono::steady_clock;
+    /// (kind, name, location) of a kproc, kprocs with an empty kind are ignored
+    using Key = std::tuple<std::string, std::string, std::string>;
+
+    inline bool enabled() const noexcept {
+        return pEnabled;
+    }
+
+    /// Start the accounting, keys[i] describes the kproc with schedule index i.
+    /// Counters are kept if the keys did not change since the last call.
+    void enable(const std::vector<Key>& keys) {
+        if (keys.size() != pKProcGroup.size()) {
+            pKProcGroup.clear();
+            pStats.clear();
+            std::map<Key, uint> groups;
+            pKProcGroup.reserve(keys.size());
+            for (auto const& key: keys) {
+                auto it = groups.find(key);
+                if (it == groups.end()) {
+                    it = groups.emplace(key, static_cast<uint>(pStats.size())).first;
+                    KProcStats stats;
+                    std::tie(stats.kind, stats.name, stats.location) = key;
+                    pStats.push_back(stats);
+                }
+                pKProcGroup.push_back(it->second);
+            }
+        }
+        pEnabled = true;
+    }
+
+    /// Stop the accounting, counters are kept until the next reset
+    inline void disable() noexcept {
+        pEnabled = false;
+    }
+
+    void reset() {
+        for (auto& stats: pStats) {
+            stats.events = 0;
+            stats.updates = 0;
+            stats.updateTime = 0.0;
+            stats.selectTime = 0.0;
+        }
+    }
+
+    inline void addEvent(kproc_global_id idx) {
+        pStats[pKProcGroup[idx.get()]].events++;
+    }
+
+    inline void addSelect(kproc_global_id idx, clock::time_point start) {
+        pStats[pKProcGroup[idx.get()]].selectTime += _elapsed(start);
+    }
+
+    inline void addUpdate(kproc_global_id idx, clock::time_point start) {
+        auto& stats = pStats[pKProcGroup[idx.get()]];
+        stats.updates++;
+        stats.updateTime += _elapsed(start);
+    }
+
+    /// Return the statistics of all groups of kprocs
+    std::vector<KProcStats> stats() const {
+        std::vector<KProcStats> res;
+        for (auto const& stats: pStats) {
+            if (!stats.kind.empty()) {
+                res.push_back(stats);
+            }
+        }
+        return res;
+    }
+
+  private:
+    static inline double _elapsed(clock::time_point start) {
+        return std::chrono::duration<double>(clock::now() - start).count();
+    }
+
+    bool pEnabled{false};
+    std::vector<uint> pKProcGroup;
+    std::vector<KProcStats> pStats;
+};
+
+}  // namespace steps::solver
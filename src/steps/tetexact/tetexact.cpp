@@ -1535,6 +1535,91 @@ uint Tetexact::getNSteps() const {
 
 ////////////////////////////////////////////////////////////////////////////////
 
+void Tetexact::enableEventStats(bool enabled) {
+    if (enabled) {
+        pEventStats.enable(_getEventStatsKeys());
+    } else {
+        pEventStats.disable();
+    }
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+void Tetexact::resetEventStats() {
+    pEventStats.reset();
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+std::vector<solver::KProcStats> Tetexact::getEventStats() const {
+    return pEventStats.stats();
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
+std::vector<solver::EventStats::Key> Tetexact::_getEventStatsKeys() {
+    std::vector<solver::EventStats::Key> keys(pKProcs.size());
+
+    // kprocs are stored in each element in the order they were created by
+    // setupKProcs(), reacs first, then diffs for tets
+    auto addVolKeys = [&keys](WmVol& vol, bool withDiffs) {
+        auto& kprocs = vol.kprocs();
+        auto* cdef = vol.compdef();
+        uint j = 0;
+        for (auto i: solver::reac_local_id::range(cdef->countReacs())) {
+            keys[kprocs[j++]->schedIDX().get()] = {"Reac", cdef->reacdef(i).name(), cdef->name()};
+        }
+        if (withDiffs) {
+            for (auto i: solver::diff_local_id::range(cdef->countDiffs())) {
+                keys[kprocs[j++]->schedIDX().get()] = {"Diff", cdef->diffdef(i).name(), cdef->name()};
+            }
+        }
+    };
+
+    for (auto const& t: pTets) {
+        if (t != nullptr) {
+            addVolKeys(*t, true);
+        }
+    }
+
+    for (auto const& wmv: pWmVols) {
+        if (wmv != nullptr) {
+            addVolKeys(*wmv, false);
+        }
+    }
+
+    for (auto const& t: pTris) {
+        if (t == nullptr) {
+            continue;
+        }
+        auto& kprocs = t->kprocs();
+        auto* pdef = t->patchdef();
+        uint j = 0;
+        for (auto i: solver::sreac_local_id::range(pdef->countSReacs())) {
+            keys[kprocs[j++]->schedIDX().get()] = {"SReac", pdef->sreacdef(i).name(), pdef->name()};
+        }
+        for (auto i: solver::surfdiff_local_id::range(pdef->countSurfDiffs())) {
+            keys[kprocs[j++]->schedIDX().get()] = {"SDiff", pdef->surfdiffdef(i).name(), pdef->name()};
+        }
+        if (efflag()) {
+            for (auto i: solver::vdepsreac_local_id::range(pdef->countVDepSReacs())) {
+                keys[kprocs[j++]->schedIDX().get()] = {"VDepSReac",
+                                                       pdef->vdepsreacdef(i).name(),
+                                                       pdef->name()};
+            }
+            for (auto i: solver::ghkcurr_local_id::range(pdef->countGHKcurrs())) {
+                keys[kprocs[j++]->schedIDX().get()] = {"GHKcurr",
+                                                       pdef->ghkcurrdef(i).name(),
+                                                       pdef->name()};
+            }
+        }
+    }
+
+    return keys;
+}
+
+////////////////////////////////////////////////////////////////////////////////
+
 void Tetexact::setTime(double time) {
     statedef().setTime(time);
 }
@@ -2283,7 +2368,7 @@ void Tetexact::addKProc(steps::tetexact::KProc* kp, bool Vdep) {
 
 ////////////////////////////////////////////////////////////////////////////////
 
-steps::tetexact::KProc* Tetexact::_getNext() const {
+steps::tetexact::KProc* Tetexact::_selectNext() const {
     AssertLog(pA0 >= 0.0);
     // Quick check to see whether nothing is there.
     if (pA0 == 0.0) {
@@ -2434,6 +2519,9 @@ void Tetexact::_reset()
 ////////////////////////////////////////////////////////////////////////////////
 
 void Tetexact::_executeStep(steps::tetexact::KProc* kp, double dt) {
+    if (pEventStats.enabled()) {
+        pEventStats.addEvent(kp->schedIDX());
+    }
     std::vector<KProc*> const& upd = kp->apply(rng(), dt, statedef().time());
     _update(upd.begin(), upd.end());
     statedef().incTime(dt);
@@ -3963,7 +4051,7 @@ void Tetexact::_setMembVolRes(solver::membrane_global_id midx, double ro) {
 
 ////////////////////////////////////////////////////////////////////////////////
 
-void Tetexact::_updateElement(KProc& kp) {
+void Tetexact::_updateElementRate(KProc& kp) {
     double new_rate = kp.rate(this);
 
     CRKProcData& data = kp.crData;
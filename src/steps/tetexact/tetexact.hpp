@@ -46,6 +46,7 @@
 #include "geom/tetmesh.hpp"
 #include "solver/api.hpp"
 #include "solver/efield/efield.hpp"
+#include "solver/event_stats.hpp"
 #include "solver/statedef.hpp"
 
 namespace steps::tetexact {
@@ -128,6 +129,18 @@ class Tetexact: public solver::API {
 
     uint getNSteps() const override;
 
+    ////////////////////////////////////////////////////////////////////////
+    // SOLVER STATE ACCESS:
+    //      EVENT STATISTICS
+    ////////////////////////////////////////////////////////////////////////
+
+    /// Start or stop the per kproc type event accounting
+    void enableEventStats(bool enabled);
+    /// Reset the event counters and timings
+    void resetEventStats();
+    /// Return the event statistics grouped by kproc kind, name and location
+    std::vector<solver::KProcStats> getEventStats() const;
+
     ////////////////////////////////////////////////////////////////////////
     // SOLVER STATE ACCESS:
     //      ADVANCE
@@ -667,7 +680,19 @@ class Tetexact: public solver::API {
         return pKProcs[i]->rate();
     }
 
-    KProc* _getNext() const;
+    KProc* _selectNext() const;
+
+    inline KProc* _getNext() {
+        if (!pEventStats.enabled()) {
+            return _selectNext();
+        }
+        auto start = solver::EventStats::clock::now();
+        KProc* kp = _selectNext();
+        if (kp != nullptr) {
+            pEventStats.addSelect(kp->schedIDX(), start);
+        }
+        return kp;
+    }
 
     // void _reset();
 
@@ -760,6 +785,12 @@ class Tetexact: public solver::API {
     // Now stored as base pointer
     util::strongid_vector<tetrahedron_global_id, Tet*> pTets;
 
+    // Per kproc type event accounting, disabled by default
+    solver::EventStats pEventStats;
+
+    // Return the (kind, name, location) key of each kproc, indexed by SchedIDX
+    std::vector<solver::EventStats::Key> _getEventStatsKeys();
+
     ////////////////////////////////////////////////////////////////////////
     // CR SSA Kernel Data and Methods
     ////////////////////////////////////////////////////////////////////////
@@ -867,7 +898,17 @@ class Tetexact: public solver::API {
 
     ////////////////////////////////////////////////////////////////////////////////
 
-    void _updateElement(KProc& kp);
+    void _updateElementRate(KProc& kp);
+
+    inline void _updateElement(KProc& kp) {
+        if (!pEventStats.enabled()) {
+            _updateElementRate(kp);
+            return;
+        }
+        auto start = solver::EventStats::clock::now();
+        _updateElementRate(kp);
+        pEventStats.addUpdate(kp.schedIDX(), start);
+    }
 
     inline void _updateSum() {
 #ifdef SSA_DEBUG
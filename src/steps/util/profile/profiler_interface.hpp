@@ -36,9 +36,7 @@
 #include <likwid.h>
 #endif
 
-#if defined(STEPS_REGION_TRACKER)
 #include "util/tracker/region_tracker.hpp"
-#endif
 
 namespace steps {
 
@@ -305,15 +303,24 @@ struct Likwid {
 
 #endif
 
-#if defined(STEPS_REGION_TRACKER)
-
+/*! \struct StepsTracker
+ *  \brief Native STEPS region tracker.
+ *
+ *  Always compiled in but only active when enabled at runtime (e.g. from python
+ *  with Simulation.profile()). Building with STEPS_REGION_TRACKER enables it from
+ *  the start and prints a summary on finalization.
+ */
 struct StepsTracker {
     inline static void phase_begin(const char* name) {
-        util::RegionTracker::start(name);
+        if (util::RegionTracker::enabled()) {
+            util::RegionTracker::start(name);
+        }
     };
 
     inline static void phase_end(const char* name) {
-        util::RegionTracker::stop(name);
+        if (util::RegionTracker::enabled()) {
+            util::RegionTracker::stop(name);
+        }
     };
 
     inline static void start_profile(){};
@@ -322,15 +329,18 @@ struct StepsTracker {
 
     inline static void init_profile() {
         util::RegionTracker::init();
+#if defined(STEPS_REGION_TRACKER)
+        util::RegionTracker::enable(true);
+#endif
     };
 
     inline static void finalize_profile() {
+#if defined(STEPS_REGION_TRACKER)
         util::RegionTracker::print();
+#endif
     };
 };
 
-#endif
-
 struct NullInstrumentor {
     inline static void phase_begin(const char* /* name */){};
     inline static void phase_end(const char* /* name */){};
@@ -356,9 +366,7 @@ using InstrumentorImpl = detail::Instrumentor<
 #if defined(LIKWID_PERFMON)
     detail::Likwid,
 #endif
-#if defined(STEPS_REGION_TRACKER)
     detail::StepsTracker,
-#endif
     detail::NullInstrumentor>;
 }  // namespace detail
 
@@ -8,7 +8,10 @@
 
 #include <array>
 #include <iomanip>
+#include <set>
+#include <string>
 #include <utility>
+#include <vector>
 
 #include "peak_rss.hpp"
 
@@ -25,7 +28,20 @@ void RegionTracker::init() {}
 
 void RegionTracker::init_region(const std::string& regionName) {
     regions_.insert(
-        {regionName, RegionTracker::tracking_t{0, 0, 0, 0, TimeTracker(), MemoryTracker()}});
+        {regionName,
+         RegionTracker::tracking_t{0, 0, 0, 0, TimeTracker(), MemoryTracker(), false}});
+}
+
+void RegionTracker::enable(bool enabled, bool trace) {
+    enabled_ = enabled;
+    trace_ = enabled && trace;
+}
+
+void RegionTracker::reset() {
+    // regions that are still running will be ignored by stop()
+    regions_.clear();
+    events_.clear();
+    epoch_ = std::chrono::steady_clock::now();
 }
 
 void RegionTracker::start(const std::string& regionName) {
@@ -37,14 +53,20 @@ void RegionTracker::start(const std::string& regionName) {
         start(regionName);
     } else {
         // start memory and time tracker (time second!)
+        std::get<tracking::active>(reg->second) = true;
         std::get<tracking::memTracker>(reg->second).start();
         std::get<tracking::timTracker>(reg->second).start();
     }
 }
 
 void RegionTracker::stop(const std::string& regionName) {
-    // stop time and mem tracker (time first!)
+    // ignore regions that were started before the tracker was enabled
     auto reg = regions_.find(regionName);
+    if (reg == regions_.end() || !std::get<tracking::active>(reg->second)) {
+        return;
+    }
+    std::get<tracking::active>(reg->second) = false;
+    // stop time and mem tracker (time first!)
     std::get<tracking::timTracker>(reg->second).stop();
     std::get<tracking::memTracker>(reg->second).stop();
 
@@ -58,6 +80,126 @@ void RegionTracker::stop(const std::string& regionName) {
     // memory delta (MB)
     std::get<tracking::memoryDelta>(
         reg->second) += std::get<tracking::memTracker>(reg->second).diff() * 1.0e-6;
+
+    if (trace_) {
+        const auto& tt = std::get<tracking::timTracker>(reg->second);
+        const auto start =
+            std::chrono::duration_cast<std::chrono::microseconds>(tt.start_time() - epoch_);
+        events_.push_back(
+            {regionName, static_cast<double>(start.count()), tt.diff() * 1.0e6});
+    }
+}
+
+std::vector<RegionStats> RegionTracker::stats() {
+    std::vector<RegionStats> res;
+    res.reserve(regions_.size());
+    for (const auto& reg: regions_) {
+        const auto& t = reg.second;
+        res.push_back({reg.first,
+                       std::get<tracking::count>(t),
+                       std::get<tracking::time>(t),
+                       std::get<tracking::time>(t),
+                       std::get<tracking::time>(t),
+                       std::get<tracking::memory>(t),
+                       std::get<tracking::memory>(t),
+                       std::get<tracking::memory>(t),
+                       std::get<tracking::memoryDelta>(t),
+                       std::get<tracking::memoryDelta>(t),
+                       std::get<tracking::memoryDelta>(t)});
+    }
+#ifdef STEPS_USE_MPI
+    int initialized, finalized;
+    MPI_Initialized(&initialized);
+    MPI_Finalized(&finalized);
+    if (initialized == 0 || finalized != 0 || comm_ == MPI_COMM_NULL) {
+        return res;
+    }
+    int n_ranks;
+    MPI_Comm_size(comm_, &n_ranks);
+
+    // Ranks do not necessarily track the same regions, gather all region names so that every
+    // rank reduces over the same sorted list. Names are sent as null terminated strings.
+    std::string names;
+    for (const auto& reg: regions_) {
+        names += reg.first;
+        names += '\0';
+    }
+    int names_size = static_cast<int>(names.size());
+    std::vector<int> sizes(n_ranks), offsets(n_ranks, 0);
+    MPI_Allgather(&names_size, 1, MPI_INT, sizes.data(), 1, MPI_INT, comm_);
+    for (int r = 1; r < n_ranks; ++r) {
+        offsets[r] = offsets[r - 1] + sizes[r - 1];
+    }
+    std::vector<char> all_names(static_cast<std::size_t>(offsets.back() + sizes.back()));
+    MPI_Allgatherv(names.data(),
+                   names_size,
+                   MPI_CHAR,
+                   all_names.data(),
+                   sizes.data(),
+                   offsets.data(),
+                   MPI_CHAR,
+                   comm_);
+    std::set<std::string> all_regions;
+    for (std::size_t start = 0; start < all_names.size();) {
+        std::string name(&all_names[start]);
+        start += name.size() + 1;
+        all_regions.insert(std::move(name));
+    }
+
+    // Regions that were not tracked on this rank count as zeros
+    res.clear();
+    res.reserve(all_regions.size());
+    for (const auto& name: all_regions) {
+        auto reg = regions_.find(name);
+        if (reg != regions_.end()) {
+            const auto& t = reg->second;
+            res.push_back({name,
+                           std::get<tracking::count>(t),
+                           std::get<tracking::time>(t),
+                           std::get<tracking::time>(t),
+                           std::get<tracking::time>(t),
+                           std::get<tracking::memory>(t),
+                           std::get<tracking::memory>(t),
+                           std::get<tracking::memory>(t),
+                           std::get<tracking::memoryDelta>(t),
+                           std::get<tracking::memoryDelta>(t),
+                           std::get<tracking::memoryDelta>(t)});
+        } else {
+            res.push_back({name, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0});
+        }
+    }
+
+    constexpr std::size_t stat_size = 3;
+    const std::size_t n = res.size() * stat_size;
+    std::vector<double> data(n), data_min(n), data_max(n), data_sum(n);
+    for (std::size_t i = 0; i < res.size(); ++i) {
+        data[i * stat_size + tracking::time] = res[i].time_avg;
+        data[i * stat_size + tracking::memory] = res[i].memory_avg;
+        data[i * stat_size + tracking::memoryDelta] = res[i].memoryDelta_avg;
+    }
+    MPI_Allreduce(data.data(), data_min.data(), static_cast<int>(n), MPI_DOUBLE, MPI_MIN, comm_);
+    MPI_Allreduce(data.data(), data_max.data(), static_cast<int>(n), MPI_DOUBLE, MPI_MAX, comm_);
+    MPI_Allreduce(data.data(), data_sum.data(), static_cast<int>(n), MPI_DOUBLE, MPI_SUM, comm_);
+    for (std::size_t i = 0; i < res.size(); ++i) {
+        const auto* mn = &data_min[i * stat_size];
+        const auto* mx = &data_max[i * stat_size];
+        const auto* sm = &data_sum[i * stat_size];
+        res[i].time_min = mn[tracking::time];
+        res[i].time_max = mx[tracking::time];
+        res[i].time_avg = sm[tracking::time] / n_ranks;
+        res[i].memory_min = mn[tracking::memory];
+        res[i].memory_max = mx[tracking::memory];
+        res[i].memory_avg = sm[tracking::memory] / n_ranks;
+        res[i].memoryDelta_min = mn[tracking::memoryDelta];
+        res[i].memoryDelta_max = mx[tracking::memoryDelta];
+        res[i].memoryDelta_avg = sm[tracking::memoryDelta] / n_ranks;
+    }
+#endif
+    return res;
+}
+
+const std::vector<RegionEvent>& RegionTracker::events() {
+    return events_;
 }
 
 RegionTracker::tracking_t RegionTracker::get(const std::string& regionName) {
@@ -120,6 +262,10 @@ void RegionTracker::print(std::ostream& os) {
 
 // static members init
 std::map<std::string, RegionTracker::tracking_t> RegionTracker::regions_{};
+std::vector<RegionEvent> RegionTracker::events_{};
+std::chrono::steady_clock::time_point RegionTracker::epoch_ = std::chrono::steady_clock::now();
+bool RegionTracker::trace_ = false;
+bool RegionTracker::enabled_ = false;
 
 #ifdef STEPS_USE_MPI
 MPI_Comm RegionTracker::comm_ = MPI_COMM_NULL;
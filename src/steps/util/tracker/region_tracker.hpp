@@ -8,6 +8,7 @@
 #include "memory_tracker.hpp"
 #include "time_tracker.hpp"
 
+#include <chrono>
 #include <cstddef>
 #include <cstdint>
 #include <iostream>
@@ -15,27 +16,58 @@
 #ifdef STEPS_USE_MPI
 #include <mpi.h>
 #endif
+#include <string>
 #include <tuple>
+#include <vector>
 
 namespace steps::util {
 
+/*
+ * Statistics of a region, time is in seconds and memory in MB
+ * min/max/avg are computed across mpi ranks
+ */
+struct RegionStats {
+    std::string name;
+    std::uint32_t count;
+    double time_min, time_max, time_avg;
+    double memory_min, memory_max, memory_avg;
+    double memoryDelta_min, memoryDelta_max, memoryDelta_avg;
+};
+
+/*
+ * Single execution of a region, start and duration are in microseconds,
+ * start is relative to the last reset of the tracker
+ */
+struct RegionEvent {
+    std::string name;
+    double start;
+    double duration;
+};
 
 class RegionTracker {
     using tracking_t =
-        std::tuple<double, double, double, std::uint32_t, TimeTracker, MemoryTracker>;
+        std::tuple<double, double, double, std::uint32_t, TimeTracker, MemoryTracker, bool>;
 
   private:
-    enum tracking { time, memory, memoryDelta, count, timTracker, memTracker };
+    enum tracking { time, memory, memoryDelta, count, timTracker, memTracker, active };
 
     // region name -> tracking tuple
     static std::map<std::string, tracking_t> regions_;
 
+    // recorded region executions, only filled when tracing is enabled
+    static std::vector<RegionEvent> events_;
+    static std::chrono::steady_clock::time_point epoch_;
+    static bool trace_;
+
 #ifdef STEPS_USE_MPI
     // MPI communicator
     static MPI_Comm comm_;
 #endif
 
   public:
+    // runtime switch, regions are only tracked when enabled
+    static bool enabled_;
+
 #ifdef STEPS_USE_MPI
     static void init(MPI_Comm comm = MPI_COMM_WORLD);
 #else
@@ -46,6 +78,20 @@ class RegionTracker {
     static void stop(const std::string& name);
     static tracking_t get(const std::string& name);
     static void print(std::ostream& os = std::cout);
+
+    static inline bool enabled() noexcept {
+        return enabled_;
+    }
+    static void enable(bool enabled, bool trace = false);
+    static void reset();
+
+    /*
+     * Return the statistics of all regions tracked on any rank, sorted by name. Regions that
+     * were not tracked on a rank count as zeros for that rank. Collective call when MPI is
+     * initialized
+     */
+    static std::vector<RegionStats> stats();
+    static const std::vector<RegionEvent>& events();
 };
 
 }  // namespace steps::util
@@ -19,7 +19,7 @@ void TimeTracker::stop() {
  * return value is in seconds
  */
 
-double TimeTracker::diff() {
+double TimeTracker::diff() const {
     return static_cast<double>(
                std::chrono::duration_cast<std::chrono::microseconds>(final_ - init_).count()) *
            1e-6;
@@ -16,7 +16,10 @@ class TimeTracker {
   public:
     void start();
     void stop();
-    double diff();
+    double diff() const;
+    std::chrono::steady_clock::time_point start_time() const noexcept {
+        return init_;
+    }
 
   private:
     std::chrono::steady_clock::time_point init_{};
@@ -74,11 +74,35 @@ class MeshctrlUtilityTestCase(unittest.TestCase):
             print(coords_2)
             self.assertTrue(np.allclose(coords_1, coords_2))
 
+    def testFindOverlapSurfTrisTolerance(self):
+        exact = meshctrl.findOverlapSurfTris(self.left_mesh, self.right_mesh)
+        close = meshctrl.findOverlapSurfTris(self.left_mesh, self.right_mesh, tolerance=1e-12)
+        self.assertEqual([c[:4] for c in exact], [c[:4] for c in close])
+        self.assertTrue(np.allclose([c[4] for c in exact], [c[4] for c in close]))
+
+        tets1, tris1, tets2, tris2, dists = meshctrl.findOverlapSurfTrisNP(self.left_mesh, self.right_mesh)
+        self.assertEqual(list(tris1), [c[1] for c in exact])
+        self.assertEqual(list(tris2), [c[3] for c in exact])
+
+        # A large tolerance matches all pairs of surface triangles
+        n1 = len(self.left_mesh.getSurfTris())
+        n2 = len(self.right_mesh.getSurfTris())
+        allPairs = meshctrl.findOverlapSurfTris(self.left_mesh, self.right_mesh, tolerance=1.0)
+        self.assertEqual(len(allPairs), n1 * n2)
+
+        with self.assertRaises(ValueError):
+            meshctrl.findOverlapSurfTris(self.left_mesh, self.right_mesh, tolerance=-1)
+
     def testFindSurfTris(self):
         comp_surf_tris = meshctrl.findSurfTrisInComp(self.combine_mesh, self.test_comp)
         tet_surf_tris = meshctrl.findSurfTrisInTets(self.combine_mesh, range(12))
         self.assertTrue(np.array_equal(np.sort(comp_surf_tris), np.sort(comp_surf_tris)))
         self.assertEqual(len(tet_surf_tris), 10)
+        self.assertTrue(np.array_equal(meshctrl.findSurfTrisInTetsNP(self.combine_mesh, np.arange(12)), np.sort(tet_surf_tris)))
+        self.assertTrue(np.array_equal(
+            meshctrl.findOverlapTrisNP(self.combine_mesh, np.arange(12), np.arange(12, 24)),
+            np.sort(meshctrl.findOverlapTris(self.combine_mesh, range(12), range(12, 24)))
+        ))
 
 def suite():
     all_tests = []
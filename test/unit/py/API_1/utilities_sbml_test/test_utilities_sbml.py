@@ -0,0 +1,128 @@
+####################################################################################
+#
+#    STEPS - STochastic Engine for Pathway Simulation
+#    Copyright (C) 2007-2023 Okinawa Institute of Science and Technology, Japan.
+#    Copyright (C) 2003-2006 University of Antwerp, Belgium.
+#
+#    See the file AUTHORS for details.
+#    This file is part of STEPS.
+#
+#    STEPS is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License version 3,
+#    as published by the Free Software Foundation.
+#
+#    STEPS is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#################################################################################
+###
+
+# Test the compilation of MathML lists in steps.utilities.sbml.
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+import unittest
+
+from steps.utilities import sbml
+
+class CompileMLTestCase(unittest.TestCase):
+    """
+    Test that compileML gives the same results as MLfunc.
+    """
+    def setUp(self):
+        # name -> [value, factor]
+        self.refs = {
+            'k1': [2.5, 0],
+            'k2': [4.0, 2.0],
+            'S1': [1e-3, 1e-3],
+            'zero': [0.0, 0],
+            'time': [0.75, 0],
+        }
+
+    def assertSameResult(self, level, refs=None):
+        refs = self.refs if refs is None else refs
+        expected = sbml.MLfunc(level, refs)
+        val = sbml.compileML(level)(refs)
+        self.assertEqual(type(val), type(expected))
+        self.assertEqual(val, expected)
+
+    def testLeaves(self):
+        self.assertSameResult(3.5)
+        self.assertSameResult(2)
+        self.assertSameResult('k1')
+        self.assertSameResult('k2')
+
+    def testOperators(self):
+        for op in ['+', '*', '-', 'power', 'root', 'lt', 'leq', 'gt', 'geq', 'eq', 'neq', 'and', 'or']:
+            with self.subTest(op=op):
+                self.assertSameResult([op, ['k1', 'k2']])
+                self.assertSameResult([op, ['S1', 0.5]])
+        for func in ['exp', 'abs', 'ln', 'log', 'floor', 'ceiling', 'sin', 'cos', 'tan', 'sinh',
+                     'cosh', 'tanh', 'arcsin', 'arccos', 'arctan', 'not']:
+            with self.subTest(func=func):
+                self.assertSameResult([func, ['time']])
+
+    def testDivision(self):
+        self.assertSameResult(['/', ['k1', 'k2']])
+        self.assertSameResult(['/', [['+', ['k1', 1]], ['-', ['k2', 'S1']]]])
+        # Null denominators give 0 as in MLfunc
+        self.assertSameResult(['/', ['k1', 'zero']])
+        self.assertSameResult(['/', ['k1', ['-', ['k1', 'k1']]]])
+        # The numerator should not be evaluated when the denominator is null
+        self.assertSameResult(['/', [['ln', ['zero']], 'zero']])
+        self.assertSameResult(['/', ['unknown', 'zero']])
+        with self.assertRaises(NotImplementedError):
+            sbml.compileML(['/', ['unknown', 'k1']])(self.refs)
+
+    def testPiecewise(self):
+        # (value, condition) pairs followed by the default value
+        level = ['piecewise', [
+            'k1', ['lt', ['time', 0.5]],
+            ['*', ['k1', 2]], ['lt', ['time', 1.0]],
+            ['/', ['k1', 'zero']]
+        ]]
+        for t in [0.25, 0.75, 1.5]:
+            refs = dict(self.refs, time=[t, 0])
+            with self.subTest(time=t):
+                self.assertSameResult(level, refs)
+        # Only the selected branch is evaluated
+        self.assertSameResult(['piecewise', ['k1', ['gt', ['k1', 0]], ['ln', ['zero']]]])
+
+    def testNestedFunctions(self):
+        # Expanded SBML function definitions (lambdas) give nested lists
+        inner = ['/', [['*', ['k1', 'S1']], ['+', ['k2', 'S1']]]]
+        middle = ['piecewise', [inner, ['gt', [inner, 0.0]], ['-', [0, inner]]]]
+        outer = ['+', [['power', [middle, 2]], ['exp', [['/', [middle, ['-', ['k2', 'k2']]]]]]]]
+        self.assertSameResult(outer)
+        for s1 in [0.0, 1e-3, 5.0]:
+            refs = dict(self.refs, S1=[s1, 1e-3])
+            with self.subTest(S1=s1):
+                self.assertSameResult(outer, refs)
+
+    def testDeepNesting(self):
+        level = 'k1'
+        for i in range(200):
+            level = ['+', [level, 1]]
+        self.assertSameResult(level)
+
+    def testErrors(self):
+        f = sbml.compileML(['+', ['k1', 'unknown']])
+        with self.assertRaises(NotImplementedError):
+            f(self.refs)
+        f = sbml.compileML(['unknownOp', ['k1']])
+        with self.assertRaises(NotImplementedError):
+            f(self.refs)
+
+
+def suite():
+    all_tests = []
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(CompileMLTestCase))
+    return unittest.TestSuite(all_tests)
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite())
@@ -24,6 +24,9 @@
 
 """ Unit tests for complex reaction declaration."""
 
+import itertools
+import os
+import tempfile
 import unittest
 
 from steps import interface
@@ -540,6 +543,41 @@ class CompStateRotationalSymmetryOrdering(ComplexReacTest5Subunits):
         self.assertNotEqual(C[A1, A2, A3, B1, B2], C[A1, A2, A3, B1, B1])
 
 
+class ComplexStateEnumeration(unittest.TestCase):
+    """Test that the direct enumeration of canonical states matches the cartesian product."""
+    def _checkEnumeration(self, order, nbSubUnits, selector=None):
+        mdl = Model()
+        with mdl:
+            A1, A2, A3, A4 = SubUnitState.Create()
+            SA = SubUnit.Create([A1, A2, A3, A4])
+            CC = Complex.Create([SA] * nbSubUnits, statesAsSpecies=True, order=order)
+
+            sel = CC[...] if selector is None else selector(CC, A1, A2, A3, A4)
+            expected = set()
+            for ss in sel._subSels:
+                for comb in itertools.product(*[sus._states for sus in ss]):
+                    expected.add(ComplexState(CC, comb))
+            states = list(sel)
+            self.assertEqual(len(states), len(set(states)))
+            self.assertEqual(set(states), expected)
+            self.assertEqual(states, sorted(states, key=lambda s: s.name))
+            return len(states)
+
+    def testStrongOrdering(self):
+        self.assertEqual(self._checkEnumeration(StrongOrdering, 5), 4 ** 5)
+        self._checkEnumeration(StrongOrdering, 5, lambda C, A1, A2, A3, A4: C[A1, ..., A2|A3])
+
+    def testNoOrdering(self):
+        self.assertEqual(self._checkEnumeration(NoOrdering, 6), 84)
+        self._checkEnumeration(NoOrdering, 6, lambda C, A1, A2, A3, A4: C[A1, ..., ~A2])
+        self._checkEnumeration(NoOrdering, 6, lambda C, A1, A2, A3, A4: C[A1, :, A2|A3, ...] | C[..., A4])
+
+    def testRotationalSymmetryOrdering(self):
+        self.assertEqual(self._checkEnumeration(RotationalSymmetryOrdering, 6), 700)
+        self._checkEnumeration(RotationalSymmetryOrdering, 6, lambda C, A1, A2, A3, A4: C[A1, ..., A3])
+        self._checkEnumeration(RotationalSymmetryOrdering, 5, lambda C, A1, A2, A3, A4: C[..., ~A4] | C[A2, ...])
+
+
 class CompSelNoOrdReacTestCase(ComplexReacTest5Subunits):
     """Test reaction declaration with Complex Selectors and no ordering."""
     def testFullyDeterminedFwdReac(self):
@@ -1180,6 +1218,114 @@ class SubStateNoOrdReacTestCase(ComplexReacTest5Subunits):
                         A1.s + A1.o >r[12]> A2.s + A1.s
 
 
+class ComplexExpansionCache(unittest.TestCase):
+    """Test the persistent cache of complex expansions."""
+    def setUp(self):
+        _, self.cachePath = tempfile.mkstemp(prefix=f'{self.__class__.__name__}', suffix='.json')
+        os.remove(self.cachePath)
+
+    def tearDown(self):
+        super().tearDown()
+        if os.path.isfile(self.cachePath):
+            os.remove(self.cachePath)
+
+    def _declareModel(self, order=StrongOrdering, **kwargs):
+        mdl = Model(**kwargs)
+        r = ReactionManager()
+        with mdl:
+            S1 = Species.Create()
+            A1, A2, A3, B1, B2 = SubUnitState.Create()
+            SA, B = SubUnit.Create([A1, A2, A3], [B1, B2])
+            CC = Complex.Create([SA, SA, SA, B], statesAsSpecies=True, order=order)
+            vsys = VolumeSystem.Create()
+            with vsys:
+                with CC[...]:
+                    A1 + S1 <r[1]> A2
+                    r[1].K = 1, 2
+                CC[A2, A2, :, B1] >r[2]> CC[A3, A3, :, B2]
+                r[2].K = 3
+
+        states = [cs.name for cs in CC]
+        reacs = set()
+        for reac in r[1]._getStepsObjects() + r[2]._getStepsObjects():
+            reacs.add((
+                tuple(sorted(s.getID() for s in reac.getLHS())),
+                tuple(sorted(s.getID() for s in reac.getRHS())),
+                reac.getKcst()
+            ))
+        return mdl, states, reacs
+
+    def testSameExpansion(self):
+        _, states, reacs = self._declareModel()
+        mdl1, states1, reacs1 = self._declareModel(expansionCache=self.cachePath)
+        self.assertTrue(os.path.isfile(self.cachePath))
+        self.assertGreater(len(mdl1._expansionCache), 0)
+
+        mtime = os.path.getmtime(self.cachePath)
+        mdl2, states2, reacs2 = self._declareModel(expansionCache=self.cachePath)
+        self.assertEqual(len(mdl2._expansionCache), len(mdl1._expansionCache))
+        self.assertEqual(os.path.getmtime(self.cachePath), mtime)
+
+        self.assertEqual(states, states1)
+        self.assertEqual(states, states2)
+        self.assertEqual(reacs, reacs1)
+        self.assertEqual(reacs, reacs2)
+
+    def testDeclarationChange(self):
+        mdl1, _, _ = self._declareModel(expansionCache=self.cachePath)
+        _, states, reacs = self._declareModel(order=RotationalSymmetryOrdering)
+        mdl2, states2, reacs2 = self._declareModel(
+            order=RotationalSymmetryOrdering, expansionCache=self.cachePath
+        )
+        self.assertGreater(len(mdl2._expansionCache), len(mdl1._expansionCache))
+        self.assertEqual(states, states2)
+        self.assertEqual(reacs, reacs2)
+
+    def testCustomOrderingClosure(self):
+        def makeOrdering(rotational):
+            def order(state):
+                return RotationalSymmetryOrdering(state) if rotational else StrongOrdering(state)
+            return order
+
+        # Orderings with identical code but different closures should not share expansions
+        mdl1, states1, reacs1 = self._declareModel(order=makeOrdering(False), expansionCache=self.cachePath)
+        mdl2, states2, reacs2 = self._declareModel(order=makeOrdering(True), expansionCache=self.cachePath)
+        self.assertGreater(len(mdl2._expansionCache), len(mdl1._expansionCache))
+        _, states, reacs = self._declareModel(order=RotationalSymmetryOrdering)
+        self.assertEqual(states, states2)
+        self.assertEqual(reacs, reacs2)
+        self.assertNotEqual(states1, states2)
+
+        # Same for default arguments
+        def order(state, rotational=False):
+            return RotationalSymmetryOrdering(state) if rotational else StrongOrdering(state)
+        _, states3, _ = self._declareModel(order=order, expansionCache=self.cachePath)
+        self.assertEqual(states1, states3)
+        order.__defaults__ = (True,)
+        _, states4, reacs4 = self._declareModel(order=order, expansionCache=self.cachePath)
+        self.assertEqual(states, states4)
+        self.assertEqual(reacs, reacs4)
+
+    def testUncacheableOrdering(self):
+        class Flag:
+            rotational = True
+        flag = Flag()
+        def order(state):
+            return RotationalSymmetryOrdering(state) if flag.rotational else StrongOrdering(state)
+
+        mdl, states, reacs = self._declareModel(order=order, expansionCache=self.cachePath)
+        self.assertEqual(len(mdl._expansionCache), 0)
+        self.assertEqual(states, self._declareModel(order=RotationalSymmetryOrdering)[1])
+
+    def testInvalidCacheFile(self):
+        with open(self.cachePath, 'wb') as f:
+            f.write(b'not a cache')
+        with self.assertWarns(Warning):
+            _, states, _ = self._declareModel(expansionCache=self.cachePath)
+        self.assertEqual(states, self._declareModel()[1])
+        mdl, _, _ = self._declareModel(expansionCache=self.cachePath)
+        self.assertGreater(len(mdl._expansionCache), 0)
+
 
 def suite():
     all_tests = []
@@ -1189,8 +1335,10 @@ def suite():
     all_tests.append(unittest.TestLoader().loadTestsFromTestCase(CompStateNoOrdering))
     all_tests.append(unittest.TestLoader().loadTestsFromTestCase(CompStateStrongOrdering))
     all_tests.append(unittest.TestLoader().loadTestsFromTestCase(CompStateRotationalSymmetryOrdering))
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(ComplexStateEnumeration))
     all_tests.append(unittest.TestLoader().loadTestsFromTestCase(CompSelNoOrdReacTestCase))
     all_tests.append(unittest.TestLoader().loadTestsFromTestCase(SubStateNoOrdReacTestCase))
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(ComplexExpansionCache))
     return unittest.TestSuite(all_tests)
 
 if __name__ == "__main__":
@@ -581,6 +581,7 @@ del test_tetMesh.tetMeshTests.testGmshLoading
 del test_tetMesh.tetMeshTests.testTetGenLoading
 del test_tetMesh.tetMeshTests.testAbaqusLoading
 del test_tetMesh.tetMeshTests.testLoading
+del test_tetMesh.tetMeshTests.testMeshCache
 
 
 def suite():
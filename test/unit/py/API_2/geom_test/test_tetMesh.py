@@ -26,8 +26,11 @@
 
 import unittest
 import tempfile
+import glob
 import os
 
+import numpy
+
 from steps import interface
 
 from steps.model import *
@@ -36,7 +39,7 @@ from steps.rng import *
 from steps.sim import *
 from steps.utils import *
 
-from steps.API_1.geom import UNKNOWN_TET, UNKNOWN_TRI
+from steps.API_1.geom import INDEX_DTYPE, UNKNOWN_TET, UNKNOWN_TRI
 
 FILEDIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -156,6 +159,64 @@ class tetMeshTests(unittest.TestCase):
             self.assertEqual(set(vsys.name for vsys in newMesh2.patch1.systems), set(vsys.name for vsys in mesh.patch1.systems))
             self.assertEqual(set(tet.idx for tet in newMesh2.roi1.tets), set(tet.idx for tet in mesh.roi1.tets))
 
+    def testMeshCache(self):
+        """Test loading of tetmesh through the binary mesh cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Imported meshes, groups and blocks should be restored
+            path = os.path.join(tmpdir, 'sphere_mesh.inp')
+            with open(os.path.join(FILEDIR, 'meshes', 'sphere_mesh.inp'), 'r') as fin, open(path, 'w') as fout:
+                fout.write(fin.read())
+            mesh = TetMesh.LoadAbaqus(path, 1e-6)
+            self.assertEqual(len(glob.glob(os.path.join(tmpdir, '*.stepsmesh.npz'))), 0)
+
+            mesh = TetMesh.LoadAbaqus(path, 1e-6, cache=True)
+            self.assertEqual(len(glob.glob(os.path.join(tmpdir, '*.stepsmesh.npz'))), 1)
+            cachedMesh = TetMesh.LoadAbaqus(path, 1e-6)
+            self.assertIsNone(cachedMesh._tetProxy._stepsid)
+            self.checkIdenticalMeshes(mesh, cachedMesh)
+            for grps1, grps2 in [
+                (mesh.vertGroups, cachedMesh.vertGroups),
+                (mesh.triGroups, cachedMesh.triGroups),
+                (mesh.tetGroups, cachedMesh.tetGroups),
+            ]:
+                self.assertSetEqual(set(grps1.keys()), set(grps2.keys()))
+                for key in grps1:
+                    self.assertEqual(grps1[key].indices, grps2[key].indices)
+            tetProxy = mesh._tetProxy
+            for tet in mesh.tets[::50]:
+                importId = tetProxy.getImportID(tet.idx)
+                self.assertEqual(cachedMesh._tetProxy.getImportID(tet.idx), importId)
+                self.assertEqual(cachedMesh._tetProxy.getSTEPSID(importId), tet.idx)
+
+            # Different import parameters do not use the same cache
+            mesh2 = TetMesh.LoadAbaqus(path, 2e-6)
+            self.assertIsNotNone(mesh2._tetProxy._stepsid)
+            self.assertAlmostEqual(mesh2.tets[0].Vol / mesh.tets[0].Vol, 8)
+            nocacheMesh = TetMesh.LoadAbaqus(path, 1e-6, cache=False)
+            self.assertIsNotNone(nocacheMesh._tetProxy._stepsid)
+
+            # Compartments, patches and ROIs from XML files
+            with mesh:
+                n = len(mesh.tets)
+                c1tets, c2tets = mesh.tets[:n//2], mesh.tets[n//2:]
+                comp1 = Compartment.Create(c1tets, self.model.vsys)
+                comp2 = Compartment.Create(c2tets, self.model.vsys)
+                patch1 = Patch.Create(c1tets.surface & c2tets.surface, comp1, comp2, self.model.ssys)
+                roi1 = ROI.Create(mesh.tets[n//4:-n//4])
+            meshPath = os.path.join(tmpdir, 'meshName')
+            mesh.Save(meshPath)
+            TetMesh.Load(meshPath, cache=True)
+            newMesh = TetMesh.Load(meshPath)
+            self.checkIdenticalMeshes(mesh, newMesh)
+            self.assertEqual(set(newMesh.comp1.tets.indices), set(mesh.comp1.tets.indices))
+            self.assertEqual(set(newMesh.comp2.tets.indices), set(mesh.comp2.tets.indices))
+            self.assertEqual(set(newMesh.patch1.tris.indices), set(mesh.patch1.tris.indices))
+            self.assertEqual(newMesh.patch1.innerComp.name, 'comp1')
+            self.assertEqual(newMesh.patch1.outerComp.name, 'comp2')
+            self.assertEqual(set(s.name for s in newMesh.comp1.systems), set(s.name for s in mesh.comp1.systems))
+            self.assertEqual(set(s.name for s in newMesh.patch1.systems), set(s.name for s in mesh.patch1.systems))
+            self.assertEqual(set(newMesh.roi1.tets.indices), set(mesh.roi1.tets.indices))
+
 
     def testBasicAccess(self):
         """Test access to geometrical elements directly from the mesh."""
@@ -181,6 +242,20 @@ class tetMeshTests(unittest.TestCase):
             self.assertEqual(exp_tet, stepsMesh.findTetByPoint(pp))
             self.assertEqual(exp_tet, stepsMesh.findTetByPointLinear(pp))
             self.assertEqual(exp_tet, stepsMesh.findTetByPointWalk(pp))
+
+            # Batch search
+            tetInds = list(range(0, n, max(1, n // 50)))
+            points = [pp] + [stepsMesh.getTetBarycenter(i) for i in tetInds] + [[10, 10, 10]]
+            tets = numpy.empty(len(points), dtype=INDEX_DTYPE)
+            stepsMesh.findTetsByPointsNP(numpy.array(points, dtype=float).reshape(-1), tets)
+            self.assertEqual(list(tets), [exp_tet] + tetInds + [UNKNOWN_TET])
+            self.assertEqual(self.mesh.tets[numpy.array(points[:-1])].indices, [exp_tet] + tetInds)
+            with self.assertRaises(KeyError):
+                self.mesh.tets[numpy.array(points)]
+            with self.assertRaises(ValueError):
+                stepsMesh.findTetsByPointsNP(numpy.zeros(3 * len(points) - 1), tets)
+            with self.assertRaises(ValueError):
+                stepsMesh.findTetsByPointsNP(numpy.zeros(3), numpy.empty(0, dtype=INDEX_DTYPE))
         else:
             exp_tet = 4367
             self.assertEqual(exp_tet,self.mesh.tets[pp].idx)
@@ -188,6 +263,7 @@ class tetMeshTests(unittest.TestCase):
             exp_local_tet = 2763 if MPI.rank == 0 else UNKNOWN_TET
             self.assertEqual(exp_local_tet, stepsMesh.findLocalTetByPointLinear(pp))
             self.assertEqual(exp_local_tet, stepsMesh.findLocalTetByPointWalk(pp))
+            self.assertEqual(self.mesh.tets[numpy.array([pp, pp])].indices, [exp_tet, exp_tet])
         with self.assertRaises(KeyError):
             self.mesh.tets[10, 10, 10]
 
@@ -411,6 +487,38 @@ class tetMeshTests(unittest.TestCase):
             with self.assertRaises(Exception):
                 lst8 + lA
 
+            # test numpy array backed lists
+            nA = lstCls(numpy.array([5, 0, 3, 1, 4, 2]), self.mesh)
+            nB = lstCls(numpy.arange(8, 2, -1), self.mesh)
+            self.assertEqual(len(nA), 6)
+            self.assertEqual(nA[0], allElems[5])
+            self.assertEqual(nA[-1].idx, 2)
+            self.assertEqual(nA[1:3], lstCls([0, 3], self.mesh))
+            self.assertEqual(nA.indices, [5, 0, 3, 1, 4, 2])
+            self.assertEqual([e.idx for e in nB], [8, 7, 6, 5, 4, 3])
+            self.assertIn(allElems[3], nA)
+            self.assertNotIn(allElems[8], nA)
+            self.assertEqual(nA.index(allElems[3]), 2)
+            with self.assertRaises(ValueError):
+                nA.index(allElems[8])
+            with self.assertRaises(TypeError):
+                nA[None]
+            with self.assertRaises(TypeError):
+                lstCls(numpy.array([0.5, 1.0]), self.mesh)
+            self.assertEqual(nA, lstCls([5, 0, 3, 1, 4, 2], self.mesh))
+            self.assertEqual(hash(nA), hash(lstCls([5, 0, 3, 1, 4, 2], self.mesh)))
+            self.assertEqual(nA & nB, lstCls([5, 3, 4], self.mesh))
+            self.assertEqual(nA | lB, lstCls([5, 0, 3, 1, 4, 2, 6, 7, 8], self.mesh))
+            self.assertEqual(nA - nB, lstCls([0, 1, 2], self.mesh))
+            self.assertEqual(nA ^ nB, lstCls([0, 1, 2, 8, 7, 6], self.mesh))
+            self.assertEqual(nA + lA, lstCls([5, 0, 3, 1, 4, 2, 0, 1, 2, 3, 4, 5], self.mesh))
+            self.assertEqual(lA - lstCls(range(4, 0, -2), self.mesh), lstCls([0, 1, 3, 5], self.mesh))
+            nA.append(allElems[8])
+            self.assertIn(allElems[8], nA)
+            self.assertEqual(nA.index(allElems[8]), 6)
+            nA.remove(allElems[5])
+            self.assertNotIn(allElems[5], nA)
+
             # check immutability of mesh lists
             with self.assertRaises(Exception):
                 allElems.append(allElems[0])
@@ -516,6 +624,18 @@ class tetMeshTests(unittest.TestCase):
 
         self.assertEqual(set(lst2.surface & self.mesh.surface), set(self.mesh.surface))
 
+        # Compare with the reference-based implementations
+        if not self._distMesh:
+            lst2 = TetList(lst1)
+            lst3 = TetList(lst1)
+            lst2.dilate(3)
+            lst3._dilateFromRefs(3)
+            self.assertEqual(lst2, lst3)
+            self.assertEqual(lst2.surface, lst3._surfaceFromRefs())
+            lst2.erode(2)
+            lst3._erodeFromRefs(2)
+            self.assertEqual(lst2, lst3)
+
         with self.assertRaises(Exception):
             self.mesh.tets.dilate(1)
 
@@ -750,6 +870,59 @@ class tetMeshTests(unittest.TestCase):
 
         patch1.Area
 
+    def testLinearPartition(self):
+        """Test the linear partitioning of tetrahedrons and triangles."""
+        if self._distMesh:
+            return
+        nbins = (2, 3, 4)
+        part = LinearMeshPartition(self.mesh, *nbins, default_tris=self.mesh.surface)
+        bmin, bmax = self.mesh.bbox.min, self.mesh.bbox.max
+        d = [(bmax[i] - bmin[i]) / nbins[i] for i in range(3)]
+        for tet in self.mesh.tets[::37]:
+            inds = [min(int((tet.center[i] - bmin[i]) // d[i]), nbins[i] - 1) for i in range(3)]
+            self.assertEqual(part.tetPart[tet.idx], (inds[2] * nbins[1] + inds[1]) * nbins[0] + inds[0])
+        self.assertEqual(set(part.triPart.keys()), set(self.mesh.surface.indices))
+        for tri in self.mesh.surface:
+            self.assertEqual(part.triPart[tri.idx], part.tetPart[tri.tetNeighbs[0].idx])
+        part.validate()
+
+    def testGraphPartition(self):
+        """Test the graph based partitioning of tetrahedrons."""
+        if self._distMesh:
+            return
+        nbTets = len(self.mesh.tets)
+        for method in ['inertial', 'coordinate']:
+            unrefined = GraphPartition(self.mesh, 4, method=method, refine_passes=0)
+            part = GraphPartition(self.mesh, 4, method=method, max_imbalance=1.1, default_tris=self.mesh.surface)
+            self.assertEqual(len(part.tetPart), nbTets)
+            self.assertEqual(set(part.tetPart), set(range(4)))
+            counts = numpy.bincount(part.tetPart)
+            self.assertLessEqual(counts.max(), 1.1 * nbTets / 4 + 1)
+            cut = sum(part.commVolume.values())
+            self.assertGreater(cut, 0)
+            self.assertLessEqual(cut, sum(unrefined.commVolume.values()))
+            part.validate()
+            part.printStats()
+
+        part = GraphPartition(self.mesh, 3, weights='volume')
+        vols = numpy.array([tet.Vol for tet in self.mesh.tets])
+        loads = numpy.bincount(part.tetPart, weights=vols)
+        self.assertLessEqual(loads.max(), 1.05 * vols.sum() / 3 + vols.max())
+        part.printStats(tet_weights=vols)
+
+        weights = numpy.ones(nbTets)
+        weights[:nbTets // 2] = 3
+        part = GraphPartition(self.mesh, 2, weights=weights)
+        loads = numpy.bincount(part.tetPart, weights=weights)
+        self.assertAlmostEqual(loads[0] / loads.sum(), 0.5, delta=0.05)
+
+        with self.assertRaises(ValueError):
+            GraphPartition(self.mesh, 0)
+        with self.assertRaises(ValueError):
+            GraphPartition(self.mesh, 2, weights=[1, 2, 3])
+        with self.assertRaises(ValueError):
+            GraphPartition(self.mesh, 2, weights='area')
+
 
 def suite():
     all_tests = []
@@ -0,0 +1,152 @@
+####################################################################################
+#
+#    STEPS - STochastic Engine for Pathway Simulation
+#    Copyright (C) 2007-2023 Okinawa Institute of Science and Technology, Japan.
+#    Copyright (C) 2003-2006 University of Antwerp, Belgium.
+#
+#    See the file AUTHORS for details.
+#    This file is part of STEPS.
+#
+#    STEPS is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License version 3,
+#    as published by the Free Software Foundation.
+#
+#    STEPS is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#################################################################################
+###
+
+"""Unit tests for the run index of result selectors saved to file."""
+
+import numpy as np
+import os
+import tempfile
+import unittest
+
+from steps import interface
+
+from steps.model import *
+from steps.geom import *
+from steps.rng import *
+from steps.sim import *
+from steps.saving import *
+
+
+class RunIndexCache(unittest.TestCase):
+    """Test the index of run headers that file data accessors cache in their data handler"""
+
+    def setUp(self):
+        self.endTime = 0.1
+        self.deltaT = 0.01
+        self.nbRows = 11
+
+        self.mdl = Model()
+        r = ReactionManager()
+        with self.mdl:
+            S1, S2 = Species.Create()
+            vsys = VolumeSystem.Create()
+            with vsys:
+                S1 >r[1]> S2
+                r[1].K = 10
+
+        self.geom = Geometry()
+        with self.geom:
+            comp = Compartment.Create(vsys, 1e-18)
+
+        _, self.path = tempfile.mkstemp(prefix=f'{self.__class__.__name__}', suffix='.dat')
+
+    def tearDown(self):
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def _getSimAndSaver(self, seed=1234):
+        sim = Simulation('Wmdirect', self.mdl, self.geom, RNG('mt19937', 512, seed))
+        rs = ResultSelector(sim)
+        saver = rs.comp.LIST('S1', 'S2').Count
+        sim.toSave(saver, dt=self.deltaT)
+        saver.toFile(self.path)
+        return sim, saver
+
+    def _doRuns(self, sim, nbRuns):
+        for i in range(nbRuns):
+            sim.newRun()
+            sim.comp.S1.Count = 100
+            sim.run(self.endTime)
+        # Accessing the data writes the header of the current run and flushes the file
+        saver.data
+
+    def testBuildIndex(self):
+        sim, saver = self._getSimAndSaver()
+        self._doRuns(sim, 3)
+
+        rs = ResultSelector.FromFile(self.path)
+        handler = rs._dataHandler
+        self.assertIsNone(handler._runIndexCache)
+        self.assertEqual(len(rs.data), 3)
+
+        stamp, runs = handler._runIndexCache
+        st = os.stat(self.path)
+        self.assertEqual(stamp, (st.st_mtime_ns, st.st_size))
+        self.assertEqual([run[0] for run in runs], [0, 1, 2])
+        self.assertEqual([run[1] for run in runs], [self.nbRows] * 3)
+        # Each run points to the header of the next one, the last one points to nothing
+        self.assertEqual([run[3] for run in runs[:-1]], [run[4] for run in runs[1:]])
+        self.assertEqual(runs[-1][3], 0)
+
+    def testReadFromIndex(self):
+        sim, saver = self._getSimAndSaver()
+        self._doRuns(sim, 3)
+
+        rs = ResultSelector.FromFile(self.path)
+        len(rs.data)
+        runs = rs._dataHandler._runIndexCache[1]
+        for r in [2, 0, 1, -1]:
+            self.assertEqual(np.array(rs.data[r]).tolist(), np.array(saver.data[r]).tolist())
+            self.assertEqual(np.array(rs.time[r]).tolist(), np.array(saver.time[r]).tolist())
+        self.assertEqual(np.array(rs.data[1:, 3:5, 1]).tolist(), np.array(saver.data[1:, 3:5, 1]).tolist())
+        # The file did not change so the same index is used for all accesses
+        self.assertIs(rs._dataHandler._runIndexCache[1], runs)
+        with self.assertRaises(IndexError):
+            rs.data[3]
+
+    def testInvalidateIndex(self):
+        sim, saver = self._getSimAndSaver()
+        self._doRuns(sim, 2)
+
+        rs = ResultSelector.FromFile(self.path)
+        self.assertEqual(len(rs.data), 2)
+        oldStamp, oldRuns = rs._dataHandler._runIndexCache
+
+        # Appending a run to the file updates the index
+        self._doRuns(sim, 1)
+        self.assertEqual(len(rs.data), 3)
+        stamp, runs = rs._dataHandler._runIndexCache
+        self.assertNotEqual(stamp, oldStamp)
+        self.assertEqual([run[0] for run in runs], [0, 1, 2])
+        self.assertEqual(np.array(rs.data[2]).tolist(), np.array(saver.data[2]).tolist())
+        # Only the headers from the last known run onwards were read again
+        self.assertIs(runs[0], oldRuns[0])
+        self.assertEqual(oldRuns[1][3], 0)
+        self.assertEqual(runs[1][3], runs[2][4])
+
+        # A file that was rewritten and is smaller than before is indexed from the start
+        del sim, saver
+        sim, saver = self._getSimAndSaver(seed=42)
+        self._doRuns(sim, 1)
+        self.assertEqual(len(rs.data), 1)
+        self.assertEqual(np.array(rs.data[0]).tolist(), np.array(saver.data[0]).tolist())
+
+
+def suite():
+    all_tests = []
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(RunIndexCache))
+    return unittest.TestSuite(all_tests)
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite())
@@ -24,6 +24,7 @@
 
 """ Default model to be used for testing """
 
+import numpy
 import os
 import sys
 import unittest
@@ -701,6 +702,23 @@ class TestModelFramework(unittest.TestCase):
                 sim.TET(tet1).S1.Clamped = False
             sim.TET(tet1).S1.Count = currVal
 
+            if not self.useDist:
+                # Grouped access to lists of elements
+                tets = self.newGeom.comp1.tets[:10]
+                currVals = sim.TETS(tets).S1.Count
+                self.assertEqual(currVals, [sim.TET(tet).S1.Count for tet in tets])
+                sim.TETS(tets).S1.Count = 5
+                self.assertEqual(sim.TETS(tets).S1.Count, [5] * len(tets))
+                sim.TETS(tets).S1.Count = numpy.arange(len(tets))
+                self.assertEqual([sim.TET(tet).S1.Count for tet in tets], list(range(len(tets))))
+                # Arrays of values are not recorded as parameters
+                self.assertFalse(any(
+                    isinstance(param.value, numpy.ndarray) for param in sim._parameters.values()
+                ))
+                with self.assertRaises(SimPathInvalidPath):
+                    sim.TETS(tets).S1.Count = [1, 2]
+                sim.TETS(tets).S1.Count = currVals
+
             if not self.useDist:
                 sim.TET(tet1).vs1R1['fwd'].K = self.r01f * 2
                 self.assertAlmostEqualWThresh(sim.TET(tet1).vs1R1['fwd'].K, self.r01f * 2, self.tolerance)
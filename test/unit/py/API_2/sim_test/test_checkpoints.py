@@ -24,6 +24,7 @@
 
 """ Unit tests for data saving."""
 
+import concurrent.futures
 import os
 import tempfile
 import unittest
@@ -127,7 +128,8 @@ class WmCheckpoints(base_model.TestModelFramework):
         for name in os.listdir(tmpDir):
             if name.startswith(prefix):
                 fullPath = os.path.join(tmpDir, name)
-                run, time, solver, *cp = name[(len(prefix)+1):].split('_')
+                baseName = name[:-len('.gz')] if name.endswith('.gz') else name
+                run, time, solver, *cp = baseName[(len(prefix)+1):].split('_')
                 run = int(run)
                 time = float(time)
                 if MPI._nhosts > 1:
@@ -137,10 +139,10 @@ class WmCheckpoints(base_model.TestModelFramework):
                     self.assertGreaterEqual(rank, 0)
                     if rank != MPI._rank:
                         continue
-                    noRankPath = os.path.join(tmpDir, name[:-len(f'_{rank}')])
+                    noRankPath = os.path.join(tmpDir, baseName[:-len(f'_{rank}')])
                 else:
                     cp = cp[0]
-                    noRankPath = fullPath
+                    noRankPath = os.path.join(tmpDir, baseName)
                 self.assertEqual(cp, 'cp')
                 cpfiles.append((run, time, noRankPath, fullPath))
         cpfiles.sort()
@@ -234,6 +236,78 @@ class WmCheckpoints(base_model.TestModelFramework):
 
         self._cleanCPFiles(cpfiles)
         
+    def testBackgroundCompressedCheckpoints(self):
+        pathPrefix = getUniqueTempPrefix(prefix=f'{self.__class__.__name__}background')
+        tmpDir, prefix = os.path.split(pathPrefix)
+
+        cpres = CheckpointResults(self.newSim)
+        self.newSim.toSave(cpres)
+
+        with self.assertRaises(ValueError):
+            self.newSim.autoCheckpoint(self.cpTime, pathPrefix, keep=0)
+        with self.assertRaises(ValueError):
+            self.newSim.autoCheckpoint(self.cpTime, pathPrefix, onlyLast=True, keep=2)
+        with self.assertRaises(TypeError):
+            self.newSim.autoCheckpoint(self.cpTime, pathPrefix, results=ResultSelector(self.newSim))
+
+        keep = 3
+        self.newSim.autoCheckpoint(
+            self.cpTime, pathPrefix, keep=keep, background=True, compress=True, results=cpres
+        )
+
+        for r in range(self.nbRuns):
+            self.newSim.newRun()
+            self.newSim.run(self.endTime)
+
+        # Wait for the last checkpoint to be written
+        self.newSim.autoCheckpoint(None)
+        self.assertIsNone(self.newSim._checkpointer._executor)
+
+        names = [name for name in os.listdir(tmpDir) if name.startswith(prefix)]
+        self.assertTrue(all(name.endswith('.gz') for name in names))
+
+        cpfiles = self._getAutoCPFiles(pathPrefix)
+        self.assertEqual(len(cpfiles), keep)
+        self.assertTrue(all(run == self.nbRuns - 1 for run, *_ in cpfiles))
+        self.assertAlmostEqual(cpfiles[-1][1], self.endTime)
+
+        for run, time, cpPath, cpFullPath in cpfiles:
+            self.newSim.newRun()
+
+            self.newSim.restore(cpPath)
+
+            self.assertAlmostEqual(self.newSim.Time, time)
+
+        if MPI._shouldWrite:
+            nbCheckpoints = self.nbRuns * (self.endTime / self.cpTime + 1)
+            self.assertEqual(sum(len(times) for times in cpres.time), nbCheckpoints)
+            for data in cpres.data:
+                for stallTime, size in data:
+                    self.assertGreaterEqual(stallTime, 0)
+                    self.assertGreater(size, 0)
+
+        self._cleanCPFiles(cpfiles)
+
+    def testBackgroundWriteErrors(self):
+        pathPrefix = getUniqueTempPrefix(prefix=f'{self.__class__.__name__}backgroundErrors')
+
+        with tempfile.TemporaryDirectory() as stagingDir:
+            # The checkpoint directory does not exist so the background writes fail
+            self.newSim.autoCheckpoint(
+                self.endTime, os.path.join(pathPrefix, 'missing'), background=True, stagingDir=stagingDir
+            )
+            self.newSim.newRun()
+            with self.assertRaises(OSError):
+                self.newSim.run(self.endTime / 2)
+                # If the write was not completed at the end of the first call, the error should be
+                # raised at the end of the next call, even if it does not checkpoint
+                concurrent.futures.wait([self.newSim._checkpointer._pending])
+                self.newSim.run(self.endTime * 3 / 4)
+
+            self.newSim.autoCheckpoint(None)
+            self.assertIsNone(self.newSim._checkpointer._executor)
+            self.newSim.run(self.endTime)
+
     def testStopAutoCheckpointing(self):
         pathPrefix = getUniqueTempPrefix(prefix=f'{self.__class__.__name__}stopAutoChkpt')
 
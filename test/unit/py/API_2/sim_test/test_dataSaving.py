@@ -27,6 +27,7 @@
 import functools
 import importlib.util
 import itertools
+import math
 import numpy as np
 import operator
 import os
@@ -595,10 +596,19 @@ class SimDataSaving(base_model.TestModelFramework):
     def testDelataTSavingSQLite(self):
         self._testDeltaTSavingDB(SQLiteDBHandler, self.sqliteArgs, self.sqliteKwargs, suffix='.db')
 
+    def testDelataTSavingSQLitePacked(self):
+        kwargs = dict(self.sqliteKwargs, packRows=True, journalMode='WAL', synchronous='NORMAL')
+        self._testDeltaTSavingDB(SQLiteDBHandler, self.sqliteArgs, kwargs, suffix='.db')
+
     @unittest.skipIf(importlib.util.find_spec('h5py') is None, 'h5py not available')
     def testDeltaTSavingHDF5(self):
         self._testDeltaTSavingDB(HDF5Handler, self.hdf5Args, self.hdf5Kwargs)
 
+    @unittest.skipIf(importlib.util.find_spec('h5py') is None, 'h5py not available')
+    def testDeltaTSavingHDF5Buffered(self):
+        kwargs = dict(self.hdf5Kwargs, internalKwArgs=dict(writeBufferSize=7))
+        self._testDeltaTSavingDB(HDF5Handler, self.hdf5Args, kwargs)
+
     def _testTimepointSavingParams(self):
         timepoints = np.arange(0, self.endTime + self.deltaT, self.deltaT)
         def oldSave(sim):
@@ -642,6 +652,11 @@ class SimDataSaving(base_model.TestModelFramework):
     def testTimepointSavingHDF5(self):
         self._testTimepointSavingDB(HDF5Handler, self.hdf5Args, self.hdf5Kwargs)
 
+    @unittest.skipIf(importlib.util.find_spec('h5py') is None, 'h5py not available')
+    def testTimepointSavingHDF5Buffered(self):
+        kwargs = dict(self.hdf5Kwargs, internalKwArgs=dict(writeBufferSize=7))
+        self._testTimepointSavingDB(HDF5Handler, self.hdf5Args, kwargs)
+
     def _testUnspecifiedSavingParams(self):
         timepoints = np.arange(0, self.endTime + self.deltaT, self.deltaT)
         def oldSave(sim):
@@ -778,6 +793,65 @@ class SimDataSaving(base_model.TestModelFramework):
     def testFileSavingHDF5(self):
         self._testFileSavingDB(HDF5Handler, self.hdf5Args, self.hdf5Kwargs)
 
+    def testFileSavingCompoundObjects(self):
+        _, path = tempfile.mkstemp(prefix=f'NewData', suffix='.dat')
+        self.createdFiles.add(path)
+
+        cr = CustomResults(self.newSim, [dict, list, str, float])
+        cr.toFile(path)
+        self.newSim.toSave(cr)
+
+        def getValues(rid, i):
+            return [{'run': rid, 'ind': i}, [i] * i, f'str{i}', i / 2]
+
+        for rid in range(self.nbRuns):
+            self.newSim.newRun()
+            for i in range(10):
+                self.newSim.run(i * self.deltaT)
+                cr.save(getValues(rid, i))
+            if MPI._shouldWrite and rid == 0:
+                # Accessing data in the middle of the runs
+                self.assertEqual(list(cr.data[0, -1]), getValues(0, 9))
+
+        if MPI._shouldWrite:
+            rs = ResultSelector.FromFile(path)
+            self.assertEqual(len(rs.data), self.nbRuns)
+            for rid in range(self.nbRuns):
+                for i in range(10):
+                    self.assertEqual(list(rs.data[rid, i]), getValues(rid, i))
+                self.assertEqual(list(rs.data[rid, 2:5, 2]), [f'str{i}' for i in range(2, 5)])
+                self.assertEqual(list(rs.data[rid, :, 3]), [i / 2 for i in range(10)])
+                self.assertAlmostEqual(rs.time[rid, 3], 3 * self.deltaT)
+
+    def testFileSavingNonFloatValues(self):
+        _, path = tempfile.mkstemp(prefix=f'NewData', suffix='.dat')
+        self.createdFiles.add(path)
+
+        cr = CustomResults(self.newSim, [float, int, float])
+        cr.toFile(path)
+        self.newSim.toSave(cr)
+
+        def getValues(rid, i):
+            # Large integers and values that are not numbers cannot be stored as float64
+            return [i / 2, 2 ** 60 + 7 * rid + i, None if i % 3 == 0 else i]
+
+        for rid in range(self.nbRuns):
+            self.newSim.newRun()
+            for i in range(10):
+                self.newSim.run(i * self.deltaT)
+                cr.save(getValues(rid, i) if i != 5 else [math.nan, 1, 2])
+
+        if MPI._shouldWrite:
+            rs = ResultSelector.FromFile(path)
+            for rid in range(self.nbRuns):
+                for i in range(10):
+                    if i != 5:
+                        self.assertEqual(list(rs.data[rid, i]), getValues(rid, i))
+                self.assertTrue(math.isnan(rs.data[rid, 5, 0]))
+                self.assertEqual(list(rs.data[rid, 1:3, 1]), [2 ** 60 + 7 * rid + i for i in range(1, 3)])
+                self.assertEqual(list(rs.data[rid, -4:, 2]), [None, 7, 8, None])
+                self.assertEqual(list(rs.data[rid, :4, 0]), [i / 2 for i in range(4)])
+
     def testPartialDataReading(self):
         _, path = tempfile.mkstemp(prefix=f'NewData', suffix='.dat')
         self.createdFiles.add(path)
@@ -1376,6 +1450,92 @@ class SimDataSaving(base_model.TestModelFramework):
         if MPI._usingMPI and MPI.nhosts > 1:
             mpi4py.MPI.COMM_WORLD.barrier()
 
+    def _runWithSchedule(self, chunkSize):
+        mdl = self.get_API2_Mdl()
+        geom = self.get_API2_Geom(mdl)
+        sim = self._get_API2_Sim(mdl, geom)
+
+        rs = ResultSelector(sim)
+        saver1 = rs.comp1.S1.Count
+        saver2 = rs.comp1.S2.Count << rs.patch.ExS1S2.Count
+        saver3 = rs.comp1.S1.Count + rs.comp1.S2.Count
+        sim.toSave(saver1, dt=self.deltaT / 3)
+        sim.toSave(saver2, dt=self.deltaT)
+        sim.toSave(saver3, timePoints=[0, self.deltaT, 2.5 * self.deltaT, 2.5 * self.deltaT, self.endTime / 2])
+
+        oldChunkSize = Simulation._SAVE_SCHEDULE_CHUNK_SIZE
+        Simulation._SAVE_SCHEDULE_CHUNK_SIZE = chunkSize
+        try:
+            for i in range(self.nbRuns):
+                sim.newRun()
+                self.init_API2_sim(sim)
+                sim.run(self.endTime / 4)
+                sim.run(self.endTime)
+        finally:
+            Simulation._SAVE_SCHEDULE_CHUNK_SIZE = oldChunkSize
+
+        return [(saver.time[...], saver.data[...]) for saver in [saver1, saver2, saver3]]
+
+    def testSaveScheduleChunks(self):
+        res1 = self._runWithSchedule(2)
+        res2 = self._runWithSchedule(Simulation._SAVE_SCHEDULE_CHUNK_SIZE)
+        for (time1, data1), (time2, data2) in zip(res1, res2):
+            self.assertTrue(np.array_equal(time1, time2))
+            self.assertTrue(np.array_equal(data1, data2))
+
+        times = res1[2][0][0]
+        self.assertEqual(list(times), [0, self.deltaT, 2.5 * self.deltaT, 2.5 * self.deltaT, self.endTime / 2])
+
+    def _runEnsemble(self, workers, dbPath=None):
+        mdl = self.get_API2_Mdl()
+        geom = self.get_API2_Geom(mdl)
+        sim = self._get_API2_Sim(mdl, geom)
+
+        rs = ResultSelector(sim)
+        saver = rs.comp1.S1.Count << rs.comp1.S2.Count << rs.patch.ExS1S2.Count
+        sim.toSave(saver, dt=self.deltaT)
+
+        initInds = []
+        def init(sim, i):
+            initInds.append(i)
+            self.init_API2_sim(sim)
+
+        if dbPath is None:
+            sim.newRun()
+            sim.run(self.shortEndTime)
+            sim.runEnsemble(self.nbRuns, self.endTime, init, workers=workers)
+            return saver.time[...], saver.data[...], initInds
+        else:
+            with HDF5Handler(dbPath) as hdf:
+                sim.toDB(hdf, 'ensemble')
+                sim.runEnsemble(self.nbRuns, self.endTime, init, workers=workers)
+            with HDF5Handler(dbPath) as hdf:
+                res, = hdf['ensemble'].results
+                return res.time[...], res.data[...], initInds
+
+    @unittest.skipIf(MPI._usingMPI, 'Ensembles are not available with MPI')
+    def testRunEnsemble(self):
+        time1, data1, inds1 = self._runEnsemble(1)
+        time3, data3, inds3 = self._runEnsemble(3)
+
+        self.assertEqual(len(data1), self.nbRuns + 1)
+        self.assertEqual(inds1, list(range(self.nbRuns)))
+        # initFunc is called in worker processes
+        self.assertEqual(inds3, [])
+        self.assertTrue(np.array_equal(time1, time3))
+        self.assertTrue(np.array_equal(data1, data3))
+
+        # Different runs use independent random number streams
+        self.assertFalse(np.array_equal(data1[1], data1[2]))
+
+        if importlib.util.find_spec('h5py') is not None:
+            _, dbPath = tempfile.mkstemp(prefix=f'{self.__class__.__name__}testRunEnsemble', suffix='.h5')
+            self.createdFiles.add(dbPath)
+            os.remove(dbPath)
+            timeDB, dataDB, _ = self._runEnsemble(2, dbPath[:-3])
+            self.assertTrue(np.array_equal(time1[1:], timeDB))
+            self.assertTrue(np.array_equal(data1[1:], dataDB))
+
 
 class TetSimDataSaving(base_model.TetTestModelFramework, SimDataSaving):
     """Test data access, setting, and saving with tetmeshes."""
@@ -1585,6 +1745,57 @@ class TetSimDataSaving(base_model.TetTestModelFramework, SimDataSaving):
             for spec in tet.ALL(Species):
                 self.assertEqual(sim.TET(tet).LIST(spec).Count, self.specInds[spec] + len(self.specInds) * tet.idx)
 
+    def testVectorizedCombiners(self):
+        if self.useDist:
+            self.skipTest('Combiners are not vectorized after distribution')
+
+        def getSavers(rs):
+            S1 = rs.TETS().S1.Count
+            S2 = rs.TETS().S2.Count
+            return [
+                S1 + S2,
+                2 * S1 - S2 / 3,
+                1 / (S1 + 1) + 10 - S2,
+                rs.SUM(S1) << rs.MAX(S2) << rs.MIN(S1),
+                S1 ** 2 - rs.SUM(S2),
+                rs.JOIN([S1 * S2, S2 - S1]),
+                S2 / S1,
+            ]
+
+        savers = getSavers(ResultSelector(self.newSim))
+        self.newSim.toSave(*savers, dt=self.deltaT)
+        # Reference selectors that are not saved, and thus not vectorized
+        refSavers = getSavers(ResultSelector(self.newSim))
+
+        self.newSim.newRun()
+        self.init_API2_sim(self.newSim)
+        vals1 = list(range(len(self.newSim.geom.tets)))
+        self.newSim.TETS().S1.Count = [v + 1 for v in vals1]
+        self.newSim.TETS().S2.Count = list(reversed(vals1))
+        self.newSim.run(self.shortEndTime)
+
+        for saver, refSaver in zip(savers, refSavers):
+            # The evaluation should have been replaced by a vectorized one
+            self.assertIsNot(getattr(saver._evaluate, '__func__', None), saver.__class__._evaluate)
+            self.assertIs(refSaver._evaluate.__func__, refSaver.__class__._evaluate)
+            vectVals = list(saver._evaluate())
+            refVals = refSaver._evaluate()
+            self.assertEqual(len(vectVals), saver._getEvalLen())
+            self.assertEqual(len(refVals), len(vectVals))
+            for v1, v2 in zip(vectVals, refVals):
+                self.assertAlmostEqual(v1, v2)
+            self.assertEqual(list(saver.data[0, -1, :]), vectVals)
+
+        # Division by zero gives inf instead of raising ZeroDivisionError
+        divSaver, refDivSaver = savers[-1], refSavers[-1]
+        self.newSim.TETS().S1.Count = vals1
+        with self.assertRaises(ZeroDivisionError):
+            refDivSaver._evaluate()
+        with np.errstate(divide='ignore'):
+            divVals = list(divSaver._evaluate())
+        self.assertEqual(divVals[0], math.inf)
+        self.assertEqual(divVals[1:], [v2 / v1 for v1, v2 in zip(vals1[1:], reversed(vals1[:-1]))])
+
     @unittest.skip('Not needed here')
     def testXDMFWithoutMesh(self):
         pass
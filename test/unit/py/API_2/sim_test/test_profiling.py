@@ -0,0 +1,180 @@
+####################################################################################
+#
+#    STEPS - STochastic Engine for Pathway Simulation
+#    Copyright (C) 2007-2023 Okinawa Institute of Science and Technology, Japan.
+#    Copyright (C) 2003-2006 University of Antwerp, Belgium.
+#    
+#    See the file AUTHORS for details.
+#    This file is part of STEPS.
+#    
+#    STEPS is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License version 3,
+#    as published by the Free Software Foundation.
+#    
+#    STEPS is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#    
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#################################################################################   
+###
+
+""" Unit tests for simulation profiling."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from steps import interface
+
+from steps.model import *
+from steps.geom import *
+from steps.rng import *
+from steps.sim import *
+from steps.saving import *
+from steps.utils import *
+
+from . import base_model
+
+class TetProfiling(base_model.TetTestModelFramework):
+    """Test runtime profiling with the native region tracker and SSA event accounting"""
+    def setUp(self):
+        super().setUp()
+        self.newMdl = self.get_API2_Mdl()
+        self.newGeom = self.get_API2_Geom(self.newMdl)
+        self.createdFiles = set()
+
+    def tearDown(self):
+        super().tearDown()
+        for path in self.createdFiles:
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def _getSim(self):
+        rng = RNG('mt19937', 512, self.seed)
+        sim = Simulation('Tetexact', self.newMdl, self.newGeom, rng, self.useEField)
+        sim.newRun()
+        self.init_API2_sim(sim)
+        return sim
+
+    def _getTempPath(self):
+        _, path = tempfile.mkstemp(prefix=f'{self.__class__.__name__}', suffix='.json')
+        self.createdFiles.add(path)
+        return path
+
+    def testRegions(self):
+        sim = self._getSim()
+
+        with sim.profile() as prof:
+            for t in range(1, 6):
+                sim.run(t * self.endTime / 5)
+
+        self.assertGreater(len(prof.regions), 0)
+        self.assertEqual(prof.events, [])
+        for name, stats in prof.regions.items():
+            self.assertGreaterEqual(stats['count'], 5)
+            for key in ['time', 'memory', 'memoryDelta']:
+                self.assertLessEqual(stats[key]['min'], stats[key]['avg'])
+                self.assertLessEqual(stats[key]['avg'], stats[key]['max'])
+            self.assertGreaterEqual(stats['time']['min'], 0)
+
+        # Statistics are reset at the beginning of each profile block
+        with sim.profile() as prof2:
+            pass
+        self.assertEqual(prof2.regions, {})
+        self.assertGreater(len(prof.regions), 0)
+
+        path = self._getTempPath()
+        prof.toJSON(path)
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(data['regions'], prof.regions)
+
+        with self.assertRaises(Exception):
+            prof.toChromeTrace(self._getTempPath())
+
+    def testTrace(self):
+        sim = self._getSim()
+
+        with sim.profile(trace=True) as prof:
+            sim.run(self.endTime)
+
+        self.assertEqual(len(prof.events), sum(stats['count'] for stats in prof.regions.values()))
+        for name, start, duration in prof.events:
+            self.assertIn(name, prof.regions)
+            self.assertGreaterEqual(start, 0)
+            self.assertGreaterEqual(duration, 0)
+
+        path = self._getTempPath()
+        prof.toChromeTrace(path)
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(len(data['traceEvents']), len(prof.events))
+
+    def testNested(self):
+        sim = self._getSim()
+        with sim.profile():
+            with self.assertRaises(Exception):
+                with sim.profile():
+                    pass
+
+    def testEventStats(self):
+        sim = self._getSim()
+
+        nsteps0 = sim.stepsSolver.getNSteps()
+        with sim.eventStats() as stats:
+            sim.run(self.endTime)
+        nsteps = sim.stepsSolver.getNSteps() - nsteps0
+
+        self.assertGreater(len(stats.entries), 0)
+        self.assertEqual(sum(e['events'] for e in stats.entries), nsteps)
+        for e in stats.entries:
+            self.assertIn(e['kind'], ['Reac', 'Diff', 'SReac', 'SDiff', 'VDepSReac', 'GHKcurr'])
+            self.assertGreaterEqual(e['updateTime'], 0)
+            self.assertGreaterEqual(e['selectTime'], 0)
+
+        self.assertEqual(len(stats.ranks), 1)
+        self.assertEqual(stats.ranks[0]['events'], nsteps)
+        self.assertEqual(sum(v['events'] for v in stats.byName().values()), nsteps)
+        self.assertEqual(sum(v['updates'] for v in stats.byLocation().values()), stats.ranks[0]['updates'])
+        self.assertEqual(
+            set(stats.byLocation().keys()),
+            set(e['location'] for e in stats.entries)
+        )
+
+        report = stats.report(n=3)
+        self.assertLessEqual(len(report.splitlines()), 4)
+        with self.assertRaises(ValueError):
+            stats.report(sortBy='unknown')
+
+        path = self._getTempPath()
+        stats.toJSON(path)
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(data['ranks'], [stats.entries])
+
+        # Counters are reset at the beginning of each block and not updated outside of it
+        with sim.eventStats() as stats2:
+            pass
+        sim.run(2 * self.endTime)
+        self.assertEqual(sum(e['events'] for e in stats2.entries), 0)
+
+    def testEventStatsUnsupportedSolver(self):
+        rng = RNG('mt19937', 512, self.seed)
+        sim = Simulation('TetODE', self.newMdl, self.newGeom, rng)
+        with self.assertRaises(NotImplementedError):
+            with sim.eventStats():
+                pass
+
+
+def suite():
+    all_tests = []
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(TetProfiling))
+    return unittest.TestSuite(all_tests)
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite())
@@ -0,0 +1,208 @@
+####################################################################################
+#
+#    STEPS - STochastic Engine for Pathway Simulation
+#    Copyright (C) 2007-2023 Okinawa Institute of Science and Technology, Japan.
+#    Copyright (C) 2003-2006 University of Antwerp, Belgium.
+#
+#    See the file AUTHORS for details.
+#    This file is part of STEPS.
+#
+#    STEPS is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License version 3,
+#    as published by the Free Software Foundation.
+#
+#    STEPS is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#################################################################################
+###
+
+"""Unit tests for the frame data transport between the stepsblender data server and Blender."""
+
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import numpy as np
+import unittest
+
+from steps import interface
+
+if importlib.util.find_spec('stepsblender') is not None:
+    from stepsblender import utils as butils
+    from stepsblender.dataloader import _HDF5BlenderDataLoader
+    from stepsblender.utils import Orders, Loc
+else:
+    butils = None
+
+
+# Stub classes
+class SelectorStub(object):
+    def __init__(self, data):
+        self.data = data
+
+
+def _sharedMemoryModes():
+    if butils.shared_memory is None:
+        return [False]
+    return [False, True]
+
+
+@unittest.skipIf(butils is None, 'stepsblender not available')
+class ArrayPacking(unittest.TestCase):
+    """Test packing and unpacking of frame arrays"""
+    def setUp(self):
+        self.arrays = [
+            np.arange(10, dtype=int),
+            None,
+            np.linspace(0, 1, 7),
+            np.arange(12, dtype=np.float32).reshape(3, 4),
+            np.array([], dtype=float),
+            # Non contiguous
+            np.arange(20, dtype=float)[::3],
+        ]
+
+    def checkArrays(self, arrays):
+        self.assertEqual(len(arrays), len(self.arrays))
+        for arr, ref in zip(arrays, self.arrays):
+            if ref is None:
+                self.assertIsNone(arr)
+            else:
+                self.assertEqual(arr.dtype, ref.dtype)
+                self.assertEqual(arr.shape, ref.shape)
+                self.assertTrue((arr == ref).all())
+
+    def testPackUnpack(self):
+        for useShm in _sharedMemoryModes():
+            with self.subTest(sharedMemory=useShm):
+                block, descr = butils.packArrays(self.arrays, useShm)
+                blocks = []
+                arrays = butils.unpackArrays(descr, blocks)
+                self.checkArrays(arrays)
+                if useShm:
+                    self.assertIsNotNone(block)
+                    self.assertEqual(len(blocks), 1)
+                    # Arrays are mapped without copy
+                    self.assertFalse(any(
+                        arr.flags.owndata for arr in arrays if arr is not None and arr.size > 0
+                    ))
+                    del arrays
+                    blocks[0].close()
+                    block.close()
+                    block.unlink()
+                else:
+                    self.assertIsNone(block)
+                    self.assertEqual(blocks, [])
+
+    @unittest.skipIf(butils is None or butils.shared_memory is None, 'shared memory not available')
+    def testFrameCacheClosesBlocks(self):
+        cache = butils.FrameDataCache(maxFrames=2)
+        sentBlocks = []
+        for tind in range(5):
+            block, descr = butils.packArrays([np.full(4, tind, dtype=float)], True)
+            sentBlocks.append(block)
+            cache.add(tind, [0], [1], descr)
+            arr, = cache.get(tind, 0)
+            self.assertTrue((arr == tind).all())
+            del arr
+            self.assertLessEqual(len(cache._frames), 2)
+            # Blocks of evicted frames are closed
+            nbMapped = sum(len(blocks) for _, blocks in cache._frames.values())
+            self.assertEqual(nbMapped, min(tind + 1, 2))
+            self.assertEqual(cache._pendingBlocks, [])
+
+        self.assertIsNone(cache.get(0, 0))
+        self.assertEqual(cache.missing(0, [0, 1]), [0, 1])
+        self.assertEqual(cache.missing(4, [0, 1]), [1])
+
+        # Arrays still referenced elsewhere keep their block open until a later eviction
+        kept, = cache.get(3, 0)
+        cache.clear()
+        self.assertEqual(len(cache._pendingBlocks), 1)
+        self.assertTrue((kept == 3).all())
+        del kept
+        cache.clear()
+        self.assertEqual(cache._pendingBlocks, [])
+
+        for block in sentBlocks:
+            block.close()
+            block.unlink()
+
+
+@unittest.skipIf(butils is None, 'stepsblender not available')
+class FrameOrders(unittest.TestCase):
+    """Test the REGISTER_FRAME_DATA and GET_FRAME orders of the data server"""
+    def setUp(self):
+        self.nbTinds = 6
+        self.countData = np.random.random((1, self.nbTinds, 5))
+        self.potData = np.random.random((1, self.nbTinds, 3))
+        countSel = SelectorStub(self.countData)
+        potSel = SelectorStub(self.potData)
+
+        self.loader = _HDF5BlenderDataLoader(None, None, None, prefetch=2)
+        ldr = self.loader
+        ldr._rInd = 0
+        ldr._maxTind = self.nbTinds - 1
+        ldr._spec2Rs = {Loc.TET: {'S1': {countSel: ([10, 11, 12], [0, 2, 4])}}}
+        ldr._vertsPot = {7: (potSel, 2), 8: (potSel, 0)}
+        ldr._frameKeys = []
+        ldr._frameKeyIds = {}
+        ldr._prefetched = {}
+        ldr._sentBlocks = []
+        ldr._executor = ThreadPoolExecutor(max_workers=1)
+
+    def tearDown(self):
+        self.loader._executor.shutdown(wait=True)
+        self.loader._releaseSentBlocks()
+
+    def testRegister(self):
+        ldr = self.loader
+        kid1 = ldr._registerFrameData(Orders.GET_ELEM_SPEC_COUNT.value, 'S1', Loc.TET.value)
+        kid2 = ldr._registerFrameData(Orders.GET_VERTS_V.value, [7, 8])
+        self.assertNotEqual(kid1, kid2)
+        self.assertEqual(ldr._registerFrameData(Orders.GET_ELEM_SPEC_COUNT.value, 'S1', Loc.TET.value), kid1)
+        self.assertEqual(ldr._registerFrameData(Orders.GET_VERTS_V.value, [7, 8]), kid2)
+        with self.assertRaises(NotImplementedError):
+            ldr._registerFrameData(Orders.GET_MESH.value)
+
+    def testGetFrame(self):
+        ldr = self.loader
+        kidCnt = ldr._registerFrameData(Orders.GET_ELEM_SPEC_COUNT.value, 'S1', Loc.TET.value)
+        kidV = ldr._registerFrameData(Orders.GET_VERTS_V.value, [7, 8])
+        for useShm in _sharedMemoryModes():
+            with self.subTest(sharedMemory=useShm):
+                ldr._useSharedMemory = useShm
+                cache = butils.FrameDataCache(maxFrames=2)
+                for tind in range(self.nbTinds):
+                    ret = ldr._getFrame(tind, [kidCnt, kidV])
+                    cache.add(tind, *ret)
+                    # Upcoming frames are being prefetched
+                    self.assertEqual(
+                        set(ldr._prefetched.keys()), set(range(tind + 1, min(tind + 2, self.nbTinds - 1) + 1))
+                    )
+
+                    elems, counts = cache.get(tind, kidCnt)
+                    self.assertEqual(list(elems), [10, 11, 12])
+                    self.assertTrue((counts == self.countData[0, tind, [0, 2, 4]]).all())
+                    verts, = cache.get(tind, kidV)
+                    self.assertTrue((verts == self.potData[0, tind, [2, 0]]).all())
+                    del elems, counts, verts
+
+                    # Sent blocks are released by the server upon receiving the next order
+                    self.assertEqual(len(ldr._sentBlocks), 1 if useShm else 0)
+                    ldr._releaseSentBlocks()
+                cache.clear()
+                self.assertEqual(cache._pendingBlocks, [])
+
+
+def suite():
+    all_tests = []
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(ArrayPacking))
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(FrameOrders))
+    return unittest.TestSuite(all_tests)
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite())
@@ -251,6 +251,53 @@ class HDF5CompoundObjects(unittest.TestCase):
         ]
         self.checkWriteRead(data, multi=True)
 
+    @unittest.skipIf(importlib.util.find_spec('h5py') is None, 'h5py not available')
+    def testBufferedWriteReadMany(self):
+        import h5py
+
+        _, path = tempfile.mkstemp(prefix=f'{self.__class__.__name__}testFile', suffix='.h5')
+        self.createdFiles.add(path)
+
+        DTPE = _HDF5CompoundObjHandler._DATA_TYPE
+        data = [
+            'string',
+            2,
+            6.25,
+            list(range(10)),
+            {},
+            [{j: [1 / (k + 1) for k in range(1 + 2*j)] for j in range(i + 5)} for i in range(10)],
+            {f'{i}': [f'Elem{j}' for j in range(i)] for i in range(5)},
+        ]
+
+        groupname = 'testgroup'
+        with h5py.File(path, 'w') as f:
+            grp = f.create_group(groupname)
+            compObjHandler = _HDF5CompoundObjHandler(
+                grp, DbhStub(grp), cachedTypes=[DTPE.INT, DTPE.STRING, DTPE.LIST, DTPE.DICT]
+            )
+
+            inds = [compObjHandler.write(obj, flush=False) for obj in data]
+            # Nothing should have been written to file yet
+            self.assertEqual(len(grp['CompoundObjects/CompObjs']), 0)
+            compObjHandler.flush()
+            self.assertEqual(len(grp['CompoundObjects/CompObjs']), max(inds) + 1)
+
+            inds.append(compObjHandler.write(data[-1], flush=False))
+            # Reading flushes the buffers
+            self.assertEqual(compObjHandler.read(inds[-1]), data[-1])
+
+        with h5py.File(path, 'r') as f:
+            grp = f[groupname]
+            compObjHandler = _HDF5CompoundObjHandler(grp, DbhStub(grp), readOnly=True)
+
+            allInds = [-1] + inds + inds[::-1]
+            objs = compObjHandler.readMany(allInds)
+            self.assertEqual(objs, [compObjHandler.read(ind) for ind in allInds])
+            self.assertEqual(objs, [None] + data + [data[-1]] + [data[-1]] + data[::-1])
+
+            with self.assertWarns(Warning):
+                self.assertEqual(compObjHandler.readMany([inds[0], max(inds) + 10]), [data[0], None])
+
 
 def suite():
     all_tests = []
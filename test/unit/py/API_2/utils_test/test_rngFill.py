@@ -0,0 +1,150 @@
+####################################################################################
+#
+#    STEPS - STochastic Engine for Pathway Simulation
+#    Copyright (C) 2007-2023 Okinawa Institute of Science and Technology, Japan.
+#    Copyright (C) 2003-2006 University of Antwerp, Belgium.
+#
+#    See the file AUTHORS for details.
+#    This file is part of STEPS.
+#
+#    STEPS is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License version 3,
+#    as published by the Free Software Foundation.
+#
+#    STEPS is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#################################################################################
+###
+
+"""Unit tests for the bulk fill methods of random number generators."""
+
+import numpy as np
+import unittest
+
+from steps import interface
+
+from steps.rng import *
+
+
+class RNGFill(unittest.TestCase):
+    """Test that fill methods give the same numbers as repeated calls to the scalar getters"""
+
+    def setUp(self):
+        self.n = 1000
+        self.algos = ['mt19937', 'r123']
+        self.lambdas = np.linspace(0.1, 50, self.n)
+        self.ts = np.arange(self.n, dtype=np.uintc) % 40
+        self.ps = np.linspace(0, 1, self.n)
+
+    def _rngPair(self, algo):
+        return RNG(algo, 512, 1234), RNG(algo, 512, 1234)
+
+    def testFillUnfIE(self):
+        for algo in self.algos:
+            with self.subTest(algo=algo):
+                rng1, rng2 = self._rngPair(algo)
+                out = np.empty(self.n)
+                rng1.fillUnfIE(out)
+                self.assertEqual(list(out), [rng2.getUnfIE() for i in range(self.n)])
+                self.assertTrue(((out >= 0) & (out < 1)).all())
+                # Both generators are left in the same state
+                self.assertEqual(rng1.get(), rng2.get())
+
+    def testFillExp(self):
+        for algo in self.algos:
+            with self.subTest(algo=algo):
+                rng1, rng2 = self._rngPair(algo)
+                out = np.empty(self.n)
+                rng1.fillExp(2.5, out)
+                self.assertEqual(list(out), [rng2.getExp(2.5) for i in range(self.n)])
+                self.assertEqual(rng1.get(), rng2.get())
+
+    def testFillPsn(self):
+        for algo in self.algos:
+            with self.subTest(algo=algo):
+                rng1, rng2 = self._rngPair(algo)
+                out = np.empty(self.n, dtype=np.uintc)
+                rng1.fillPsn(self.lambdas, out)
+                self.assertEqual(list(out), [rng2.getPsn(lmbd) for lmbd in self.lambdas])
+                self.assertEqual(rng1.get(), rng2.get())
+
+    def testFillBinom(self):
+        for algo in self.algos:
+            with self.subTest(algo=algo):
+                rng1, rng2 = self._rngPair(algo)
+                out = np.empty(self.n, dtype=np.uintc)
+                rng1.fillBinom(self.ts, self.ps, out)
+                self.assertEqual(list(out), [rng2.getBinom(t, p) for t, p in zip(self.ts, self.ps)])
+                self.assertTrue((out <= self.ts).all())
+                self.assertEqual(rng1.get(), rng2.get())
+
+    def testFillStdNrm(self):
+        for algo in self.algos:
+            with self.subTest(algo=algo):
+                rng1, rng2 = self._rngPair(algo)
+                out = np.empty(self.n)
+                rng1.fillStdNrm(out)
+                self.assertEqual(list(out), [rng2.getStdNrm() for i in range(self.n)])
+                self.assertEqual(rng1.get(), rng2.get())
+
+    def testEmptyArrays(self):
+        rng1, rng2 = self._rngPair('mt19937')
+        rng1.fillUnfIE(np.empty(0))
+        rng1.fillExp(1.0, np.empty(0))
+        rng1.fillPsn(np.empty(0), np.empty(0, dtype=np.uintc))
+        rng1.fillBinom(np.empty(0, dtype=np.uintc), np.empty(0), np.empty(0, dtype=np.uintc))
+        rng1.fillStdNrm(np.empty(0))
+        # No number was drawn
+        self.assertEqual(rng1.get(), rng2.get())
+
+    def testWrongDtypes(self):
+        rng = RNG('mt19937', 512, 1234)
+        with self.assertRaises(ValueError):
+            rng.fillUnfIE(np.empty(10, dtype=np.float32))
+        with self.assertRaises(ValueError):
+            rng.fillExp(1.0, np.empty(10, dtype=int))
+        with self.assertRaises(ValueError):
+            rng.fillStdNrm(np.empty(10, dtype=np.uintc))
+        with self.assertRaises(ValueError):
+            rng.fillPsn(np.ones(10), np.empty(10))
+        with self.assertRaises(ValueError):
+            rng.fillPsn(np.ones(10, dtype=np.uintc), np.empty(10, dtype=np.uintc))
+        with self.assertRaises(ValueError):
+            rng.fillBinom(np.ones(10), np.ones(10), np.empty(10, dtype=np.uintc))
+        with self.assertRaises(ValueError):
+            rng.fillBinom(np.ones(10, dtype=np.uintc), np.ones(10), np.empty(10))
+        # Multi-dimensional and read-only arrays are rejected
+        with self.assertRaises(ValueError):
+            rng.fillUnfIE(np.empty((2, 5)))
+        out = np.empty(10)
+        out.flags.writeable = False
+        with self.assertRaises(ValueError):
+            rng.fillUnfIE(out)
+
+    def testWrongLengths(self):
+        rng = RNG('mt19937', 512, 1234)
+        with self.assertRaises(ValueError):
+            rng.fillPsn(np.ones(10), np.empty(9, dtype=np.uintc))
+        with self.assertRaises(ValueError):
+            rng.fillPsn(np.ones(9), np.empty(10, dtype=np.uintc))
+        with self.assertRaises(ValueError):
+            rng.fillBinom(np.ones(10, dtype=np.uintc), np.ones(9), np.empty(10, dtype=np.uintc))
+        with self.assertRaises(ValueError):
+            rng.fillBinom(np.ones(9, dtype=np.uintc), np.ones(10), np.empty(10, dtype=np.uintc))
+        with self.assertRaises(ValueError):
+            rng.fillBinom(np.ones(10, dtype=np.uintc), np.ones(10), np.empty(9, dtype=np.uintc))
+
+
+def suite():
+    all_tests = []
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(RNGFill))
+    return unittest.TestSuite(all_tests)
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite())
@@ -0,0 +1,89 @@
+####################################################################################
+#
+#    STEPS - STochastic Engine for Pathway Simulation
+#    Copyright (C) 2007-2023 Okinawa Institute of Science and Technology, Japan.
+#    Copyright (C) 2003-2006 University of Antwerp, Belgium.
+#    
+#    See the file AUTHORS for details.
+#    This file is part of STEPS.
+#    
+#    STEPS is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License version 3,
+#    as published by the Free Software Foundation.
+#    
+#    STEPS is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#    
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+#################################################################################   
+###
+
+"""Unit tests for random number generator streams."""
+
+import pickle
+import unittest
+
+from steps import interface
+
+from steps.rng import *
+
+
+class RNGStreams(unittest.TestCase):
+    """Test independent random number generator streams"""
+
+    def _draw(self, rng, n=2000):
+        return [rng.get() for i in range(n)]
+
+    def testDefaultStream(self):
+        for algo in ['mt19937', 'r123']:
+            rng1 = RNG(algo, 512, 1234)
+            rng2 = RNG(algo, 512, 1234, 0)
+            self.assertEqual(self._draw(rng1), self._draw(rng2))
+
+    def testIndependentStreams(self):
+        for algo in ['mt19937', 'r123']:
+            rng = RNG(algo, 512, 1234)
+            vals = [self._draw(r) for r in [rng.stream(k) for k in range(4)]]
+            for i in range(len(vals)):
+                for j in range(i + 1, len(vals)):
+                    self.assertNotEqual(vals[i], vals[j])
+
+            # Streams are reproducible
+            self.assertEqual(self._draw(rng.stream(3)), self._draw(RNG(algo, 512, 1234, 3)))
+
+    def testSpawn(self):
+        rng = RNG('r123', 512, 1234)
+        rngs = rng.spawn(3)
+        self.assertEqual([r.getStreamIndex() for r in rngs], [1, 2, 3])
+        self.assertEqual([r.getStreamIndex() for r in rngs[0].spawn(2)], [4, 5])
+        self.assertEqual([r.getStreamIndex() for r in rng.spawn(1)], [6])
+
+        self.assertEqual(self._draw(rngs[1]), self._draw(RNG('r123', 512, 1234).spawn(2)[1]))
+
+    def testState(self):
+        for algo in ['mt19937', 'r123', 'std::mt19937']:
+            rng = RNG(algo, 512, 1234, 7)
+            self._draw(rng, 1000)
+
+            state = rng.getState()
+            vals = self._draw(rng)
+            rng.setState(state)
+            self.assertEqual(self._draw(rng), vals)
+
+            rng.setState(state)
+            rng2 = pickle.loads(pickle.dumps(rng))
+            self.assertEqual(rng2.getStreamIndex(), 7)
+            self.assertEqual(self._draw(rng2), vals)
+
+
+def suite():
+    all_tests = []
+    all_tests.append(unittest.TestLoader().loadTestsFromTestCase(RNGStreams))
+    return unittest.TestSuite(all_tests)
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite())